@@ -7,15 +7,16 @@ import PriceChart from '@/components/PriceChart';
 import CouponBadge from '@/components/CouponBadge';
 import BottomNav from '@/components/BottomNav';
 import WishlistButton from '@/components/WishlistButton';
-import { formatPrice } from '@/lib/utils';
-import { getProductById } from '@/lib/api';
-import type { Product, PriceHistory, Coupon } from '@/lib/types';
+import { formatPrice, fillDailyPrices } from '@/lib/utils';
+import { getProductById, PRICE_HISTORY_DAYS } from '@/lib/api';
+import type { Product, PriceHistory, PriceSummary, Coupon } from '@/lib/types';
 
 export default function ProductDetailPage({ params }: { params: Promise<{ id: string }> }) {
     const { id } = use(params);
 
     const [product, setProduct] = useState<Product | null>(null);
     const [priceHistory, setPriceHistory] = useState<PriceHistory[]>([]);
+    const [priceSummary, setPriceSummary] = useState<PriceSummary | null>(null);
     const [coupons, setCoupons] = useState<Coupon[]>([]);
     const [loading, setLoading] = useState(true);
 
@@ -27,6 +28,7 @@ export default function ProductDetailPage({ params }: { params: Promise<{ id: st
                 if (data) {
                     setProduct(data.product);
                     setPriceHistory(data.priceHistory);
+                    setPriceSummary(data.priceSummary);
                     setCoupons(data.coupons);
                 }
             } catch (error) {
@@ -90,21 +92,25 @@ export default function ProductDetailPage({ params }: { params: Promise<{ id: st
         );
     }
 
-    // 가격 정보 계산
+    // 가격 정보 계산 (현재가는 가격 요약 기준, 요약이 아직 없으면 마지막 이력)
     const latestPrice = priceHistory[priceHistory.length - 1];
-    const currentPrice = latestPrice?.price || 0;
-    const originalPrice = latestPrice?.original_price || currentPrice;
-    const discountRate = latestPrice?.discount_rate || 0;
-    const lowestPrice = priceHistory.length > 0
-        ? Math.min(...priceHistory.map(p => p.price))
-        : currentPrice;
-    const isLowest = currentPrice <= lowestPrice;
+    const currentPrice = priceSummary?.current_price ?? latestPrice?.price ?? 0;
+    const originalPrice = priceSummary?.original_price ?? latestPrice?.original_price ?? currentPrice;
+    const discountRate = priceSummary?.discount_rate ?? latestPrice?.discount_rate ?? 0;
 
-    // 평균 가격 계산
-    const avgPrice = priceHistory.length > 0
-        ? Math.round(priceHistory.reduce((sum, p) => sum + p.price, 0) / priceHistory.length)
+    // 최저가/평균 가격은 일별로 이어 채운 가격 기준 (변동이 있을 때만 기록되므로 기록 횟수로 평균내지 않음)
+    const dailyPrices = fillDailyPrices(priceHistory, PRICE_HISTORY_DAYS);
+    const lowestPrice = dailyPrices.length > 0 ? Math.min(...dailyPrices) : currentPrice;
+    const isLowest = currentPrice <= lowestPrice;
+    const avgPrice = dailyPrices.length > 0
+        ? Math.round(dailyPrices.reduce((sum, price) => sum + price, 0) / dailyPrices.length)
         : currentPrice;
 
+    // 그래프는 마지막 기록 이후에도 가격이 이어지도록 현재 시점을 끝점으로 추가
+    const chartData = latestPrice
+        ? [...priceHistory, { ...latestPrice, price: currentPrice, original_price: originalPrice, recorded_at: new Date().toISOString() }]
+        : priceHistory;
+
     return (
         <>
             {/* 헤더 */}
@@ -223,7 +229,7 @@ export default function ProductDetailPage({ params }: { params: Promise<{ id: st
                 {priceHistory.length > 0 && (
                     <div className="px-4 py-5">
                         <h3 className="text-base font-bold text-gray-900 mb-4">📈 가격 변동 추이</h3>
-                        <PriceChart data={priceHistory} lowestPrice={lowestPrice} />
+                        <PriceChart data={chartData} lowestPrice={lowestPrice} />
 
                         {/* 가격 통계 */}
                         <div className="mt-5 grid grid-cols-2 gap-3">
@@ -0,0 +1,60 @@
+"""
+올프 크롤러 - 가격 알림 평가
+크롤링이 끝나면 이번 실행에서 가격이 바뀐 상품의 활성 알림만 한 번에 읽어 와
+방금 수집한 가격과 메모리에서 맞춰 봅니다. 상품별 알림은 목표가 내림차순이라
+현재가보다 목표가가 낮은 알림이 나오는 곳에서 멈추면 되고(상품당 한 번 훑기),
+발동한 알림은 비활성화와 발송 대기(notifications) 추가를 일괄 요청으로 처리합니다.
+비용은 전체 알림 수가 아니라 가격이 바뀐 상품 수에 비례합니다.
+"""
+from typing import Dict, List
+
+from storage import Storage
+
+
+def group_alerts(alerts: List[Dict]) -> Dict[str, List[Dict]]:
+    """product_id -> 알림 목록 (목표가 내림차순으로 정렬)"""
+    grouped: Dict[str, List[Dict]] = {}
+    for alert in alerts:
+        grouped.setdefault(alert["product_id"], []).append(alert)
+    for product_alerts in grouped.values():
+        product_alerts.sort(key=lambda alert: alert["target_price"], reverse=True)
+    return grouped
+
+
+def sweep_alerts(alerts_by_product: Dict[str, List[Dict]], prices: Dict[str, int]) -> List[Dict]:
+    """현재가가 목표가 이하로 내려온 알림 -> [{alert_id, price}]"""
+    triggered = []
+    for product_id, product_alerts in alerts_by_product.items():
+        price = prices.get(product_id)
+        if price is None:
+            continue
+        for alert in product_alerts:
+            if alert["target_price"] < price:
+                break
+            triggered.append({"alert_id": alert["id"], "price": price})
+    return triggered
+
+
+def evaluate_price_alerts(db: Storage, changed_prices: Dict[str, Dict]) -> Dict[str, int]:
+    """가격이 바뀐 상품의 알림 평가 후 발동한 알림 일괄 처리
+    
+    Args:
+        changed_prices: product_id -> 이번 실행에서 기록한 가격 이력 레코드 (price 키 필요)
+    
+    Returns:
+        Dict with 'products' (평가한 상품 수), 'alerts' (확인한 알림 수),
+        'triggered' (발동한 알림 수), 'queued' (발송 대기에 추가한 알림 수)
+    """
+    stats = {"products": len(changed_prices), "alerts": 0, "triggered": 0, "queued": 0}
+    if not changed_prices:
+        return stats
+    
+    prices = {product_id: record["price"] for product_id, record in changed_prices.items()}
+    alerts = db.get_active_alerts(list(prices))
+    stats["alerts"] = len(alerts)
+    
+    triggered = sweep_alerts(group_alerts(alerts), prices)
+    stats["triggered"] = len(triggered)
+    if triggered:
+        stats["queued"] = db.trigger_price_alerts(triggered)
+    return stats
@@ -0,0 +1,148 @@
+"""
+올프 크롤러 - 실행 후 가격 분석
+이번 실행의 가격과 최근 PRICE_ANALYTICS_DAYS일 가격 이력을 상품 x 일자 NumPy 배열로 올려
+지표마다 한 번의 벡터 연산으로 계산한 뒤, product_price_summary에 일괄로 써 둡니다.
+프론트엔드는 페이지를 열 때마다 이력을 다시 계산하지 않고 이 값을 그대로 읽습니다.
+
+    avg_price_7d / avg_price_30d     7일/30일 이동평균 (일별 종가 기준)
+    high_price_30d                   30일 최고가
+    drop_from_high(_pct)             30일 최고가 대비 하락폭/하락률
+    volatility_30d                   30일 일별 종가의 변동계수 (표준편차 / 평균)
+    is_fake_discount                 세일 직전에 정가를 올렸거나, 세일가가 평소 가격과 다르지 않은 할인
+    is_all_time_low                  현재가가 역대 최저가 이하 (요약의 lowest_price와 비교해 DB에서 계산)
+"""
+from datetime import datetime, date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    PRICE_ANALYTICS_DAYS,
+    FAKE_DISCOUNT_TOLERANCE,
+    FAKE_DISCOUNT_MIN_DAYS,
+    EXPORT_CHUNK_SIZE
+)
+from storage import Storage
+
+
+def _ffill(grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """일자 축으로 앞의 값 채우기 (가격 이력은 바뀐 날만 기록되므로 그 사이는 직전 가격)"""
+    mask = ~np.isnan(grid)
+    idx = np.where(mask, np.arange(grid.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    filled = grid[np.arange(grid.shape[0])[:, None], idx]
+    
+    # 창 시작 이전 가격은 알 수 없으므로 창 안의 첫 기록으로 채움
+    first = mask.argmax(axis=1)
+    leading = grid[np.arange(grid.shape[0]), first]
+    return np.where(np.isnan(filled), leading[:, None], filled), first
+
+
+def build_daily_grid(index: Dict[str, int], current: np.ndarray, rows: Iterable[Dict],
+                     start: date, days: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """가격 이력 행 -> 상품 x 일자 종가/정가 배열
+    
+    같은 날 여러 번 기록됐으면 마지막 기록이 종가입니다 (rows는 recorded_at 순).
+    마지막 열(오늘)은 이번 실행에서 확인한 가격입니다.
+    
+    Returns:
+        (prices, originals, observed_days) - observed_days는 창 안에서 가격을 알고 있는 일수
+    """
+    pidx, day, price, original = [], [], [], []
+    for row in rows:
+        i = index.get(row["product_id"])
+        if i is None:
+            continue
+        d = (date.fromisoformat(str(row["recorded_at"])[:10]) - start).days
+        if 0 <= d < days:
+            pidx.append(i)
+            day.append(d)
+            price.append(row["price"])
+            original.append(row["original_price"] or row["price"])
+    
+    n = len(index)
+    prices = np.full((n, days), np.nan)
+    originals = np.full((n, days), np.nan)
+    has_rows = np.zeros(n, dtype=bool)
+    
+    if pidx:
+        pidx, day = np.asarray(pidx), np.asarray(day)
+        keys = pidx * days + day
+        # 뒤집어서 처음 나온 위치 = 원래 순서의 마지막 기록
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - last
+        prices[pidx[last], day[last]] = np.asarray(price, dtype=float)[last]
+        originals[pidx[last], day[last]] = np.asarray(original, dtype=float)[last]
+        has_rows[pidx] = True
+    
+    # 창 안에 기록이 없는 상품은 창 전체 기간 동안 가격이 그대로였음
+    prices[~has_rows, 0] = current[~has_rows, 0]
+    originals[~has_rows, 0] = current[~has_rows, 1]
+    prices[:, -1] = current[:, 0]
+    originals[:, -1] = current[:, 1]
+    
+    prices, first = _ffill(prices)
+    originals, _ = _ffill(originals)
+    return prices, originals, days - first
+
+
+def compute_price_analytics(product_ids: List[str], current: np.ndarray, prices: np.ndarray,
+                            originals: np.ndarray, observed_days: np.ndarray) -> List[Dict]:
+    """지표별 벡터 연산 (current 열: price, original_price, is_on_sale)"""
+    price_now, original_now = current[:, 0], current[:, 1]
+    on_sale = current[:, 2].astype(bool)
+    
+    avg_7d = prices[:, -7:].mean(axis=1)
+    avg_30d = prices[:, -30:].mean(axis=1)
+    high_30d = prices[:, -30:].max(axis=1)
+    drop = high_30d - price_now
+    drop_pct = np.divide(drop * 100, high_30d, out=np.zeros_like(drop), where=high_30d > 0)
+    volatility = np.divide(prices[:, -30:].std(axis=1), avg_30d, out=np.zeros_like(avg_30d), where=avg_30d > 0)
+    
+    # 가짜 할인: 오늘 이전 기간만 기준으로 판단
+    # 1) 정가를 창 안의 최저 정가보다 올려 놓고 세일 2) 세일가가 평소(오늘 이전 평균) 가격보다 싸지 않음
+    original_before = originals[:, :-1].min(axis=1)
+    usual_price = prices[:, :-1].mean(axis=1)
+    inflated = original_now > original_before * (1 + FAKE_DISCOUNT_TOLERANCE)
+    no_real_cut = price_now >= usual_price * (1 - FAKE_DISCOUNT_TOLERANCE)
+    fake = on_sale & (observed_days >= FAKE_DISCOUNT_MIN_DAYS) & (inflated | no_real_cut)
+    
+    columns = {
+        "avg_price_7d": np.rint(avg_7d).astype(int).tolist(),
+        "avg_price_30d": np.rint(avg_30d).astype(int).tolist(),
+        "high_price_30d": np.rint(high_30d).astype(int).tolist(),
+        "drop_from_high": np.rint(drop).astype(int).tolist(),
+        "drop_from_high_pct": np.round(drop_pct, 2).tolist(),
+        "volatility_30d": np.round(volatility, 4).tolist(),
+        "is_fake_discount": fake.tolist(),
+    }
+    return [
+        {"product_id": product_id, **{name: values[i] for name, values in columns.items()}}
+        for i, product_id in enumerate(product_ids)
+    ]
+
+
+def run_price_analytics(db: Storage, latest_prices: Dict[str, Tuple[int, int, bool]],
+                        days: int = PRICE_ANALYTICS_DAYS, today: Optional[date] = None) -> int:
+    """가격 분석 후 product_price_summary에 일괄 반영 (갱신한 상품 수)
+    
+    Args:
+        latest_prices: product_id -> (price, original_price, is_on_sale), 보통 이번 실행에서 확인한 가격
+    """
+    if not latest_prices:
+        return 0
+    
+    # 가격 이력의 recorded_at은 UTC
+    today = today or datetime.utcnow().date()
+    window = days + 1  # 오늘 이전 days일 + 오늘
+    start = today - timedelta(days=days)
+    
+    product_ids = list(latest_prices)
+    index = {product_id: i for i, product_id in enumerate(product_ids)}
+    current = np.array([latest_prices[product_id] for product_id in product_ids], dtype=float)
+    
+    history = (row for rows in db.iter_price_history(start, EXPORT_CHUNK_SIZE) for row in rows)
+    prices, originals, observed_days = build_daily_grid(index, current, history, start, window)
+    
+    rows = compute_price_analytics(product_ids, current, prices, originals, observed_days)
+    return db.update_price_analytics(rows)
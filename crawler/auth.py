@@ -4,26 +4,105 @@ Playwright를 사용하여 올리브영 로그인 상태를 관리합니다.
 """
 import os
 import asyncio
+from contextlib import asynccontextmanager
+from typing import List, AsyncIterator, Optional
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
-from config import BROWSER_STATE_PATH, OLIVEYOUNG_LOGIN_URL, OLIVEYOUNG_MYPAGE_URL
+from config import (
+    BROWSER_STATE_PATH, OLIVEYOUNG_LOGIN_URL, OLIVEYOUNG_MYPAGE_URL, CRAWL_CONCURRENCY, USE_BROWSER_SERVER,
+    FAST_SESSION_CHECK
+)
+from page_profile import PageProfile
+from session_check import SessionCheck
+from metrics import metrics
+import browser_server
+
+# 마이페이지 로드 확인용 요소
+MYPAGE_SELECTOR = ".mypage-wrap, .my-page, #myPage"
+
+
+async def verify_login(page: Page, profile: Optional[PageProfile] = None) -> bool:
+    """로그인 상태 확인 (마이페이지 접근 가능 여부로 체크, 브라우저 서버도 사용)"""
+    profile = profile or PageProfile()
+    try:
+        await profile.goto(page, OLIVEYOUNG_MYPAGE_URL, wait_for=MYPAGE_SELECTOR)
+        
+        # 로그인 페이지로 리다이렉트되었는지 확인
+        current_url = page.url
+        if "getLoginPage" in current_url or "login" in current_url.lower():
+            print("❌ 로그인이 필요합니다.")
+            return False
+        
+        # 마이페이지 요소 확인
+        mypage_element = await page.query_selector(MYPAGE_SELECTOR)
+        if mypage_element:
+            print("✅ 로그인 상태가 유효합니다.")
+            return True
+        
+        print("⚠️ 로그인 상태를 확인할 수 없습니다.")
+        return False
+    
+    except Exception as e:
+        print(f"❌ 로그인 상태 확인 중 오류: {e}")
+        return False
+
+
+class PagePool:
+    """로그인된 BrowserContext를 공유하는 페이지 풀"""
+    
+    def __init__(self, pages: List[Page]):
+        self.pages = pages
+        self._queue: asyncio.Queue = asyncio.Queue()
+        for page in pages:
+            self._queue.put_nowait(page)
+    
+    @property
+    def size(self) -> int:
+        return len(self.pages)
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Page]:
+        """사용 가능한 페이지를 빌려오고, 작업이 끝나면 반납"""
+        page = await self._queue.get()
+        try:
+            yield page
+        finally:
+            self._queue.put_nowait(page)
 
 
 class AuthManager:
     """올리브영 로그인 세션 관리 클래스"""
     
-    def __init__(self):
+    def __init__(self, profile: Optional[PageProfile] = None, use_server: bool = USE_BROWSER_SERVER):
+        """
+        Args:
+            use_server: True면 실행 중인 브라우저 서버(browser_server.py)에 붙고, 없으면 직접 실행
+        """
+        self.use_server = use_server
+        self.server_info: Optional[dict] = None  # 붙은 서버 정보 (직접 실행했으면 None)
         self.playwright = None
         self.browser: Browser = None
         self.context: BrowserContext = None
         self.page: Page = None
+        self.page_pool: PagePool = None
+        self.profile = profile or PageProfile()
         self.state_file = os.path.join(BROWSER_STATE_PATH, "state.json")
+        self.session_check = SessionCheck(self.state_file) if FAST_SESSION_CHECK else None
         
         # 브라우저 상태 저장 폴더 생성
         os.makedirs(BROWSER_STATE_PATH, exist_ok=True)
     
     async def initialize(self, headless: bool = True):
-        """브라우저 초기화"""
+        """브라우저 초기화 (브라우저 서버가 있으면 연결만)"""
         self.playwright = await async_playwright().start()
+        
+        if self.use_server:
+            connected = await browser_server.connect(self.playwright)
+            if connected:
+                self.browser, self.context, self.server_info = connected
+                print(f"🔌 브라우저 서버에 연결했습니다: {self.server_info['endpoint']}")
+                self.page = await self._new_page()
+                return
+        
         self.browser = await self.playwright.chromium.launch(headless=headless)
         
         # 저장된 상태가 있으면 로드
@@ -34,31 +113,39 @@ class AuthManager:
             print("🆕 새로운 브라우저 컨텍스트를 생성합니다...")
             self.context = await self.browser.new_context()
         
-        self.page = await self.context.new_page()
+        await self.profile.attach(self.context)
+        self.page = await self._new_page()
+    
+    async def _new_page(self) -> Page:
+        """새 페이지 (브라우저 서버에 붙었으면 공유 컨텍스트 대신 이 실행의 페이지에만 프로필 적용)"""
+        page = await self.context.new_page()
+        if self.server_info:
+            await self.profile.attach_page(page)
+        return page
     
     async def check_login_status(self) -> bool:
         """로그인 상태 확인 (마이페이지 접근 가능 여부로 체크)"""
-        try:
-            await self.page.goto(OLIVEYOUNG_MYPAGE_URL, wait_until="networkidle", timeout=30000)
-            
-            # 로그인 페이지로 리다이렉트되었는지 확인
-            current_url = self.page.url
-            if "getLoginPage" in current_url or "login" in current_url.lower():
-                print("❌ 로그인이 필요합니다.")
-                return False
-            
-            # 마이페이지 요소 확인
-            mypage_element = await self.page.query_selector(".mypage-wrap, .my-page, #myPage")
-            if mypage_element:
-                print("✅ 로그인 상태가 유효합니다.")
+        async with metrics.atimer("phase_seconds", phase="login_check"):
+            return await self._check_login_status()
+    
+    async def _check_login_status(self) -> bool:
+        # 브라우저 서버가 최근에 확인한 세션이면 마이페이지를 다시 열지 않음
+        if self.server_info and browser_server.session_is_fresh(self.server_info):
+            print("✅ 브라우저 서버의 로그인 세션을 사용합니다.")
+            return True
+        
+        # 저장된 쿠키 + HTTP 요청으로 먼저 확인 (유효하면 마이페이지 렌더링 생략)
+        if self.session_check and not self.server_info:
+            if await self.session_check.check():
+                print("✅ 저장된 세션이 유효합니다. (브라우저 확인 생략)")
+                metrics.incr("login_checks", method="fast")
                 return True
-            
-            print("⚠️ 로그인 상태를 확인할 수 없습니다.")
-            return False
-            
-        except Exception as e:
-            print(f"❌ 로그인 상태 확인 중 오류: {e}")
-            return False
+        
+        metrics.incr("login_checks", method="browser")
+        logged_in = await verify_login(self.page, self.profile)
+        if self.session_check and not self.server_info:
+            self.session_check.record(logged_in, "브라우저 확인")
+        return logged_in
     
     async def manual_login(self):
         """수동 로그인 (브라우저를 열고 사용자가 직접 로그인)"""
@@ -70,6 +157,9 @@ class AuthManager:
         print("3. 로그인 완료 후 이 터미널에서 Enter를 눌러주세요.")
         print("="*50 + "\n")
         
+        # 로그인 화면은 이미지 등 전체 리소스가 필요하므로 차단 해제
+        await self.profile.detach(self.context)
+        
         # 메인 페이지로 이동
         await self.page.goto(OLIVEYOUNG_LOGIN_URL, wait_until="networkidle")
         
@@ -78,6 +168,8 @@ class AuthManager:
         
         # 로그인 상태 확인 없이 바로 저장 (사용자를 신뢰)
         await self.save_state()
+        if self.session_check:
+            self.session_check.record(True, "수동 로그인")
         print("✅ 브라우저 상태가 저장되었습니다! 크롤링을 시작합니다.")
         return True
     
@@ -94,8 +186,10 @@ class AuthManager:
             return True
         
         # 수동 로그인 필요 - headless 모드 끄고 다시 시작
-        if headless:
+        # (브라우저 서버 세션이 만료됐으면 직접 띄운 창에서 로그인, 저장한 state.json은 서버가 이어받음)
+        if headless or self.server_info:
             await self.close()
+            self.use_server = False
             await self.initialize(headless=False)
         
         return await self.manual_login()
@@ -104,8 +198,34 @@ class AuthManager:
         """현재 페이지 반환"""
         return self.page
     
+    async def get_page_pool(self, size: int = CRAWL_CONCURRENCY) -> PagePool:
+        """로그인 세션을 공유하는 페이지 풀 반환 (기본 페이지 포함 size개)"""
+        if self.page_pool and self.page_pool.size == size:
+            return self.page_pool
+        
+        pages = [self.page]
+        for _ in range(max(size, 1) - 1):
+            pages.append(await self._new_page())
+        
+        self.page_pool = PagePool(pages)
+        print(f"🗂️ 페이지 풀 생성: {len(pages)}개")
+        return self.page_pool
+    
     async def close(self):
-        """브라우저 종료"""
+        """브라우저 종료 (브라우저 서버에 붙었으면 연 페이지만 닫고 연결 해제)"""
+        if self.server_info:
+            for page in (self.page_pool.pages if self.page_pool else [self.page]):
+                if page and not page.is_closed():
+                    await self.profile.detach_page(page)
+                    await page.close()
+            self.page_pool = None
+            await self.browser.close()
+            await self.playwright.stop()
+            self.server_info = None
+            print("🔌 브라우저 서버 연결을 해제했습니다.")
+            return
+        
+        self.page_pool = None
         if self.context:
             await self.context.close()
         if self.browser:
@@ -0,0 +1,176 @@
+"""
+올프 크롤러 - 처리량 벤치마크
+녹화본(fixtures.py record)을 재생하여 올리브영/Supabase 없이 스크래퍼 성능을 측정합니다.
+쓰기는 기본적으로 null 싱크로 보내고, --storage sqlite로 로컬 DB 쓰기 속도도 잴 수 있습니다.
+
+사용법:
+    python benchmark.py                  # 브라우저 엔진, 녹화된 모든 카테고리
+    python benchmark.py --engine http    # HTTP 엔진
+    python benchmark.py --coupons        # 녹화된 상세 페이지로 쿠폰 수집도 측정
+"""
+import os
+import time
+import json
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Dict
+
+from config import CATEGORIES, FIXTURES_PATH, CRAWL_CONCURRENCY, BROWSER_STATE_PATH
+from fixtures import list_fixtures, install_replay, replay_transport
+from rate_limiter import RateLimiter
+from page_profile import PageProfile
+from scraper import ProductScraper, CouponScraper
+from pipeline import ProductWriter
+from storage import create_storage, STORAGE_BACKENDS
+from metrics import InstrumentedStorage
+
+
+def recorded_categories(fixtures_dir: str) -> Dict[str, str]:
+    """녹화본이 있는 카테고리만 추림"""
+    codes = {os.path.basename(path).split("_")[1] for path in list_fixtures("ranking_", fixtures_dir)}
+    return {name: code for name, code in CATEGORIES.items() if code in codes}
+
+
+def measure_parse(fixtures_dir: str) -> Dict:
+    """HTML 파싱 + 상품 변환 시간 측정 (네트워크/브라우저 제외, 아이템당)"""
+    from http_scraper import parse_ranking_html
+    
+    scraper = ProductScraper.__new__(ProductScraper)
+    items = 0
+    started = time.perf_counter()
+    for path in list_fixtures("ranking_", fixtures_dir):
+        with open(path, "r", encoding="utf-8") as f:
+            raw_items = parse_ranking_html(f.read())
+        scraper._build_products(raw_items, "benchmark")
+        items += len(raw_items)
+    elapsed = time.perf_counter() - started
+    
+    return {
+        "items": items,
+        "parse_ms_per_item": round(elapsed * 1000 / items, 4) if items else None
+    }
+
+
+async def run_benchmark(engine: str = "browser", concurrency: int = CRAWL_CONCURRENCY,
+                        coupons: bool = False, fixtures_dir: str = FIXTURES_PATH,
+                        storage: str = "null") -> Dict:
+    """녹화본 재생으로 크롤링 처리량 측정"""
+    from playwright.async_api import async_playwright
+    from auth import PagePool
+    
+    categories = recorded_categories(fixtures_dir)
+    if not categories:
+        raise RuntimeError(f"녹화된 랭킹 페이지가 없습니다: {fixtures_dir} (python fixtures.py record 먼저 실행)")
+    
+    db = InstrumentedStorage(create_storage(storage), blocking=False)
+    profile = PageProfile(lean=True, cache_dir=None)
+    rate_limiter = RateLimiter(max_per_second=0)  # 재생이므로 요청 간격 제한 없음
+    http_fetcher = None
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context()
+        await install_replay(context, fixtures_dir)
+        page_pool = PagePool([await context.new_page() for _ in range(max(concurrency, 1))])
+        
+        if engine == "http":
+            from http_scraper import HttpRankingFetcher
+            http_fetcher = HttpRankingFetcher(
+                os.path.join(BROWSER_STATE_PATH, "state.json"),
+                transport=replay_transport(fixtures_dir)
+            )
+        
+        product_scraper = ProductScraper(
+            page_pool.pages[0], db,
+            rate_limiter=rate_limiter,
+            http_fetcher=http_fetcher,
+            profile=profile
+        )
+        
+        writer = ProductWriter(product_scraper)
+        
+        async def crawl_category(category_name: str, category_code: str) -> int:
+            saved_pages = []
+            product_count = 0
+            async with page_pool.acquire() as worker_page:
+                async for page_num, page_products in product_scraper.scrape_ranking_page(
+                    category_name, category_code, page=worker_page
+                ):
+                    product_count += len(page_products)
+                    saved_pages.append(await writer.put(category_name, page_num, page_products))
+            await asyncio.gather(*saved_pages)
+            return product_count
+        
+        started = time.perf_counter()
+        writer.start()
+        results = await asyncio.gather(*(crawl_category(name, code) for name, code in categories.items()))
+        await writer.close()
+        crawl_seconds = time.perf_counter() - started
+        product_count = sum(results)
+        
+        report = {
+            "engine": engine,
+            "concurrency": page_pool.size,
+            "categories": len(categories),
+            "pages": product_scraper.pages_loaded,
+            "products": product_count,
+            "crawl_seconds": round(crawl_seconds, 3),
+            "pages_per_sec": round(product_scraper.pages_loaded / crawl_seconds, 2) if crawl_seconds else None,
+            "products_per_sec": round(product_count / crawl_seconds, 2) if crawl_seconds else None,
+        }
+        
+        if coupons:
+            goods_numbers = [os.path.basename(path)[len("detail_"):-len(".html")]
+                             for path in list_fixtures("detail_", fixtures_dir)]
+            sample_products = {f"brand-{goods_no}": goods_no for goods_no in goods_numbers}
+            coupon_scraper = CouponScraper(page_pool.pages[0], db, rate_limiter=rate_limiter, profile=profile,
+                                           page_pool=page_pool)
+            
+            started = time.perf_counter()
+            coupon_count = await coupon_scraper.scrape_brand_coupons(set(sample_products), sample_products)
+            coupon_seconds = time.perf_counter() - started
+            report.update({
+                "detail_pages": len(goods_numbers),
+                "coupons": coupon_count,
+                "detail_pages_per_sec": round(len(goods_numbers) / coupon_seconds, 2) if coupon_seconds else None,
+            })
+        
+        if http_fetcher:
+            await http_fetcher.close()
+        await browser.close()
+    
+    report.update({
+        "storage": storage,
+        "db_rows_written": db.rows_written,
+        "db_writes_per_sec": round(db.rows_written / db.write_seconds, 1) if db.write_seconds else None,
+    })
+    return report
+
+
+def main():
+    """벤치마크 진입점"""
+    parser = argparse.ArgumentParser(description="올프 크롤러 처리량 벤치마크 (녹화본 재생)")
+    parser.add_argument("--engine", choices=["browser", "http"], default="browser")
+    parser.add_argument("--concurrency", type=int, default=CRAWL_CONCURRENCY)
+    parser.add_argument("--coupons", action="store_true", help="녹화된 상세 페이지로 쿠폰 수집도 측정")
+    parser.add_argument("--fixtures", default=FIXTURES_PATH, help="녹화본 폴더")
+    parser.add_argument("--storage", choices=STORAGE_BACKENDS, default="null", help="쓰기 대상 저장소 (기본: null)")
+    args = parser.parse_args()
+    
+    report = asyncio.run(run_benchmark(
+        engine=args.engine,
+        concurrency=args.concurrency,
+        coupons=args.coupons,
+        fixtures_dir=args.fixtures,
+        storage=args.storage
+    ))
+    report.update(measure_parse(args.fixtures))
+    report["measured_at"] = datetime.now().isoformat(timespec="seconds")
+    
+    print("\n📊 벤치마크 결과")
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+올프 크롤러 - 상주 브라우저 서버
+Chromium을 하나 띄워 두고 로그인된 컨텍스트를 실행 간에 유지합니다.
+크롤러(AuthManager)와 test_coupon.py는 매번 브라우저를 새로 띄우지 않고 CDP로 붙기만 하므로
+Playwright 시작, Chromium 실행, state.json 로드, 마이페이지 로그인 확인을 건너뜁니다.
+
+    - 영구 프로필(server_profile)을 써서 HTTP 디스크 캐시가 서버 재시작 후에도 남고,
+      DNS/연결 캐시는 서버가 떠 있는 동안 모든 실행(샤드 포함)이 함께 씁니다.
+    - 서버가 BROWSER_SERVER_CHECK_INTERVAL마다 로그인 상태를 확인해 server.json에 기록하고
+      state.json도 갱신합니다. 붙는 쪽은 이 기록이 최근이면 로그인 확인을 생략합니다.
+    - 세션이 만료되면 크롤러가 직접 띄운 브라우저로 수동 로그인하고, 서버는 갱신된
+      state.json을 다시 읽어 세션을 이어받습니다.
+
+사용법:
+    python browser_server.py start [--headful]
+    python browser_server.py status
+    python browser_server.py stop
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import urllib.request
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from config import (
+    BROWSER_STATE_PATH,
+    BROWSER_SERVER_PORT,
+    BROWSER_SERVER_CHECK_INTERVAL,
+    BROWSER_SERVER_CONNECT_TIMEOUT
+)
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext
+
+SERVER_INFO_FILE = os.path.join(BROWSER_STATE_PATH, "server.json")
+SERVER_STOP_FILE = os.path.join(BROWSER_STATE_PATH, "server.stop")
+SERVER_PROFILE_DIR = os.path.join(BROWSER_STATE_PATH, "server_profile")
+STATE_FILE = os.path.join(BROWSER_STATE_PATH, "state.json")
+
+
+def read_server_info() -> Optional[Dict]:
+    """실행 중인 서버 정보 (server.json이 없거나 엔드포인트가 응답하지 않으면 None)"""
+    if not os.path.exists(SERVER_INFO_FILE):
+        return None
+    try:
+        with open(SERVER_INFO_FILE, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        # 서버가 비정상 종료했으면 server.json만 남아 있으므로 엔드포인트로 생존 확인
+        with urllib.request.urlopen(f"{info['endpoint']}/json/version", timeout=1):
+            return info
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def session_is_fresh(info: Dict) -> bool:
+    """서버가 최근에 확인한 로그인 상태가 유효한지 (붙는 쪽은 로그인 확인 생략)"""
+    return bool(info.get("logged_in")) and time.time() - info.get("checked_at", 0) < BROWSER_SERVER_CHECK_INTERVAL * 2
+
+
+async def connect(playwright) -> Optional[Tuple["Browser", "BrowserContext", Dict]]:
+    """실행 중인 서버에 CDP로 연결 -> (browser, 로그인된 기본 컨텍스트, 서버 정보), 서버가 없으면 None"""
+    info = read_server_info()
+    if not info:
+        return None
+    try:
+        browser = await playwright.chromium.connect_over_cdp(info["endpoint"], timeout=BROWSER_SERVER_CONNECT_TIMEOUT)
+    except Exception as e:
+        print(f"⚠️ 브라우저 서버 연결 실패 (직접 실행으로 대체): {e}")
+        return None
+    if not browser.contexts:
+        await browser.close()
+        return None
+    return browser, browser.contexts[0], info
+
+
+def _write_info(info: Dict):
+    tmp_path = SERVER_INFO_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, SERVER_INFO_FILE)
+
+
+async def _load_state(context) -> float:
+    """state.json의 쿠키를 서버 컨텍스트에 적용 (적용한 파일의 수정 시각 반환)"""
+    if not os.path.exists(STATE_FILE):
+        return 0
+    with open(STATE_FILE, "r", encoding="utf-8") as f:
+        cookies = json.load(f).get("cookies", [])
+    if cookies:
+        await context.add_cookies(cookies)
+        print(f"📂 state.json 쿠키 {len(cookies)}개 적용")
+    return os.path.getmtime(STATE_FILE)
+
+
+async def _check_session(context, page, state_mtime: float) -> Tuple[bool, float]:
+    """로그인 확인 (실패했는데 state.json이 새로 저장됐으면 다시 읽고 재확인)"""
+    from auth import verify_login
+    
+    logged_in = await verify_login(page)
+    if not logged_in and os.path.exists(STATE_FILE) and os.path.getmtime(STATE_FILE) > state_mtime:
+        state_mtime = await _load_state(context)
+        logged_in = await verify_login(page)
+    if logged_in:
+        # 서버 밖에서 브라우저를 직접 띄우는 실행(HTTP 엔진 포함)도 최신 쿠키를 쓰도록 저장
+        await context.storage_state(path=STATE_FILE)
+    return logged_in, state_mtime
+
+
+async def serve(headless: bool = True, port: int = BROWSER_SERVER_PORT):
+    """서버 실행 (stop 명령 또는 Ctrl+C까지)"""
+    from playwright.async_api import async_playwright
+    
+    if read_server_info():
+        print("⚠️ 브라우저 서버가 이미 실행 중입니다.")
+        return
+    if os.path.exists(SERVER_STOP_FILE):
+        os.remove(SERVER_STOP_FILE)
+    
+    async with async_playwright() as playwright:
+        context = await playwright.chromium.launch_persistent_context(
+            SERVER_PROFILE_DIR,
+            headless=headless,
+            args=[f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"]
+        )
+        state_mtime = await _load_state(context)
+        page = context.pages[0] if context.pages else await context.new_page()
+        
+        info = {
+            "pid": os.getpid(),
+            "endpoint": f"http://127.0.0.1:{port}",
+            "started_at": time.time(),
+            "logged_in": False,
+            "checked_at": 0
+        }
+        print(f"🖥️ 브라우저 서버 시작: {info['endpoint']}")
+        
+        try:
+            while not os.path.exists(SERVER_STOP_FILE):
+                if time.time() - info["checked_at"] >= BROWSER_SERVER_CHECK_INTERVAL:
+                    info["logged_in"], state_mtime = await _check_session(context, page, state_mtime)
+                    info["checked_at"] = time.time()
+                    _write_info(info)
+                    if not info["logged_in"]:
+                        print("⚠️ 세션이 만료되었습니다. main.py(또는 auth.py)로 로그인하면 서버가 이어받습니다.")
+                await asyncio.sleep(1)
+        finally:
+            if info["logged_in"]:
+                await context.storage_state(path=STATE_FILE)
+            await context.close()
+            for path in (SERVER_INFO_FILE, SERVER_STOP_FILE):
+                if os.path.exists(path):
+                    os.remove(path)
+            print("🔒 브라우저 서버가 종료되었습니다.")
+
+
+def stop(timeout: float = 30):
+    """실행 중인 서버에 종료 요청 후 종료될 때까지 대기"""
+    if not read_server_info():
+        print("ℹ️ 실행 중인 브라우저 서버가 없습니다.")
+        return
+    open(SERVER_STOP_FILE, "w").close()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if not read_server_info():
+            print("🔒 브라우저 서버가 종료되었습니다.")
+            return
+        time.sleep(0.5)
+    print("⚠️ 브라우저 서버가 응답하지 않습니다.")
+
+
+def print_status():
+    info = read_server_info()
+    if not info:
+        print("ℹ️ 실행 중인 브라우저 서버가 없습니다.")
+        return
+    uptime = time.time() - info["started_at"]
+    checked = time.time() - info["checked_at"] if info["checked_at"] else None
+    print(f"🖥️ 브라우저 서버: {info['endpoint']} (PID {info['pid']}, 가동 {uptime / 60:.0f}분)")
+    print(f"  - 로그인: {'유효' if info['logged_in'] else '만료/미확인'}"
+          + (f" ({checked / 60:.0f}분 전 확인)" if checked is not None else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="올프 크롤러 상주 브라우저 서버")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    start_parser = sub.add_parser("start", help="브라우저 서버 실행 (종료할 때까지 유지)")
+    start_parser.add_argument("--headful", action="store_true", help="브라우저 창을 띄움")
+    start_parser.add_argument("--port", type=int, default=BROWSER_SERVER_PORT, help=f"CDP 포트 (기본: {BROWSER_SERVER_PORT})")
+    
+    sub.add_parser("status", help="서버 상태 확인")
+    sub.add_parser("stop", help="서버 종료")
+    
+    args = parser.parse_args()
+    
+    if args.command == "start":
+        try:
+            asyncio.run(serve(headless=not args.headful, port=args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "status":
+        print_status()
+    elif args.command == "stop":
+        stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+올프 크롤러 - 실행 체크포인트
+실행 날짜별로 완료한 카테고리/페이지와 쿠폰 브랜드를 기록하여,
+중간에 실패한 크롤링을 --resume으로 남은 작업부터 이어서 실행합니다.
+"""
+import os
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from config import CHECKPOINT_PATH
+
+
+class Checkpoint:
+    """실행 날짜 단위 진행 상황 기록"""
+    
+    def __init__(self, run_date: Optional[str] = None, resume: bool = False, suffix: str = ""):
+        """
+        Args:
+            suffix: 파일명 접미사 (샤드 실행은 샤드마다 체크포인트를 따로 둠)
+        """
+        self.run_date = run_date or datetime.now().strftime("%Y-%m-%d")
+        self.path = os.path.join(CHECKPOINT_PATH, f"checkpoint_{self.run_date}{suffix}.json")
+        self.data = {
+            "run_date": self.run_date,
+            "categories": {},      # 카테고리명 -> {"done": bool, "pages": {페이지: 상품 수}}
+            "sample_products": {},  # 브랜드 -> 샘플 상품 oliveyoung_id (쿠폰 크롤링용)
+            "coupon_brands_done": []
+        }
+        
+        os.makedirs(CHECKPOINT_PATH, exist_ok=True)
+        if resume and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data.update(json.load(f))
+            print(f"📌 체크포인트 로드: {self.path}")
+    
+    def save(self):
+        """체크포인트 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    # ========== 카테고리 ==========
+    
+    def _category(self, category_name: str) -> Dict:
+        return self.data["categories"].setdefault(category_name, {"done": False, "pages": {}})
+    
+    def is_category_done(self, category_name: str) -> bool:
+        return self.data["categories"].get(category_name, {}).get("done", False)
+    
+    def category_progress(self, category_name: str) -> Tuple[int, int]:
+        """이어서 시작할 페이지 번호와 이미 수집한 상품 수
+        
+        1페이지부터 빠짐없이 기록된 페이지까지만 완료로 봅니다
+        (저장에 실패한 페이지 뒤의 페이지가 기록돼 있어도 실패한 페이지부터 다시 수집).
+        """
+        pages = self._category(category_name)["pages"]
+        page_num, collected = 1, 0
+        while str(page_num) in pages:
+            collected += pages[str(page_num)]
+            page_num += 1
+        return page_num, collected
+    
+    def mark_page_done(self, category_name: str, page_num: int, products: List[Dict]):
+        """저장까지 끝난 페이지 기록"""
+        self._category(category_name)["pages"][str(page_num)] = len(products)
+        for product in products:
+            self.data["sample_products"].setdefault(product["brand"], product["oliveyoung_id"])
+        self.save()
+    
+    def mark_page_skipped(self, category_name: str, page_num: int, count: int, brands: Dict[str, str]):
+        """지문이 같아 저장을 건너뛴 페이지 기록 (brands: 브랜드 -> 샘플 상품 ID)"""
+        self._category(category_name)["pages"][str(page_num)] = count
+        for brand, product_id in brands.items():
+            self.data["sample_products"].setdefault(brand, product_id)
+        self.save()
+    
+    def mark_category_done(self, category_name: str):
+        self._category(category_name)["done"] = True
+        self.save()
+    
+    # ========== 쿠폰 ==========
+    
+    @property
+    def sample_products(self) -> Dict[str, str]:
+        return self.data["sample_products"]
+    
+    @property
+    def coupon_brands_done(self) -> Set[str]:
+        return set(self.data["coupon_brands_done"])
+    
+    def mark_coupon_brands_done(self, brands: List[str]):
+        done = self.data["coupon_brands_done"]
+        done.extend(brand for brand in brands if brand not in done)
+        self.save()
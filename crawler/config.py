@@ -12,21 +12,132 @@ load_dotenv(env_path)
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 
-# 디버그: 키 확인
-print(f"🔑 SUPABASE_URL: {SUPABASE_URL[:50] if SUPABASE_URL else 'NOT SET'}...")
-print(f"🔑 SUPABASE_KEY: {SUPABASE_KEY[:50] if SUPABASE_KEY else 'NOT SET'}...")
+# 저장소 설정 ("supabase", "sqlite", "jsonl", "null")
+STORAGE_BACKEND = "supabase"
+SQLITE_PATH = os.path.join(os.path.dirname(__file__), "data", "allday_price.db")
+JSONL_SINK_PATH = os.path.join(os.path.dirname(__file__), "data", "crawl_sink.jsonl")
 
 # 브라우저 상태 저장 경로
 BROWSER_STATE_PATH = os.path.join(os.path.dirname(__file__), "browser_state")
 
+# 세션 확인 설정 (state.json 쿠키 + HTTP 요청으로 먼저 확인, 유효하지 않을 때만 브라우저로 마이페이지 확인)
+FAST_SESSION_CHECK = True      # False면 매번 브라우저로 마이페이지를 열어 확인 (기존 방식)
+SESSION_CHECK_TTL = 60 * 30    # 세션 판정 캐시 유지 시간 (초, state.json이 다시 저장되면 즉시 무효)
+SESSION_PROBE_TIMEOUT = 5      # 세션 확인 HTTP 요청 타임아웃 (초)
+
+# 상주 브라우저 서버 설정 (python browser_server.py start, 떠 있으면 크롤러가 CDP로 붙음)
+USE_BROWSER_SERVER = True      # False면 서버가 떠 있어도 매번 브라우저를 직접 실행
+BROWSER_SERVER_PORT = 9333     # 서버 CDP 포트 (127.0.0.1에서만 열림)
+BROWSER_SERVER_CHECK_INTERVAL = 60 * 10  # 서버가 로그인 상태를 확인하는 간격 (초, 붙는 쪽은 2배 이내 기록이면 확인 생략)
+BROWSER_SERVER_CONNECT_TIMEOUT = 3000    # 서버 연결 타임아웃 (ms)
+
+# 정적 리소스(JS/CSS) 디스크 캐시 경로 (실행 간 유지)
+ASSET_CACHE_PATH = os.path.join(os.path.dirname(__file__), "browser_state", "asset_cache")
+
 # 로그 저장 경로
 LOGS_PATH = os.path.join(os.path.dirname(__file__), "logs")
 
+# 실행 지표 저장 경로 (실행 요약 JSON + Prometheus textfile)
+METRICS_PATH = os.path.join(LOGS_PATH, "metrics")
+PROMETHEUS_TEXTFILE = os.path.join(METRICS_PATH, "allday_crawler.prom")
+
+# 실행 체크포인트 저장 경로 (--resume 이어하기용)
+CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), "checkpoints")
+
+# 브랜드별 쿠폰 캐시 경로 (실행 간 유지, 변동 없는 브랜드는 재방문 간격을 늘림, 저장소/샤드마다 파일을 따로 둠)
+COUPON_CACHE_PATH = os.path.join(os.path.dirname(__file__), "data", "coupon_cache.json")
+
+# 랭킹 페이지 지문 경로 (실행 간 유지, 이전 실행과 같은 페이지는 파싱/저장 생략)
+PAGE_FINGERPRINT_PATH = os.path.join(os.path.dirname(__file__), "data", "page_fingerprints.json")
+
+# 로컬 스냅샷(Parquet) 저장 경로 (오프라인 분석용, 매 실행 수집 결과를 날짜/카테고리별로 누적)
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "data", "snapshots")
+SNAPSHOT_ENABLED = True        # False면 실행 결과를 스냅샷으로 남기지 않음
+EXPORT_CHUNK_SIZE = 1000       # 백필 시 요청당 행 수 (Supabase 기본 최대 행 수)
+
+# 샤드 실행 결과 저장 경로 (shard.py가 샤드별 통계/브랜드를 모아 병합)
+SHARD_PATH = os.path.join(os.path.dirname(__file__), "data", "shards")
+
+# 녹화한 페이지(HTML/HAR) 저장 경로 (오프라인 재생/벤치마크용)
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures")
+
 # 크롤링 설정
 CRAWL_DELAY_MIN = 2  # 최소 딜레이 (초)
 CRAWL_DELAY_MAX = 4  # 최대 딜레이 (초)
 MAX_RETRIES = 3      # 최대 재시도 횟수
 PRODUCTS_PER_PAGE = 100  # 카테고리당 수집할 상품 수 (100개)
+CRAWL_CONCURRENCY = 3          # 동시에 크롤링할 카테고리 수 (페이지 풀 크기)
+MAX_REQUESTS_PER_SECOND = 1.0  # 올리브영 호스트로 보내는 초당 최대 페이지 요청 수 (적응형 속도 상한)
+
+# 적응형 속도 제어 (토큰 버킷 + AIMD)
+# 속도 하한은 1/CRAWL_DELAY_MAX, 시작 속도는 1/CRAWL_DELAY_MIN 요청/초
+RATE_INCREASE_STEP = 0.05      # 정상 응답마다 늘리는 초당 요청 수 (가산 증가)
+RATE_DECREASE_FACTOR = 0.5     # 타임아웃/429/5xx 시 속도에 곱하는 값 (승산 감소)
+RATE_LATENCY_TARGET = 5.0      # 응답 지연이 이 값(초)을 넘으면 속도를 줄임
+RATE_JITTER = 0.3              # 요청 간격에 더하는 무작위 비율 (봇 감지 방지)
+RETRY_MAX_DELAY = 30           # 재시도 대기 최대값 (초)
+DB_BATCH_SIZE = 500            # 일괄 저장 시 한 번의 요청에 보내는 최대 행 수
+DB_FILTER_BATCH_SIZE = 200     # in_() 필터에 넣는 최대 ID 수 (URL 길이 제한)
+WRITE_QUEUE_SIZE = 8           # 저장 대기열에 쌓아둘 최대 페이지 수 (가득 차면 스크래핑이 저장을 기다림)
+PRICE_HISTORY_RAW_DAYS = 90    # 원본 가격 이력 보존 기간 (일, 지나면 일간 롤업만 남김: maintenance.py compact)
+PRICE_ROLLUP_LOOKBACK_DAYS = 3 # maintenance.py rollup이 다시 집계하는 최근 일수
+PRICE_PARTITION_MONTHS_AHEAD = 2  # 미리 만들어 둘 price_history 월 파티션 수
+PRICE_ANALYTICS_DAYS = 30      # 가격 분석(이동평균/변동성/가짜 할인)에 쓰는 최근 일수
+FAKE_DISCOUNT_TOLERANCE = 0.05 # 가짜 할인 판정 여유 비율 (정가 인상폭/평소 가격 대비 할인폭)
+FAKE_DISCOUNT_MIN_DAYS = 14    # 가짜 할인 판정에 필요한 최소 관측 일수
+PRICE_CHANGE_ONLY = True       # 가격/정가/세일 여부가 바뀐 상품만 price_history에 기록 (나머지는 last_seen_at 갱신)
+ONE_SHOT_EXTRACTION = True     # 랭킹 페이지를 page.evaluate 한 번으로 파싱 (False면 요소별 조회)
+PAGE_FINGERPRINT_ENABLED = True  # 지문이 이전 실행과 같은 랭킹 페이지는 파싱/저장 생략 (전체 갱신 모드 제외)
+PAGE_FINGERPRINT_TTL = 60 * 60 * 24 * 3  # 지문이 같아도 다시 저장하는 간격 (초, last_seen_at이 이보다 오래 밀리지 않음)
+
+# 쿠폰 수집 설정
+COUPON_CONCURRENCY = 2         # 쿠폰 수집 전용 페이지 수 (상품 크롤링과 동시에 진행)
+COUPON_POPUP_TIMEOUT = 3000    # 쿠폰 팝업 목록(또는 쿠폰 응답) 대기 타임아웃 (ms)
+COUPON_CAPTURE_MODE = "network"  # "dom": 팝업 요소 파싱, "network": 팝업의 쿠폰 응답(JSON) 캡처, "api": 캡처한 요청을 상품 번호만 바꿔 직접 호출
+COUPON_API_PATTERN = r"coupon"  # 쿠폰 응답으로 볼 XHR/fetch URL 패턴 (정규식)
+COUPON_CACHE_TTL = 60 * 60 * 20       # 브랜드 쿠폰 재확인 간격 (초, 매일 실행 시 하루 한 번)
+COUPON_CACHE_MAX_TTL = 60 * 60 * 24 * 3  # 쿠폰이 계속 그대로인 브랜드의 최대 재확인 간격 (초)
+
+# 웹 푸시 발송 설정 (VAPID 키는 프론트엔드 app/api/push/send와 같은 값)
+VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY", "")
+VAPID_SUBJECT = os.getenv("VAPID_SUBJECT", "mailto:admin@example.com")
+PUSH_CONCURRENCY = 200         # 동시에 보내는 푸시 요청 수 (연결 풀 크기)
+PUSH_RATE_PER_HOST = 500       # 푸시 서비스(호스트)별 초당 요청 상한 (429/5xx를 받으면 자동으로 줄임)
+PUSH_TIMEOUT = 10              # 푸시 요청 타임아웃 (초)
+PUSH_MAX_RETRIES = 3           # 429/5xx/네트워크 오류 시 한 번의 발송 안에서 재시도 횟수
+PUSH_MAX_ATTEMPTS = 3          # 실행을 넘어 발송을 시도할 최대 횟수 (넘으면 failed)
+PUSH_CLAIM_SIZE = 1000         # 한 번에 가져와 보내는 대기 알림 수
+PUSH_TTL = 60 * 60 * 24        # 푸시 서비스가 기기에 전달을 시도하는 기간 (초)
+
+# 페이지 프로필 설정 (리소스 차단 + 캐시 + 콘텐츠 기준 대기)
+LEAN_PAGE_PROFILE = True       # False면 모든 리소스를 받고 networkidle까지 대기 (기존 방식)
+PAGE_LOAD_TIMEOUT = 30000      # 페이지 이동 타임아웃 (ms)
+CONTENT_WAIT_TIMEOUT = 10000   # 대상 요소(.prd_info, 쿠폰 버튼 등) 대기 타임아웃 (ms)
+ASSET_CACHE_TTL = 60 * 60 * 24 * 7  # 정적 리소스 캐시 유효 기간 (초)
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "criteo.com",
+    "criteo.net",
+    "kakao.com",
+    "naver.net",
+    "appier.net",
+    "mobon.net",
+)
+CACHEABLE_RESOURCE_TYPES = {"script", "stylesheet"}
+
+# 스크래핑 엔진 설정
+SCRAPE_ENGINE = "browser"      # "browser": Playwright 렌더링, "http": HTTP 요청 + HTML 파싱 (실패 시 브라우저로 대체)
+HTTP_POOL_SIZE = 10            # HTTP 엔진의 최대 동시 연결 수
+HTTP_TIMEOUT = 15              # HTTP 엔진 요청 타임아웃 (초)
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
 
 # 올리브영 URL
 OLIVEYOUNG_BASE_URL = "https://www.oliveyoung.co.kr"
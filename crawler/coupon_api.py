@@ -0,0 +1,149 @@
+"""
+올프 크롤러 - 쿠폰 네트워크 응답 파싱
+상세 페이지의 쿠폰 팝업이 불러오는 XHR/fetch JSON 응답을 CouponScraper._parse_coupon_item과
+같은 dict 형태로 변환합니다. 응답 필드명이 바뀌어도 버티도록 알려진 후보 키를 순서대로 찾고,
+DOM에는 없는 만료일(expires_at)과 최대 할인 금액(max_discount)도 채웁니다.
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import COUPON_API_PATTERN
+
+# 쿠폰 응답의 필드명 후보 (앞쪽이 우선)
+NAME_KEYS = ("cpnNm", "couponNm", "couponName", "cpnName", "promNm")
+AMOUNT_KEYS = ("dcAmt", "cpnDcAmt", "discountAmt", "discountAmount", "benefitAmt")
+RATE_KEYS = ("dcRt", "dcRate", "cpnDcRt", "discountRate", "benefitRate")
+TYPE_KEYS = ("dcTypeCd", "dcType", "discountType", "benefitType")
+MIN_PURCHASE_KEYS = ("minPurAmt", "minOrdAmt", "useMinAmt", "minPurchaseAmt", "minOrderAmount")
+MAX_DISCOUNT_KEYS = ("maxDcAmt", "maxDiscountAmt", "maxDiscountAmount", "maxBenefitAmt")
+EXPIRES_KEYS = ("endDtime", "validEndDtime", "useEndDtime", "useEndDt", "validEndDate", "endDate", "expireDate")
+
+# 할인 타입 값 중 정률(%)을 뜻하는 것
+PERCENT_TYPE_VALUES = {"rate", "percent", "pct", "per"}
+
+_api_pattern = re.compile(COUPON_API_PATTERN, re.IGNORECASE)
+
+
+def is_coupon_response(url: str, resource_type: str) -> bool:
+    """쿠폰 목록을 불러오는 XHR/fetch 요청인지"""
+    return resource_type in ("xhr", "fetch") and bool(_api_pattern.search(url))
+
+
+def _first(item: Dict, keys) -> Any:
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    digits = re.sub(r"[^\d]", "", str(value))
+    return int(digits) if digits else None
+
+
+def _to_iso(value: Any) -> Optional[str]:
+    """만료일 값(YYYYMMDDHHMMSS, YYYY-MM-DD HH:MM:SS, YYYY.MM.DD, epoch ms 등) -> ISO 문자열"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 10 ** 11 else value
+        return datetime.fromtimestamp(seconds).isoformat()
+    
+    digits = re.sub(r"[^\d]", "", str(value))
+    for length, fmt in ((14, "%Y%m%d%H%M%S"), (12, "%Y%m%d%H%M"), (8, "%Y%m%d")):
+        if len(digits) == length:
+            parsed = datetime.strptime(digits, fmt)
+            if length == 8:
+                # 날짜만 있으면 그날 끝까지 유효
+                parsed = parsed.replace(hour=23, minute=59, second=59)
+            return parsed.isoformat()
+    return None
+
+
+def parse_coupon(item: Dict, brand: str) -> Optional[Dict]:
+    """쿠폰 JSON 객체 1개 -> 쿠폰 dict (쿠폰이 아니면 None)"""
+    coupon_name = _first(item, NAME_KEYS)
+    if not coupon_name or not str(coupon_name).strip():
+        return None
+    
+    amount = _to_int(_first(item, AMOUNT_KEYS))
+    rate = _to_int(_first(item, RATE_KEYS))
+    type_value = str(_first(item, TYPE_KEYS) or "").lower()
+    if amount is None and rate is None:
+        return None
+    
+    if rate and (type_value in PERCENT_TYPE_VALUES or not amount):
+        discount_type, discount_value = "percent", rate
+    elif amount is not None:
+        # 타입 정보가 없으면 DOM 파싱과 같은 기준 (100 이하면 % 할인)
+        discount_value = amount
+        discount_type = "percent" if type_value in PERCENT_TYPE_VALUES or amount <= 100 else "fixed"
+    else:
+        return None
+    
+    return {
+        "brand": brand,
+        "coupon_name": str(coupon_name).strip(),
+        "discount_type": discount_type,
+        "discount_value": discount_value,
+        "min_purchase": _to_int(_first(item, MIN_PURCHASE_KEYS)) or None,
+        "max_discount": _to_int(_first(item, MAX_DISCOUNT_KEYS)) or None,
+        "expires_at": _to_iso(_first(item, EXPIRES_KEYS))
+    }
+
+
+def parse_coupon_payload(payload: Any, brand: str) -> List[Dict]:
+    """쿠폰 응답 JSON 전체에서 쿠폰 객체를 찾아 변환 (중첩 구조는 재귀 탐색)"""
+    coupons: List[Dict] = []
+    seen = set()
+    
+    def walk(node: Any):
+        if isinstance(node, list):
+            for child in node:
+                walk(child)
+        elif isinstance(node, dict):
+            coupon = parse_coupon(node, brand)
+            if coupon:
+                if coupon["coupon_name"] not in seen:
+                    seen.add(coupon["coupon_name"])
+                    coupons.append(coupon)
+                return
+            for child in node.values():
+                walk(child)
+    
+    walk(payload)
+    return coupons
+
+
+class CouponEndpoint:
+    """팝업이 호출한 쿠폰 요청을 기억해 두고, 다른 상품 번호로 바로 호출하기 위한 템플릿"""
+    
+    def __init__(self, url: str, method: str, post_data: Optional[str], headers: Dict[str, str],
+                 goods_no: str):
+        self.url = url
+        self.method = method
+        self.post_data = post_data
+        self.headers = {k: v for k, v in headers.items() if k.lower() not in ("cookie", "content-length", "host")}
+        self.goods_no = goods_no
+    
+    @classmethod
+    def from_request(cls, request, goods_no: str) -> Optional["CouponEndpoint"]:
+        """캡처한 요청에 상품 번호가 들어 있을 때만 템플릿으로 사용 가능"""
+        if goods_no not in request.url and goods_no not in (request.post_data or ""):
+            return None
+        return cls(request.url, request.method, request.post_data, request.headers, goods_no)
+    
+    def build(self, goods_no: str) -> Dict:
+        """APIRequestContext.fetch 인자"""
+        return {
+            "url": self.url.replace(self.goods_no, goods_no),
+            "method": self.method,
+            "data": self.post_data.replace(self.goods_no, goods_no) if self.post_data else None,
+            "headers": self.headers,
+        }
@@ -0,0 +1,80 @@
+"""
+올프 크롤러 - 브랜드 쿠폰 캐시
+브랜드별 마지막 확인 시각과 쿠폰 목록 해시를 실행 간에 유지합니다.
+재확인 간격 안의 브랜드는 상세 페이지 방문을 건너뛰고, 확인할 때마다 쿠폰이
+그대로였으면 간격을 두 배로 늘립니다 (COUPON_CACHE_MAX_TTL까지).
+"""
+import os
+import json
+import time
+import hashlib
+from typing import Dict, List, Optional
+
+from config import COUPON_CACHE_PATH, COUPON_CACHE_TTL, COUPON_CACHE_MAX_TTL
+
+# 해시에 포함하는 쿠폰 필드 (수집 시각 등은 제외)
+HASH_FIELDS = ("coupon_name", "discount_type", "discount_value", "min_purchase", "max_discount", "expires_at")
+
+
+def coupons_hash(coupons: List[Dict]) -> str:
+    """쿠폰 목록 내용 해시 (순서 무관)"""
+    rows = sorted(json.dumps([c.get(field) for field in HASH_FIELDS], ensure_ascii=False) for c in coupons)
+    return hashlib.sha256("\n".join(rows).encode("utf-8")).hexdigest()
+
+
+class CouponCache:
+    """브랜드 -> {"hash", "count", "checked_at", "unchanged"}"""
+    
+    def __init__(self, path: str = COUPON_CACHE_PATH, ttl: int = COUPON_CACHE_TTL,
+                 max_ttl: int = COUPON_CACHE_MAX_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.max_ttl = max_ttl
+        self.brands: Dict[str, Dict] = {}
+        
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.brands = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 쿠폰 캐시 로드 실패 (새로 시작): {e}")
+    
+    def _entry_ttl(self, entry: Dict) -> float:
+        return min(self.ttl * (2 ** entry.get("unchanged", 0)), self.max_ttl)
+    
+    def is_fresh(self, brand: str, now: Optional[float] = None) -> bool:
+        """재확인 간격 안이라 방문을 건너뛰어도 되는 브랜드인지"""
+        entry = self.brands.get(brand)
+        if not entry:
+            return False
+        now = now or time.time()
+        return now - entry["checked_at"] < self._entry_ttl(entry)
+    
+    def cached_count(self, brand: str) -> int:
+        """마지막으로 확인한 쿠폰 수"""
+        return self.brands.get(brand, {}).get("count", 0)
+    
+    def is_changed(self, brand: str, coupons: List[Dict]) -> bool:
+        """마지막 확인 이후 쿠폰 목록이 바뀌었는지 (처음 보는 브랜드는 True)"""
+        entry = self.brands.get(brand)
+        return not entry or entry["hash"] != coupons_hash(coupons)
+    
+    def record(self, brand: str, coupons: List[Dict]):
+        """확인 결과 기록 (저장까지 끝난 뒤 호출)"""
+        digest = coupons_hash(coupons)
+        entry = self.brands.get(brand)
+        unchanged = entry.get("unchanged", 0) + 1 if entry and entry["hash"] == digest else 0
+        self.brands[brand] = {
+            "hash": digest,
+            "count": len(coupons),
+            "checked_at": time.time(),
+            "unchanged": unchanged,
+        }
+    
+    def save(self):
+        """캐시 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.brands, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
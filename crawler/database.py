@@ -1,13 +1,23 @@
 """
 올프 크롤러 - Supabase 데이터베이스 연동
 """
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple, Iterator
+from datetime import datetime, date
 from supabase import create_client, Client
-from config import SUPABASE_URL, SUPABASE_KEY
+from config import (
+    SUPABASE_URL, SUPABASE_KEY, DB_BATCH_SIZE, DB_FILTER_BATCH_SIZE, PRICE_PARTITION_MONTHS_AHEAD,
+    EXPORT_CHUNK_SIZE
+)
+from storage import Storage
 
 
-class Database:
+def _chunks(rows: List[Dict], size: int = DB_BATCH_SIZE):
+    """요청당 행 수 제한에 맞게 리스트 분할"""
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+class Database(Storage):
     """Supabase 데이터베이스 연동 클래스"""
     
     def __init__(self):
@@ -25,9 +35,54 @@ class Database:
         return result.data[0] if result.data else None
     
     def get_all_oliveyoung_ids(self) -> Dict[str, str]:
-        """모든 상품의 oliveyoung_id -> product_id 맵핑 조회 (캐싱용)"""
-        result = self.client.table("products").select("id, oliveyoung_id").execute()
-        return {item["oliveyoung_id"]: item["id"] for item in result.data} if result.data else {}
+        """모든 상품의 oliveyoung_id -> product_id 맵핑 조회 (캐싱용)
+        
+        한 번의 요청은 최대 행 수(기본 1000)에서 잘리므로 키셋 페이지네이션으로 모두 받음
+        """
+        return {
+            item["oliveyoung_id"]: item["id"]
+            for rows in self.iter_products(EXPORT_CHUNK_SIZE, columns="id, oliveyoung_id")
+            for item in rows
+        }
+    
+    def iter_products(self, chunk_size: int = EXPORT_CHUNK_SIZE, columns: str = "*") -> Iterator[List[Dict]]:
+        """상품 전체를 chunk_size 행씩 (id 기준 키셋 페이지네이션)"""
+        after = None
+        while True:
+            query = self.client.table("products").select(columns).order("id").limit(chunk_size)
+            if after:
+                query = query.gt("id", after)
+            rows = query.execute().data or []
+            if not rows:
+                return
+            yield rows
+            after = rows[-1]["id"]
+    
+    def iter_price_history(self, since: Optional[date] = None,
+                           chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+        """가격 이력 전체를 chunk_size 행씩 ((recorded_at, id) 기준 키셋 페이지네이션)
+        
+        OFFSET 없이 마지막 행 다음부터 이어서 받으므로 이력이 많아도 요청마다 비용이 같습니다.
+        """
+        after: Optional[Tuple[str, str]] = None
+        while True:
+            query = self.client.table("price_history")\
+                .select("*")\
+                .order("recorded_at")\
+                .order("id")\
+                .limit(chunk_size)
+            if since:
+                query = query.gte("recorded_at", since.isoformat())
+            if after:
+                recorded_at, row_id = after
+                query = query.or_(
+                    f'recorded_at.gt."{recorded_at}",and(recorded_at.eq."{recorded_at}",id.gt.{row_id})'
+                )
+            rows = query.execute().data or []
+            if not rows:
+                return
+            yield rows
+            after = (rows[-1]["recorded_at"], rows[-1]["id"])
     
     def upsert_product(self, product_data: Dict) -> Dict:
         """상품 추가 또는 업데이트"""
@@ -60,6 +115,49 @@ class Database:
             print(f"  ✨ 새 상품 추가: {product_data['name'][:30]}...")
             return result.data[0] if result.data else None
     
+    def upsert_products_bulk(self, products: List[Dict]) -> Dict[str, str]:
+        """상품 일괄 추가/업데이트 (oliveyoung_id 충돌 시 업데이트)
+        
+        Returns:
+            oliveyoung_id -> product_id 맵핑
+        """
+        now = datetime.utcnow().isoformat()
+        rows = {}
+        for product_data in products:
+            # 같은 요청 안에 중복 키가 있으면 Postgres가 거부하므로 마지막 값만 사용
+            rows[product_data["oliveyoung_id"]] = {
+                "oliveyoung_id": product_data["oliveyoung_id"],
+                "name": product_data["name"],
+                "brand": product_data["brand"],
+                "category": product_data["category"],
+                "image_url": product_data.get("image_url"),
+                "product_url": product_data["product_url"],
+                "updated_at": now
+            }
+        
+        id_map = {}
+        for chunk in _chunks(list(rows.values())):
+            result = self.client.table("products")\
+                .upsert(chunk, on_conflict="oliveyoung_id")\
+                .execute()
+            for item in result.data or []:
+                id_map[item["oliveyoung_id"]] = item["id"]
+        
+        return id_map
+    
+    def touch_products_seen(self, product_ids: List[str]) -> int:
+        """이번 실행에서 확인된 상품의 last_seen_at 일괄 갱신"""
+        now = datetime.utcnow().isoformat()
+        count = 0
+        for i in range(0, len(product_ids), DB_FILTER_BATCH_SIZE):
+            chunk = product_ids[i:i + DB_FILTER_BATCH_SIZE]
+            self.client.table("products")\
+                .update({"last_seen_at": now})\
+                .in_("id", chunk)\
+                .execute()
+            count += len(chunk)
+        return count
+    
     # ========== 가격 이력 관련 ==========
     
     def add_price_history(self, product_id: str, price: int, original_price: int, 
@@ -75,6 +173,185 @@ class Database:
         
         return result.data[0] if result.data else None
     
+    def add_price_history_bulk(self, records: List[Dict]) -> int:
+        """가격 이력 일괄 추가
+        
+        Args:
+            records: product_id, price, original_price, discount_rate, is_on_sale 키를 가진 dict 목록
+        """
+        count = 0
+        for chunk in _chunks([{
+            "product_id": record["product_id"],
+            "price": record["price"],
+            "original_price": record["original_price"],
+            "discount_rate": record.get("discount_rate", 0),
+            "is_on_sale": record.get("is_on_sale", False)
+        } for record in records]):
+            result = self.client.table("price_history").insert(chunk).execute()
+            count += len(result.data) if result.data else 0
+        
+        return count
+    
+    def get_latest_prices(self) -> Dict[str, Tuple[int, int, bool]]:
+        """모든 상품의 최신 가격 조회 (실행 시작 시 1회, 변경 감지용)
+        
+        Returns:
+            product_id -> (price, original_price, is_on_sale)
+        """
+        latest = {}
+        after = None
+        page_size = 1000  # PostgREST 기본 최대 행 수
+        
+        while True:
+            result = self.client.rpc("get_latest_prices", {
+                "p_after": after,
+                "p_limit": page_size
+            }).execute()
+            rows = result.data or []
+            for row in rows:
+                latest[row["product_id"]] = (row["price"], row["original_price"], row["is_on_sale"])
+            
+            if len(rows) < page_size:
+                break
+            after = rows[-1]["product_id"]
+        
+        return latest
+    
+    def update_price_summary(self, records: List[Dict]) -> int:
+        """상품별 가격 요약(product_price_summary) 일괄 갱신
+        
+        이전/최저/최고가와 하락폭 계산은 apply_price_summary 함수가 DB에서 처리합니다.
+        """
+        count = 0
+        for chunk in _chunks([{
+            "product_id": record["product_id"],
+            "price": record["price"],
+            "original_price": record["original_price"],
+            "discount_rate": record.get("discount_rate", 0),
+            "is_on_sale": record.get("is_on_sale", False)
+        } for record in records]):
+            result = self.client.rpc("apply_price_summary", {"p_rows": chunk}).execute()
+            count += result.data or 0
+        
+        return count
+    
+    def update_price_analytics(self, rows: List[Dict]) -> int:
+        """가격 분석 결과를 product_price_summary에 일괄 반영 (apply_price_analytics 함수)
+        
+        역대 최저가 여부(is_all_time_low)는 요약의 lowest_price와 비교해 DB에서 채웁니다.
+        """
+        count = 0
+        for chunk in _chunks(rows):
+            result = self.client.rpc("apply_price_analytics", {"p_rows": chunk}).execute()
+            count += result.data or 0
+        
+        return count
+    
+    # ========== 가격 알림 관련 ==========
+    
+    def get_active_alerts(self, product_ids: List[str]) -> List[Dict]:
+        """상품들의 활성 가격 알림 조회 (product_id별 목표가 내림차순)
+        
+        가격이 바뀐 상품만 넘기므로 전체 알림 수가 아니라 변동 상품 수에 비례해 요청합니다.
+        """
+        alerts = []
+        page_size = 1000  # PostgREST 기본 최대 행 수
+        for i in range(0, len(product_ids), DB_FILTER_BATCH_SIZE):
+            chunk = product_ids[i:i + DB_FILTER_BATCH_SIZE]
+            offset = 0
+            while True:
+                rows = self.client.table("price_alerts")\
+                    .select("id, product_id, user_email, target_price")\
+                    .eq("is_active", True)\
+                    .in_("product_id", chunk)\
+                    .order("product_id")\
+                    .order("target_price", desc=True)\
+                    .order("id")\
+                    .range(offset, offset + page_size - 1)\
+                    .execute().data or []
+                alerts.extend(rows)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        return alerts
+    
+    def trigger_price_alerts(self, triggered: List[Dict]) -> int:
+        """발동한 알림 일괄 비활성화 + notifications에 발송 대기 추가 (trigger_price_alerts 함수)"""
+        count = 0
+        for chunk in _chunks(triggered):
+            result = self.client.rpc("trigger_price_alerts", {"p_rows": chunk}).execute()
+            count += result.data or 0
+        
+        return count
+    
+    # ========== 푸시 알림 발송 ==========
+    
+    def queue_price_drop_notifications(self, product_ids: List[str], since: datetime) -> int:
+        """since 이후 가격이 내려간 상품을 찜한 사용자에게 알림 추가 (queue_price_drop_notifications 함수)"""
+        count = 0
+        for i in range(0, len(product_ids), DB_BATCH_SIZE):
+            result = self.client.rpc("queue_price_drop_notifications", {
+                "p_product_ids": product_ids[i:i + DB_BATCH_SIZE],
+                "p_since": since.isoformat()
+            }).execute()
+            count += result.data or 0
+        return count
+    
+    def queue_coupon_notifications(self, brands: List[str]) -> int:
+        """쿠폰이 바뀐 브랜드의 상품을 찜한 사용자에게 알림 추가 (브랜드별 최대 할인 쿠폰 1건)"""
+        if not brands:
+            return 0
+        result = self.client.rpc("queue_coupon_notifications", {"p_brands": brands}).execute()
+        return result.data or 0
+    
+    def claim_push_notifications(self, limit: int, started_at: str) -> List[Dict]:
+        """발송할 알림 + 구독 정보 (claim_push_notifications 함수가 발송 중으로 표시)"""
+        result = self.client.rpc("claim_push_notifications", {
+            "p_limit": limit,
+            "p_started_at": started_at
+        }).execute()
+        return result.data or []
+    
+    def finish_push_notifications(self, sent: List[str], retry: List[str], dropped: List[str],
+                                  max_attempts: int) -> int:
+        """발송 결과 일괄 반영 (finish_push_notifications 함수)"""
+        result = self.client.rpc("finish_push_notifications", {
+            "p_sent": sent,
+            "p_retry": retry,
+            "p_dropped": dropped,
+            "p_max_attempts": max_attempts
+        }).execute()
+        return result.data or 0
+    
+    def delete_push_subscriptions(self, subscription_ids: List[str]) -> int:
+        """만료/해지된 푸시 구독 삭제"""
+        count = 0
+        for i in range(0, len(subscription_ids), DB_FILTER_BATCH_SIZE):
+            chunk = subscription_ids[i:i + DB_FILTER_BATCH_SIZE]
+            self.client.table("push_subscriptions").delete().in_("id", chunk).execute()
+            count += len(chunk)
+        return count
+    
+    # ========== 유지보수 ==========
+    
+    def ensure_price_partitions(self, months_ahead: int = PRICE_PARTITION_MONTHS_AHEAD) -> int:
+        """이번 달부터 months_ahead개월 뒤까지 price_history 월 파티션 생성"""
+        result = self.client.rpc("ensure_price_history_partitions", {"p_months_ahead": months_ahead}).execute()
+        return result.data or 0
+    
+    def rollup_price_history(self, since: Optional[date], until: date) -> int:
+        """[since, until) 기간 가격 이력을 price_history_daily로 집계"""
+        result = self.client.rpc("rollup_price_history", {
+            "p_from": since.isoformat() if since else None,
+            "p_to": until.isoformat()
+        }).execute()
+        return result.data or 0
+    
+    def compact_price_history(self, before: date) -> int:
+        """before 이전 원본 가격 이력 정리 (롤업 후 지난 월 파티션 삭제 + 나머지 DELETE)"""
+        result = self.client.rpc("compact_price_history", {"p_before": before.isoformat()}).execute()
+        return result.data or 0
+    
     def get_latest_price(self, product_id: str) -> Optional[Dict]:
         """상품의 최신 가격 조회"""
         result = self.client.table("price_history")\
@@ -132,6 +409,32 @@ class Database:
             print(f"  🎫 새 쿠폰 추가: {coupon_data['brand']} - {coupon_data['coupon_name']}")
             return result.data[0] if result.data else None
     
+    def upsert_coupons_bulk(self, coupons: List[Dict]) -> int:
+        """쿠폰 일괄 추가/업데이트 ((brand, coupon_name) 충돌 시 업데이트)"""
+        now = datetime.utcnow().isoformat()
+        rows = {}
+        for coupon_data in coupons:
+            rows[(coupon_data["brand"], coupon_data["coupon_name"])] = {
+                "brand": coupon_data["brand"],
+                "coupon_name": coupon_data["coupon_name"],
+                "discount_type": coupon_data["discount_type"],
+                "discount_value": coupon_data["discount_value"],
+                "min_purchase": coupon_data.get("min_purchase"),
+                "max_discount": coupon_data.get("max_discount"),
+                "expires_at": coupon_data.get("expires_at"),
+                "is_active": True,
+                "recorded_at": now
+            }
+        
+        count = 0
+        for chunk in _chunks(list(rows.values())):
+            result = self.client.table("coupons")\
+                .upsert(chunk, on_conflict="brand,coupon_name")\
+                .execute()
+            count += len(result.data) if result.data else 0
+        
+        return count
+    
     def deactivate_expired_coupons(self) -> int:
         """만료된 쿠폰 비활성화"""
         now = datetime.utcnow().isoformat()
@@ -0,0 +1,175 @@
+"""
+올프 크롤러 - 페이지 녹화/재생
+랭킹/상세 페이지를 HTML(+HAR) 파일로 녹화해 두고, 올리브영에 접속하지 않고
+Playwright 라우팅(또는 HTTP 엔진용 MockTransport)으로 재생합니다.
+
+사용법:
+    python fixtures.py record --categories 스킨케어,선케어 --pages 2 --details 10
+"""
+import os
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+from playwright.async_api import BrowserContext, Route, Request
+from config import CATEGORIES, FIXTURES_PATH, get_ranking_url, get_product_url
+
+# 재생 시 녹화본이 없는 페이지에 돌려줄 빈 문서
+EMPTY_DOCUMENT = "<html><head></head><body></body></html>"
+
+
+def fixture_name(url: str) -> Optional[str]:
+    """URL -> 녹화 파일명 (랭킹/상세 페이지가 아니면 None)"""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    
+    if parsed.path.endswith("/getBestList.do"):
+        category_code = query.get("fltDispCatNo", [""])[0]
+        page_idx = query.get("pageIdx", ["1"])[0]
+        return f"ranking_{category_code}_{page_idx}.html"
+    
+    if parsed.path.endswith("/getGoodsDetail.do"):
+        goods_no = query.get("goodsNo", [""])[0]
+        return f"detail_{goods_no}.html"
+    
+    return None
+
+
+def load_fixture(url: str, fixtures_dir: str = FIXTURES_PATH) -> Optional[str]:
+    """URL에 해당하는 녹화본 HTML 로드"""
+    name = fixture_name(url)
+    if not name:
+        return None
+    
+    path = os.path.join(fixtures_dir, name)
+    if not os.path.exists(path):
+        return None
+    
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def list_fixtures(prefix: str, fixtures_dir: str = FIXTURES_PATH) -> List[str]:
+    """녹화 파일 경로 목록 (prefix: "ranking_" 또는 "detail_")"""
+    if not os.path.isdir(fixtures_dir):
+        return []
+    return sorted(
+        os.path.join(fixtures_dir, name)
+        for name in os.listdir(fixtures_dir)
+        if name.startswith(prefix) and name.endswith(".html")
+    )
+
+
+# ========== 재생 ==========
+
+async def install_replay(context: BrowserContext, fixtures_dir: str = FIXTURES_PATH):
+    """컨텍스트의 모든 요청을 녹화본으로 응답 (외부 네트워크 차단)"""
+    
+    async def handle_route(route: Route, request: Request):
+        if request.resource_type != "document":
+            await route.abort()
+            return
+        
+        html = load_fixture(request.url, fixtures_dir)
+        await route.fulfill(
+            status=200 if html is not None else 404,
+            content_type="text/html; charset=utf-8",
+            body=html if html is not None else EMPTY_DOCUMENT
+        )
+    
+    await context.route("**/*", handle_route)
+
+
+def replay_transport(fixtures_dir: str = FIXTURES_PATH):
+    """HTTP 엔진(HttpRankingFetcher)용 녹화본 재생 transport"""
+    import httpx
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        html = load_fixture(str(request.url), fixtures_dir)
+        if html is None:
+            return httpx.Response(404, text=EMPTY_DOCUMENT)
+        return httpx.Response(200, text=html, headers={"Content-Type": "text/html; charset=utf-8"})
+    
+    return httpx.MockTransport(handler)
+
+
+# ========== 녹화 ==========
+
+async def record_fixtures(categories: Dict[str, str], pages: int = 1, details: int = 0,
+                          fixtures_dir: str = FIXTURES_PATH):
+    """랭킹 페이지와 상세 페이지(쿠폰 팝업 열린 상태)를 HTML/HAR로 녹화"""
+    from auth import AuthManager
+    from scraper import EXTRACT_PRODUCT_ITEMS_JS, COUPON_BUTTON_SELECTOR
+    
+    os.makedirs(fixtures_dir, exist_ok=True)
+    # HAR는 컨텍스트를 닫을 때 저장되므로 브라우저 서버의 공유 컨텍스트 대신 직접 실행
+    auth = AuthManager(use_server=False)
+    
+    def save(url: str, html: str):
+        path = os.path.join(fixtures_dir, fixture_name(url))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"  💾 {os.path.basename(path)} ({len(html) // 1024}KB)")
+    
+    try:
+        if not await auth.ensure_logged_in(headless=False):
+            print("❌ 로그인 실패. 녹화를 중단합니다.")
+            return
+        
+        # 원본 네트워크 응답은 HAR로도 남겨둠 (route_from_har 재생용)
+        await auth.context.route_from_har(
+            os.path.join(fixtures_dir, "oliveyoung.har"),
+            url="**/oliveyoung.co.kr/**",
+            update=True
+        )
+        page = await auth.get_page()
+        goods_numbers: List[str] = []
+        
+        for category_name, category_code in categories.items():
+            print(f"\n📂 [{category_name}] 랭킹 페이지 녹화...")
+            for page_num in range(1, pages + 1):
+                url = get_ranking_url(category_code, page_num)
+                await auth.profile.goto(page, url, wait_for=".prd_info")
+                save(url, await page.content())
+                
+                for raw in await page.evaluate(EXTRACT_PRODUCT_ITEMS_JS):
+                    goods_no = parse_qs(urlparse(raw.get("href") or "").query).get("goodsNo", [None])[0]
+                    if goods_no and goods_no not in goods_numbers:
+                        goods_numbers.append(goods_no)
+        
+        print(f"\n🎫 상세 페이지 {min(details, len(goods_numbers))}개 녹화...")
+        for goods_no in goods_numbers[:details]:
+            url = get_product_url(goods_no)
+            await auth.profile.goto(page, url, wait_for=COUPON_BUTTON_SELECTOR)
+            
+            # 쿠폰 팝업이 열린 상태의 DOM을 저장해야 재생 시 쿠폰 파싱 가능
+            coupon_button = await page.query_selector(COUPON_BUTTON_SELECTOR)
+            if coupon_button:
+                await coupon_button.click()
+                await asyncio.sleep(1)
+            save(url, await page.content())
+    
+    finally:
+        await auth.close()
+
+
+def main():
+    """녹화 진입점"""
+    parser = argparse.ArgumentParser(description="올프 크롤러 페이지 녹화")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    record = subparsers.add_parser("record", help="랭킹/상세 페이지 녹화")
+    record.add_argument("--categories", default="", help="쉼표로 구분한 카테고리명 (기본: 전체)")
+    record.add_argument("--pages", type=int, default=1, help="카테고리당 녹화할 랭킹 페이지 수")
+    record.add_argument("--details", type=int, default=0, help="녹화할 상세 페이지 수")
+    record.add_argument("--out", default=FIXTURES_PATH, help="저장 폴더")
+    args = parser.parse_args()
+    
+    names = [name.strip() for name in args.categories.split(",") if name.strip()]
+    categories = {name: CATEGORIES[name] for name in names} if names else CATEGORIES
+    
+    asyncio.run(record_fixtures(categories, pages=args.pages, details=args.details, fixtures_dir=args.out))
+
+
+if __name__ == "__main__":
+    main()
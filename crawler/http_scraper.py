@@ -0,0 +1,105 @@
+"""
+올프 크롤러 - HTTP 전용 랭킹 페이지 수집
+브라우저 렌더링 없이 getBestList.do를 HTTP로 요청하고 HTML을 직접 파싱합니다.
+로그인 쿠키는 Playwright가 저장한 browser_state/state.json에서 가져옵니다.
+"""
+import os
+import json
+from typing import List, Dict, Optional
+
+import httpx
+from selectolax.parser import HTMLParser
+
+from metrics import metrics
+from config import (
+    OLIVEYOUNG_BASE_URL,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT,
+    HTTP_USER_AGENT
+)
+
+
+def load_state_cookies(state_file: str) -> httpx.Cookies:
+    """Playwright storage_state 파일에서 쿠키 로드"""
+    cookies = httpx.Cookies()
+    if not os.path.exists(state_file):
+        return cookies
+    
+    with open(state_file, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    
+    for cookie in state.get("cookies", []):
+        cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/")
+        )
+    return cookies
+
+
+def parse_ranking_html(html: str) -> List[Dict]:
+    """랭킹 페이지 HTML에서 .prd_info 아이템 원시 값 추출
+    
+    EXTRACT_PRODUCT_ITEMS_JS와 같은 dict 형태를 반환합니다.
+    """
+    tree = HTMLParser(html)
+    
+    def text(item, selector: str) -> Optional[str]:
+        node = item.css_first(selector)
+        return node.text() if node else None
+    
+    def attr(item, selector: str, name: str) -> Optional[str]:
+        node = item.css_first(selector)
+        return node.attributes.get(name) if node else None
+    
+    return [{
+        "href": attr(item, "a", "href"),
+        "brand": text(item, ".tx_brand"),
+        "name": text(item, ".tx_name"),
+        "image_url": attr(item, "img", "src"),
+        "cur_price": text(item, ".tx_cur .tx_num"),
+        "org_price": text(item, ".tx_org .tx_num"),
+    } for item in tree.css(".prd_info")]
+
+
+class HttpRankingFetcher:
+    """연결 풀을 사용하는 랭킹 페이지 HTTP 수집기"""
+    
+    def __init__(self, state_file: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            transport: 요청을 대신 처리할 transport (녹화 재생 시 fixtures.replay_transport)
+        """
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            cookies=load_state_cookies(state_file),
+            headers={
+                "User-Agent": HTTP_USER_AGENT,
+                "Referer": OLIVEYOUNG_BASE_URL,
+                "Accept-Language": "ko-KR,ko;q=0.9",
+            },
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE
+            ),
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True
+        )
+    
+    async def fetch_ranking_items(self, url: str) -> Optional[List[Dict]]:
+        """랭킹 페이지 요청 후 아이템 추출
+        
+        Returns:
+            아이템 목록, HTML에 .prd_info가 없으면 None (브라우저로 대체 필요)
+        """
+        response = await self.client.get(url)
+        response.raise_for_status()
+        
+        with metrics.timer("phase_seconds", phase="html_parse"):
+            items = parse_ranking_html(response.text)
+        return items or None
+    
+    async def close(self):
+        """연결 풀 종료"""
+        await self.client.aclose()
@@ -1,24 +1,71 @@
 """
 올프 크롤러 - 메인 실행 파일
 하루 1회 실행하여 올리브영 상품 및 쿠폰 정보를 수집합니다.
+
+    python main.py                              # 전체 카테고리 + 쿠폰
+    python main.py --categories 스킨케어,선케어     # 일부 카테고리만 (+ 발견한 브랜드 쿠폰)
+    python main.py --prices-only                # 상품/가격만 (쿠폰 수집 생략)
+    python main.py --coupons-only               # 쿠폰만 (DB에 있는 브랜드별 상품으로 방문)
+    python main.py stats                        # DB 현황과 마지막 실행 요약만 출력 (브라우저 없음)
+
+Playwright, Supabase 등 무거운 모듈은 해당 모드에서 필요할 때만 import합니다.
 """
 import os
-import sys
+import json
+import glob
+import queue
 import asyncio
+import logging
 import argparse
-from datetime import datetime
-from typing import Dict
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config import (
+    CATEGORIES, LOGS_PATH, METRICS_PATH, CRAWL_CONCURRENCY, COUPON_CONCURRENCY, SCRAPE_ENGINE,
+    LEAN_PAGE_PROFILE, STORAGE_BACKEND, SNAPSHOT_ENABLED, VAPID_PRIVATE_KEY, COUPON_CACHE_PATH,
+    EXPORT_CHUNK_SIZE, PAGE_FINGERPRINT_ENABLED, PAGE_FINGERPRINT_PATH
+)
+from storage import Storage, create_storage, STORAGE_BACKENDS
+from checkpoint import Checkpoint
+from shard import Shard, select_categories, load_coupon_brands
+from metrics import metrics, InstrumentedStorage
 
-from config import CATEGORIES, LOGS_PATH
-from auth import AuthManager
-from database import Database
-from scraper import ProductScraper, CouponScraper
+# 로그 파일별 버퍼 로거 (파일 쓰기는 백그라운드 스레드에서 처리)
+_file_loggers: Dict[str, logging.Logger] = {}
+_log_listeners = []
 
 
 def setup_logging():
     """로그 폴더 설정"""
     os.makedirs(LOGS_PATH, exist_ok=True)
-    
+
+
+def _get_file_logger(log_file: str) -> logging.Logger:
+    """로그 파일용 큐 기반 로거 (이벤트 루프를 파일 I/O로 막지 않음)"""
+    if log_file not in _file_loggers:
+        log_queue = queue.SimpleQueue()
+        logger = logging.getLogger(f"allday_price.{log_file}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(QueueHandler(log_queue))
+        
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        listener = QueueListener(log_queue, file_handler)
+        listener.start()
+        
+        _file_loggers[log_file] = logger
+        _log_listeners.append(listener)
+    return _file_loggers[log_file]
+
+
+def flush_logs():
+    """버퍼에 남은 로그를 파일에 모두 쓰고 로거 종료"""
+    while _log_listeners:
+        _log_listeners.pop().stop()
+    _file_loggers.clear()
+
 
 def log_message(message: str, log_file: str = None):
     """콘솔과 파일에 로그 기록"""
@@ -27,42 +74,98 @@ def log_message(message: str, log_file: str = None):
     print(log_line)
     
     if log_file:
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(log_line + "\n")
+        _get_file_logger(log_file).info(log_line)
 
 
-async def run_crawler(full_refresh: bool = False):
+def sample_products_from_storage(db: Storage) -> Dict[str, str]:
+    """브랜드 -> 가장 최근에 랭킹에서 본 상품 ID (쿠폰만 수집할 때 방문할 상세 페이지)"""
+    latest: Dict[str, Dict] = {}
+    for rows in db.iter_products(EXPORT_CHUNK_SIZE):
+        for row in rows:
+            current = latest.get(row["brand"])
+            if current is None or str(row.get("last_seen_at") or "") > str(current.get("last_seen_at") or ""):
+                latest[row["brand"]] = row
+    return {brand: row["oliveyoung_id"] for brand, row in latest.items()}
+
+
+async def run_crawler(full_refresh: bool = False, concurrency: int = CRAWL_CONCURRENCY,
+                      engine: str = SCRAPE_ENGINE, lean: bool = LEAN_PAGE_PROFILE,
+                      storage: str = STORAGE_BACKEND, resume: bool = False, push: bool = True,
+                      categories: Optional[Dict[str, str]] = None, shard: Optional[Shard] = None,
+                      coupon_brands: Optional[Dict[str, str]] = None,
+                      prices_only: bool = False, coupons_only: bool = False):
     """크롤러 메인 실행 함수
     
     Args:
         full_refresh: True면 모든 상품 정보 갱신 (기본: 가격만 업데이트)
+        concurrency: 동시에 크롤링할 카테고리 수 (페이지 풀 크기)
+        engine: 랭킹 페이지 수집 엔진 ("browser" 또는 "http")
+        lean: True면 이미지/폰트/분석 도메인 차단 + 정적 리소스 캐시 + 콘텐츠 기준 대기
+        storage: 저장소 ("supabase", "sqlite", "jsonl", "null")
+        resume: True면 오늘 체크포인트를 읽어 완료한 카테고리/페이지/쿠폰 브랜드를 건너뜀
+        push: False면 알림을 대기열에만 넣고 웹 푸시는 보내지 않음 (나중에 push.py send)
+        categories: 크롤링할 카테고리 (기본: CATEGORIES 전체)
+        shard: 이 프로세스가 맡는 몫 (카테고리는 순서대로 나누고, 쿠폰은 담당 브랜드만 수집)
+        coupon_brands: 브랜드 -> 샘플 상품 ID, 주어지면 카테고리 크롤링 없이 이 브랜드들의 쿠폰만 수집
+        prices_only: True면 상품/가격만 수집 (쿠폰 수집과 쿠폰 알림 생략)
+        coupons_only: True면 카테고리 크롤링 없이 DB에 있는 브랜드의 쿠폰만 수집
     """
+    # 크롤링에 필요한 모듈은 여기서 import (stats 모드와 --help는 Playwright/pyarrow 등을 불러오지 않음)
+    # 상품/쿠폰 수집에만 쓰는 모듈은 해당 단계에서 import (모드마다 필요한 것만)
+    from auth import AuthManager, PagePool
+    from page_profile import PageProfile
+    from rate_limiter import RateLimiter
+    
     setup_logging()
+    shard = shard or Shard()
+    coupons_only = coupons_only or coupon_brands is not None
+    phase = "coupons" if coupons_only else "crawl"
+    categories = {} if coupons_only else shard.split_categories(categories or CATEGORIES)
+    suffix = shard.suffix if phase == "crawl" else f"{shard.suffix}_coupons"
+    crawl_prices = bool(categories)
+    crawl_coupons = not prices_only
     
-    # 로그 파일 경로
+    # 로그 파일 경로 (샤드마다 따로 기록)
     today = datetime.now().strftime("%Y-%m-%d")
-    log_file = os.path.join(LOGS_PATH, f"crawl_{today}.log")
+    log_file = os.path.join(LOGS_PATH, f"crawl_{today}{shard.suffix}.log")
     
     log_message("=" * 60, log_file)
     if full_refresh:
         log_message("🚀 올프(All Day Price) 크롤러 시작 [전체 갱신 모드]", log_file)
     else:
         log_message("🚀 올프(All Day Price) 크롤러 시작 [가격만 업데이트 모드]", log_file)
+    if shard.enabled:
+        metrics.const_labels["shard"] = shard.label
+        log_message(f"🧩 샤드 {shard.label}: 카테고리 {len(categories)}개 ({', '.join(categories) or '없음'})", log_file)
+    if coupons_only:
+        log_message("🎫 쿠폰 전용 실행 (카테고리 크롤링 생략)", log_file)
+    elif prices_only:
+        log_message("💰 가격 전용 실행 (쿠폰 수집 생략)", log_file)
     log_message("=" * 60, log_file)
     
     start_time = datetime.now()
+    checkpoint = Checkpoint(run_date=today, resume=resume, suffix=suffix)
     
     # 결과 통계
     stats = {
         "new_products": 0,
         "updated_products": 0,
+        "price_changes": 0,
         "total_coupons": 0,
+        "alerts_triggered": 0,
+        "pushes_sent": 0,
         "categories_done": 0,
         "errors": []
     }
     
-    auth = AuthManager()
-    db = Database()
+    auth = AuthManager(profile=PageProfile(lean=lean))
+    db = InstrumentedStorage(create_storage(storage))
+    http_fetcher = None
+    product_scraper = None
+    coupon_scraper = None
+    fingerprints = None
+    snapshot = None
+    changed_prices: Dict[str, Dict] = {}
     
     try:
         # 1. 로그인 상태 확인
@@ -74,49 +177,239 @@ async def run_crawler(full_refresh: bool = False):
             return
         
         page = await auth.get_page()
+        # 카테고리 크롤링용 페이지 + 쿠폰 수집 전용 페이지 (같은 로그인 세션 공유, 모드에 따라 필요한 만큼만)
+        category_pages = max(concurrency, 1) if crawl_prices else 0
+        coupon_pages = COUPON_CONCURRENCY if crawl_coupons else 0
+        shared_pool = await auth.get_page_pool(category_pages + coupon_pages)
+        page_pool = PagePool(shared_pool.pages[:category_pages] or [page])
+        coupon_pool = PagePool(shared_pool.pages[category_pages:] or [page])
+        rate_limiter = RateLimiter()
+        
+        # 가격 이력이 기본 파티션에 쌓이지 않도록 월 파티션을 미리 생성
+        if crawl_prices:
+            try:
+                db.ensure_price_partitions()
+            except Exception as e:
+                log_message(f"⚠️ 월 파티션 생성 실패 (maintenance.py partitions로 확인): {e}", log_file)
         
-        # 2. 상품 크롤링
-        log_message("\n📦 상품 크롤링 시작...", log_file)
+        # 수집 결과를 로컬 Parquet 스냅샷으로도 남김 (오프라인 분석용, 상품을 수집하는 실행만)
+        if crawl_prices and SNAPSHOT_ENABLED:
+            from snapshot import SnapshotWriter
+            snapshot = SnapshotWriter(run_id=start_time.strftime("%Y%m%d_%H%M%S") + suffix)
         
-        product_scraper = ProductScraper(page, db, full_refresh=full_refresh)
-        sample_products_by_brand: Dict[str, str] = {}  # 브랜드별 샘플 상품 ID
+        # 브랜드별 샘플 상품 ID (이전 실행에서 완료한 페이지 포함)
+        sample_products_by_brand: Dict[str, str] = dict(checkpoint.sample_products)
         
-        for category_name, category_code in CATEGORIES.items():
-            try:
-                log_message(f"\n📂 [{category_name}] 카테고리 크롤링...", log_file)
-                
-                products = await product_scraper.scrape_ranking_page(category_name, category_code)
-                save_stats = await product_scraper.save_products_to_db(products)
+        # 쿠폰 수집은 상품 크롤링과 동시에 진행 (브랜드의 첫 샘플 상품이 나오면 바로 요청)
+        # 전체 갱신 모드에서는 쿠폰 캐시를 무시하고 모든 브랜드를 방문
+        if crawl_coupons:
+            from scraper import CouponScraper
+            from coupon_cache import CouponCache
+            
+            coupons_done = checkpoint.coupon_brands_done
+            if coupons_done:
+                log_message(f"⏭️ 체크포인트: 완료된 쿠폰 브랜드 {len(coupons_done)}개 건너뜀", log_file)
+            coupon_scraper = CouponScraper(
+                page, db,
+                rate_limiter=rate_limiter,
+                profile=auth.profile,
+                page_pool=coupon_pool,
+                # 저장소마다 따로 유지 (다른 저장소에서 확인한 브랜드를 변동 없음으로 보고 건너뛰지 않도록)
+                cache=None if full_refresh else CouponCache(
+                    path=COUPON_CACHE_PATH.replace(".json", f"_{storage}{shard.suffix}.json")
+                )
+            )
+            coupon_scraper.start(
+                on_brands_saved=checkpoint.mark_coupon_brands_done,
+                skip_brands=coupons_done,
+                on_coupons=snapshot.add_coupons if snapshot else None
+            )
+            if coupons_only and coupon_brands is None:
+                coupon_brands = await asyncio.to_thread(sample_products_from_storage, db)
+                log_message(f"🎫 DB에 있는 브랜드 {len(coupon_brands)}개", log_file)
+            # 샤드 실행은 담당 브랜드만 수집 (나머지는 발견한 브랜드로 결과에 남겨 코디네이터가 확인)
+            for brand, product_id in {**sample_products_by_brand, **(coupon_brands or {})}.items():
+                if shard.owns_brand(brand):
+                    coupon_scraper.submit(brand, product_id)
+        
+        def add_sample_product(brand: str, product_id: str):
+            """브랜드별 샘플 상품 저장 (쿠폰 크롤링용, 처음 본 담당 브랜드는 바로 쿠폰 수집 요청)"""
+            if brand not in sample_products_by_brand:
+                sample_products_by_brand[brand] = product_id
+                if coupon_scraper and shard.owns_brand(brand):
+                    coupon_scraper.submit(brand, product_id)
+        
+        # 2. 상품 크롤링 (페이지 풀 크기만큼 카테고리 동시 진행, 쿠폰 전용 실행은 생략)
+        if crawl_prices:
+            log_message(f"\n📦 상품 크롤링 시작... (동시 {page_pool.size}개)", log_file)
+            
+            if engine == "http":
+                # HTTP 엔진은 필요할 때만 import (httpx, selectolax 의존성)
+                from http_scraper import HttpRankingFetcher
+                http_fetcher = HttpRankingFetcher(auth.state_file)
+                log_message("⚡ HTTP 엔진으로 랭킹 페이지를 수집합니다.", log_file)
+            
+            from scraper import ProductScraper
+            from pipeline import ProductWriter
+            from page_fingerprint import PageFingerprints
+            from analytics import run_price_analytics
+            from alerts import evaluate_price_alerts
+            
+            # 랭킹 페이지 지문 (DB 저장소만, 저장소/샤드마다 따로 유지)
+            # jsonl/null은 실행마다 전체 결과가 필요하므로 건너뛰지 않음
+            if PAGE_FINGERPRINT_ENABLED and not full_refresh and storage in ("supabase", "sqlite"):
+                fingerprints = PageFingerprints(
+                    path=PAGE_FINGERPRINT_PATH.replace(".json", f"_{storage}{shard.suffix}.json")
+                )
+            
+            product_scraper = ProductScraper(
+                page, db,
+                full_refresh=full_refresh,
+                rate_limiter=rate_limiter,
+                http_fetcher=http_fetcher,
+                profile=auth.profile,
+                fingerprints=fingerprints
+            )
+            product_scraper.collected_brands.update(sample_products_by_brand)
+            
+            def on_page_saved(category_name: str, page_num: int, page_products: List[Dict]):
+                checkpoint.mark_page_done(category_name, page_num, page_products)
+                product_scraper.mark_page_saved(category_name, page_num, page_products)
+            
+            def on_page_skipped(category_name: str, page_num: int, entry: Dict):
+                # 지문이 같아 저장하지 않은 페이지도 완료로 기록하고, 지난번 브랜드로 쿠폰 수집
+                checkpoint.mark_page_skipped(category_name, page_num, entry["count"], entry["brands"])
+                for brand, product_id in entry["brands"].items():
+                    add_sample_product(brand, product_id)
+            
+            product_scraper.on_page_skipped = on_page_skipped
+            
+            # 페이지 단위로 저장 대기열에 넣고, 저장이 끝난 페이지만 체크포인트/페이지 지문에 기록
+            writer = ProductWriter(product_scraper, on_page_saved=on_page_saved)
+            writer.start()
+            
+            async def crawl_category(category_name: str, category_code: str) -> Dict:
+                """카테고리 1개 크롤링 + 저장 (카테고리별 통계 반환)"""
+                start_page, collected_count = checkpoint.category_progress(category_name)
+                saved_pages = []
                 
-                stats["new_products"] += save_stats["new_count"]
-                stats["updated_products"] += save_stats["updated_count"]
-                stats["categories_done"] += 1
+                try:
+                    async with page_pool.acquire() as worker_page:
+                        log_message(f"\n📂 [{category_name}] 카테고리 크롤링...", log_file)
+                        async for page_num, page_products in product_scraper.scrape_ranking_page(
+                            category_name, category_code, page=worker_page,
+                            start_page=start_page,
+                            collected_count=collected_count
+                        ):
+                            # 브랜드별 샘플 상품 저장 (쿠폰 크롤링용)
+                            for product in page_products:
+                                add_sample_product(product["brand"], product["oliveyoung_id"])
+                            if snapshot:
+                                snapshot.add_products(page_products)
+                            saved_pages.append(await writer.put(category_name, page_num, page_products))
+                finally:
+                    # 페이지 로드가 중간에 실패해도 이미 넣은 페이지는 저장을 기다려 체크포인트에 남김
+                    save_results = await asyncio.gather(*saved_pages, return_exceptions=True)
                 
-                # 브랜드별 샘플 상품 저장 (쿠폰 크롤링용)
-                for product in products:
-                    brand = product["brand"]
-                    if brand not in sample_products_by_brand:
-                        sample_products_by_brand[brand] = product["oliveyoung_id"]
+                # 저장에 실패한 카테고리는 완료로 남기지 않음 (다음 --resume에서 다시 시도)
+                for result in save_results:
+                    if isinstance(result, Exception):
+                        raise result
+                checkpoint.mark_category_done(category_name)
                 
+                save_stats = writer.category_stats.get(
+                    category_name, {"new_count": 0, "updated_count": 0, "changed_count": 0}
+                )
                 total_saved = save_stats["new_count"] + save_stats["updated_count"]
                 log_message(f"  ✅ [{category_name}] {total_saved}개 저장 (신규: {save_stats['new_count']}, 업데이트: {save_stats['updated_count']})", log_file)
-                
+                return save_stats
+            
+            pending_categories = {
+                name: code for name, code in categories.items()
+                if not checkpoint.is_category_done(name)
+            }
+            skipped = len(categories) - len(pending_categories)
+            if skipped:
+                log_message(f"⏭️ 체크포인트: 완료된 카테고리 {skipped}개 건너뜀", log_file)
+                stats["categories_done"] += skipped
+            
+            results = await asyncio.gather(
+                *(crawl_category(name, code) for name, code in pending_categories.items()),
+                return_exceptions=True
+            )
+            await writer.close()
+            
+            # 이번 실행에서 바뀐 가격으로 가격 요약 테이블 갱신 (홈 화면 쿼리용)
+            changed_prices.update(product_scraper.summary_updates)
+            try:
+                async with metrics.atimer("phase_seconds", phase="price_summary"):
+                    summary_count = await product_scraper.update_price_summary()
+                log_message(f"📈 가격 요약 {summary_count}개 상품 갱신", log_file)
+            except Exception as e:
+                error_msg = f"가격 요약 갱신 오류: {e}"
+                stats["errors"].append(error_msg)
+                log_message(f"  ❌ {error_msg}", log_file)
+            
+            # 이번 실행 가격 + 최근 이력으로 이동평균/변동성/가짜 할인 계산 (프론트엔드는 계산 결과만 읽음)
+            try:
+                async with metrics.atimer("phase_seconds", phase="price_analytics"):
+                    analyzed_count = await asyncio.to_thread(run_price_analytics, db, product_scraper.run_prices)
+                log_message(f"🧮 가격 분석 {analyzed_count}개 상품 반영", log_file)
+            except Exception as e:
+                error_msg = f"가격 분석 오류: {e}"
+                stats["errors"].append(error_msg)
+                log_message(f"  ❌ {error_msg}", log_file)
+            
+            # 가격이 바뀐 상품의 가격 알림 평가 (발동한 알림은 발송 대기열에 추가)
+            try:
+                async with metrics.atimer("phase_seconds", phase="price_alerts"):
+                    alert_stats = await asyncio.to_thread(evaluate_price_alerts, db, changed_prices)
+                stats["alerts_triggered"] = alert_stats["triggered"]
+                log_message(f"🔔 가격 알림 {alert_stats['triggered']}건 발동 (변동 상품 {alert_stats['products']}개, 확인한 알림 {alert_stats['alerts']}개)", log_file)
             except Exception as e:
-                error_msg = f"[{category_name}] 크롤링 오류: {e}"
+                error_msg = f"가격 알림 평가 오류: {e}"
                 stats["errors"].append(error_msg)
                 log_message(f"  ❌ {error_msg}", log_file)
+            
+            # 카테고리별 통계 병합 (카테고리 순서 유지)
+            for category_name, result in zip(pending_categories, results):
+                if isinstance(result, Exception):
+                    error_msg = f"[{category_name}] 크롤링 오류: {result}"
+                    stats["errors"].append(error_msg)
+                    log_message(f"  ❌ {error_msg}", log_file)
+                    continue
+                
+                stats["new_products"] += result["new_count"]
+                stats["updated_products"] += result["updated_count"]
+                stats["price_changes"] += result["changed_count"]
+                stats["categories_done"] += 1
         
-        # 3. 쿠폰 크롤링
-        log_message("\n🎫 쿠폰 크롤링 시작...", log_file)
+        # 3. 쿠폰 크롤링 (상품 크롤링 중 시작한 수집의 남은 브랜드 마무리)
+        if coupon_scraper:
+            log_message("\n🎫 쿠폰 크롤링 마무리 중...", log_file)
+            stats["total_coupons"] = await coupon_scraper.finish()
         
-        coupon_scraper = CouponScraper(page, db)
-        coupon_count = await coupon_scraper.scrape_brand_coupons(
-            product_scraper.collected_brands,
-            sample_products_by_brand
-        )
-        stats["total_coupons"] = coupon_count
+        # 4. 알림 (찜한 상품 가격 하락/브랜드 쿠폰 변경을 대기열에 추가한 뒤 웹 푸시로 발송)
+        try:
+            since = start_time.astimezone(timezone.utc)
+            queued = 0
+            if changed_prices:
+                queued += await asyncio.to_thread(db.queue_price_drop_notifications, list(changed_prices), since)
+            if coupon_scraper:
+                queued += await asyncio.to_thread(db.queue_coupon_notifications, sorted(coupon_scraper.changed_brands))
+            log_message(f"\n📨 알림 대기열 추가: {queued}건", log_file)
+            
+            if push and VAPID_PRIVATE_KEY:
+                from push import deliver_notifications
+                push_stats = await deliver_notifications(db)
+                stats["pushes_sent"] = push_stats["sent"]
+                log_message(f"📲 웹 푸시 {push_stats['sent']}건 발송 (알림 {push_stats['notifications']}건, 만료 구독 {push_stats['gone']}개 삭제, 실패 {push_stats['failed']}건)", log_file)
+        except Exception as e:
+            error_msg = f"알림 발송 오류: {e}"
+            stats["errors"].append(error_msg)
+            log_message(f"  ❌ {error_msg}", log_file)
         
-        # 4. 완료 리포트
+        # 5. 완료 리포트
         end_time = datetime.now()
         duration = end_time - start_time
         
@@ -124,10 +417,31 @@ async def run_crawler(full_refresh: bool = False):
         log_message("📊 크롤링 완료 리포트", log_file)
         log_message("=" * 60, log_file)
         log_message(f"  ⏱️ 소요 시간: {duration}", log_file)
-        log_message(f"  📂 완료 카테고리: {stats['categories_done']}/{len(CATEGORIES)}", log_file)
+        log_message(f"  📂 완료 카테고리: {stats['categories_done']}/{len(categories)}", log_file)
         log_message(f"  📦 신규 상품: {stats['new_products']}개", log_file)
-        log_message(f"  🔄 가격 업데이트: {stats['updated_products']}개", log_file)
-        log_message(f"  🎫 수집 쿠폰: {stats['total_coupons']}개", log_file)
+        log_message(f"  🔄 가격 업데이트: {stats['updated_products']}개 (가격 변동 기록: {stats['price_changes']}건)", log_file)
+        if fingerprints:
+            log_message(f"  ⏩ 변동 없어 저장을 건너뛴 페이지: {fingerprints.skipped}/{product_scraper.pages_loaded}개", log_file)
+        if coupon_scraper:
+            log_message(f"  🎫 수집 쿠폰: {stats['total_coupons']}개 (방문 {coupon_scraper.stats['visited']}개 브랜드, 캐시로 건너뜀 {coupon_scraper.stats['cached']}개)", log_file)
+        log_message(f"  🔔 발동한 가격 알림: {stats['alerts_triggered']}건 (웹 푸시 발송 {stats['pushes_sent']}건)", log_file)
+        log_message(f"  📶 브라우저 전송량: {auth.profile.summary()}", log_file)
+        log_message(f"  🚦 요청 속도: {rate_limiter.summary()}", log_file)
+        log_message(f"  🧱 DB 호출로 이벤트 루프 정지: {metrics.counter('event_loop_blocked_seconds', source='db'):.1f}초 (저장 스레드 제외)", log_file)
+        
+        metrics.set_gauge("run_duration_seconds", duration.total_seconds())
+        metrics.set_gauge("categories_done", stats["categories_done"])
+        metrics.set_gauge("new_products", stats["new_products"])
+        metrics.set_gauge("updated_products", stats["updated_products"])
+        metrics.set_gauge("price_changes", stats["price_changes"])
+        metrics.set_gauge("coupons_collected", stats["total_coupons"])
+        metrics.set_gauge("alerts_triggered", stats["alerts_triggered"])
+        metrics.set_gauge("pushes_sent", stats["pushes_sent"])
+        if coupon_scraper:
+            metrics.set_gauge("coupon_brands_cached", coupon_scraper.stats["cached"])
+        metrics.set_gauge("errors", len(stats["errors"]))
+        metrics.set_gauge("bytes_transferred", auth.profile.stats["bytes"])
+        metrics.set_gauge("last_success_timestamp", end_time.timestamp())
         
         if stats["errors"]:
             log_message(f"\n⚠️ 오류 {len(stats['errors'])}건:", log_file)
@@ -136,31 +450,186 @@ async def run_crawler(full_refresh: bool = False):
         
         log_message("\n✅ 크롤링이 완료되었습니다!", log_file)
         
+        # 샤드 결과 저장 (코디네이터가 통계와 브랜드 목록을 병합)
+        if shard.enabled:
+            result_path = shard.save_result(today, {
+                "categories": list(categories),
+                "duration_seconds": duration.total_seconds(),
+                "stats": {name: value for name, value in stats.items() if name != "errors"},
+                "errors": stats["errors"],
+                # 쿠폰을 수집하지 않은 실행은 브랜드를 넘기지 않음 (코디네이터가 남은 브랜드로 보지 않도록)
+                "sample_products": sample_products_by_brand if coupon_scraper else {},
+                "coupon_brands": sorted(coupon_scraper.submitted) if coupon_scraper else [],
+                "changed_brands": sorted(coupon_scraper.changed_brands) if coupon_scraper else [],
+            }, phase=phase)
+            log_message(f"🧩 샤드 결과 저장: {result_path}", log_file)
+        
         # DB 통계
         db_stats = db.get_stats()
         log_message(f"\n📈 DB 현황:", log_file)
         log_message(f"  - 전체 상품: {db_stats['total_products']}개", log_file)
         log_message(f"  - 활성 쿠폰: {db_stats['active_coupons']}개", log_file)
-        
+    
     except Exception as e:
         log_message(f"\n❌ 크롤러 오류 발생: {e}", log_file)
         raise
-        
+    
     finally:
+        # 중간에 실패해도 이미 기록한 가격 이력은 가격 요약에 반영 (다음 실행은 변동 없음으로 볼 수 있음)
+        if product_scraper and product_scraper.summary_updates:
+            try:
+                await product_scraper.update_price_summary()
+            except Exception as e:
+                log_message(f"  ❌ 가격 요약 갱신 오류: {e}", log_file)
+        
+        if snapshot:
+            try:
+                snapshot_rows = await asyncio.to_thread(snapshot.close)
+                if snapshot_rows:
+                    log_message(f"🗃️ 로컬 스냅샷 {snapshot_rows}행 저장: {snapshot.root}", log_file)
+            except Exception as e:
+                log_message(f"  ⚠️ 로컬 스냅샷 저장 실패: {e}", log_file)
+        
+        if fingerprints:
+            try:
+                fingerprints.save()
+            except OSError as e:
+                log_message(f"  ⚠️ 페이지 지문 저장 실패: {e}", log_file)
+        
+        if http_fetcher:
+            await http_fetcher.close()
         await auth.close()
+        
+        # 실행 지표 저장 (실패한 실행도 어디까지 진행됐는지 남김)
+        json_path, prom_path = metrics.export(start_time.strftime("%Y-%m-%d_%H%M%S"), suffix=suffix)
+        log_message(f"📈 실행 지표 저장: {json_path}, {prom_path}", log_file)
+        flush_logs()
+
+
+def show_stats(storage: str = STORAGE_BACKEND):
+    """DB 현황과 마지막 실행 요약 출력 (브라우저/크롤링 모듈 없이 저장소만 사용)"""
+    db = create_storage(storage)
+    db_stats = db.get_stats()
+    print("📈 DB 현황:")
+    print(f"  - 전체 상품: {db_stats['total_products']}개")
+    print(f"  - 활성 쿠폰: {db_stats['active_coupons']}개")
+    
+    runs = sorted(glob.glob(os.path.join(METRICS_PATH, "run_*.json")), key=os.path.getmtime)
+    if not runs:
+        return
+    with open(runs[-1], "r", encoding="utf-8") as f:
+        gauges = json.load(f).get("gauges", {})
+    last_success = gauges.get("last_success_timestamp")
+    print(f"\n🕒 마지막 실행 ({os.path.basename(runs[-1])}):")
+    if last_success:
+        print(f"  - 완료 시각: {datetime.fromtimestamp(last_success).strftime('%Y-%m-%d %H:%M:%S')}")
+    else:
+        print("  - 완료하지 못한 실행")
+    print(f"  - 소요 시간: {gauges.get('run_duration_seconds', 0):.0f}초, 완료 카테고리 {gauges.get('categories_done', 0):.0f}개")
+    print(f"  - 신규 상품 {gauges.get('new_products', 0):.0f}개, 가격 변동 {gauges.get('price_changes', 0):.0f}건, "
+          f"쿠폰 {gauges.get('coupons_collected', 0):.0f}개, 오류 {gauges.get('errors', 0):.0f}건")
 
 
 def main():
     """프로그램 진입점"""
     parser = argparse.ArgumentParser(description="올프(All Day Price) 크롤러")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["crawl", "stats"],
+        default="crawl",
+        help="crawl: 크롤링 (기본), stats: DB 현황과 마지막 실행 요약만 출력"
+    )
     parser.add_argument(
         "--full-refresh",
         action="store_true",
         help="전체 갱신 모드: 모든 상품 정보를 업데이트합니다 (기본: 가격만 업데이트)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=CRAWL_CONCURRENCY,
+        help=f"동시에 크롤링할 카테고리 수 (기본: {CRAWL_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["browser", "http"],
+        default=SCRAPE_ENGINE,
+        help=f"랭킹 페이지 수집 엔진 (기본: {SCRAPE_ENGINE}, http는 실패 시 브라우저로 대체)"
+    )
+    parser.add_argument(
+        "--full-render",
+        action="store_true",
+        help="리소스 차단/캐시 없이 모든 리소스를 받고 networkidle까지 대기합니다"
+    )
+    parser.add_argument(
+        "--storage",
+        choices=STORAGE_BACKENDS,
+        default=STORAGE_BACKEND,
+        help=f"저장소 (기본: {STORAGE_BACKEND}, sqlite는 로컬 파일, jsonl/null은 드라이런용)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="오늘 체크포인트를 이어서 실행합니다 (완료한 카테고리/페이지/쿠폰 브랜드 건너뜀)"
+    )
+    parser.add_argument(
+        "--no-push",
+        action="store_true",
+        help="크롤링 후 웹 푸시를 보내지 않습니다 (알림은 대기열에 남아 push.py send로 발송)"
+    )
+    parser.add_argument(
+        "--categories",
+        default=None,
+        help="크롤링할 카테고리명 (쉼표로 구분, 기본: 전체)"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--prices-only",
+        action="store_true",
+        help="상품/가격만 수집합니다 (쿠폰 수집 생략, --categories와 함께 인기 카테고리만 자주 갱신)"
+    )
+    mode.add_argument(
+        "--coupons-only",
+        action="store_true",
+        help="카테고리 크롤링 없이 DB에 있는 브랜드의 쿠폰만 수집합니다"
+    )
+    parser.add_argument(
+        "--shard",
+        default=None,
+        help="i/N: 카테고리와 쿠폰 브랜드를 N개로 나눈 중 i번째만 실행 (여러 샤드 실행/병합은 shard.py)"
+    )
+    parser.add_argument(
+        "--coupon-brands",
+        default=None,
+        help="브랜드 -> 샘플 상품 ID JSON 파일: 카테고리 크롤링 없이 이 브랜드들의 쿠폰만 수집 (shard.py가 생성)"
+    )
     args = parser.parse_args()
     
-    asyncio.run(run_crawler(full_refresh=args.full_refresh))
+    if args.command == "stats":
+        show_stats(args.storage)
+        return
+    
+    try:
+        categories = select_categories(args.categories)
+        shard = Shard.parse(args.shard) if args.shard else Shard()
+    except ValueError as e:
+        parser.error(str(e))
+    
+    asyncio.run(run_crawler(
+        full_refresh=args.full_refresh,
+        concurrency=args.concurrency,
+        engine=args.engine,
+        lean=LEAN_PAGE_PROFILE and not args.full_render,
+        storage=args.storage,
+        resume=args.resume,
+        push=not args.no_push,
+        categories=categories,
+        shard=shard,
+        coupon_brands=load_coupon_brands(args.coupon_brands) if args.coupon_brands else None,
+        prices_only=args.prices_only,
+        coupons_only=args.coupons_only
+    ))
 
 
 if __name__ == "__main__":
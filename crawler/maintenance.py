@@ -0,0 +1,96 @@
+"""
+올프 크롤러 - 가격 이력 유지보수
+price_history 월 파티션 생성, 일간 롤업(최저/최고/종가) 집계, 보존 기간이 지난 원본 행 정리를 실행합니다.
+크롤링과 별도로 하루 1회(크롤링 직후 등) 실행하면 됩니다.
+
+사용법:
+    python maintenance.py partitions             # 월 파티션 미리 생성
+    python maintenance.py rollup --days 3        # 최근 3일 일간 롤업 다시 집계
+    python maintenance.py compact --horizon 90   # 90일 이전 원본 이력은 롤업과 상품별 마지막 행만 남기고 삭제
+    python maintenance.py analytics              # 전체 상품 가격 분석 다시 계산 (보통은 크롤링 끝에 자동 실행)
+    python maintenance.py all                    # partitions, rollup, compact를 순서대로
+"""
+import argparse
+from datetime import date, timedelta
+
+from config import (
+    STORAGE_BACKEND,
+    PRICE_HISTORY_RAW_DAYS,
+    PRICE_ROLLUP_LOOKBACK_DAYS,
+    PRICE_PARTITION_MONTHS_AHEAD,
+    PRICE_ANALYTICS_DAYS
+)
+from storage import Storage, create_storage, STORAGE_BACKENDS
+from metrics import metrics
+from analytics import run_price_analytics
+
+
+def run_partitions(db: Storage, months_ahead: int = PRICE_PARTITION_MONTHS_AHEAD) -> int:
+    with metrics.timer("phase_seconds", phase="maintenance_partitions"):
+        created = db.ensure_price_partitions(months_ahead)
+    print(f"🗂️ 월 파티션 {created}개 생성")
+    return created
+
+
+def run_rollup(db: Storage, days: int = PRICE_ROLLUP_LOOKBACK_DAYS) -> int:
+    """최근 days일(오늘 제외)의 일간 롤업 다시 집계"""
+    until = date.today()
+    since = until - timedelta(days=days)
+    with metrics.timer("phase_seconds", phase="maintenance_rollup"):
+        count = db.rollup_price_history(since, until)
+    print(f"📊 일간 롤업 {count}행 집계 ({since} ~ {until - timedelta(days=1)})")
+    return count
+
+
+def run_compact(db: Storage, horizon_days: int = PRICE_HISTORY_RAW_DAYS) -> int:
+    """horizon_days일 이전 원본 이력을 롤업으로 압축"""
+    before = date.today() - timedelta(days=horizon_days)
+    with metrics.timer("phase_seconds", phase="maintenance_compact"):
+        deleted = db.compact_price_history(before)
+    print(f"🧹 {before} 이전 원본 가격 이력 {deleted}행 정리 (롤업과 상품별 마지막 행 유지)")
+    return deleted
+
+
+def run_analytics(db: Storage, days: int = PRICE_ANALYTICS_DAYS) -> int:
+    """모든 상품의 최신 가격 기준으로 가격 분석 다시 계산"""
+    with metrics.timer("phase_seconds", phase="maintenance_analytics"):
+        count = run_price_analytics(db, db.get_latest_prices(), days)
+    print(f"🧮 가격 분석 {count}개 상품 반영 (최근 {days}일)")
+    return count
+
+
+def main():
+    """유지보수 진입점"""
+    parser = argparse.ArgumentParser(description="올프 가격 이력 유지보수")
+    parser.add_argument("--storage", choices=STORAGE_BACKENDS, default=STORAGE_BACKEND)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    partitions = subparsers.add_parser("partitions", help="price_history 월 파티션 미리 생성")
+    partitions.add_argument("--months-ahead", type=int, default=PRICE_PARTITION_MONTHS_AHEAD)
+    
+    rollup = subparsers.add_parser("rollup", help="최근 일간 롤업 다시 집계")
+    rollup.add_argument("--days", type=int, default=PRICE_ROLLUP_LOOKBACK_DAYS)
+    
+    compact = subparsers.add_parser("compact", help="보존 기간이 지난 원본 이력 정리")
+    compact.add_argument("--horizon", type=int, default=PRICE_HISTORY_RAW_DAYS, help="원본 보존 기간 (일)")
+    
+    analytics = subparsers.add_parser("analytics", help="전체 상품 가격 분석 다시 계산")
+    analytics.add_argument("--days", type=int, default=PRICE_ANALYTICS_DAYS)
+    
+    subparsers.add_parser("all", help="partitions + rollup + compact")
+    args = parser.parse_args()
+    
+    db = create_storage(args.storage)
+    
+    if args.command in ("partitions", "all"):
+        run_partitions(db, getattr(args, "months_ahead", PRICE_PARTITION_MONTHS_AHEAD))
+    if args.command in ("rollup", "all"):
+        run_rollup(db, getattr(args, "days", PRICE_ROLLUP_LOOKBACK_DAYS))
+    if args.command in ("compact", "all"):
+        run_compact(db, getattr(args, "horizon", PRICE_HISTORY_RAW_DAYS))
+    if args.command == "analytics":
+        run_analytics(db, args.days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+올프 크롤러 - 실행 지표
+단계별 소요 시간 히스토그램/카운터를 모아 실행 요약 JSON과
+Prometheus textfile(node_exporter textfile collector용)로 내보냅니다.
+"""
+import os
+import json
+import time
+import asyncio
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, List, Tuple, Optional
+
+from config import METRICS_PATH, PROMETHEUS_TEXTFILE
+
+# 히스토그램 버킷 경계 (초)
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """고정 버킷 지연 시간 히스토그램"""
+    
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+    
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "avg": round(self.sum / self.count, 4) if self.count else None,
+            "min": round(self.min, 4) if self.min is not None else None,
+            "max": round(self.max, 4) if self.max is not None else None,
+            "buckets": {str(bound): n for bound, n in zip(LATENCY_BUCKETS, self.buckets)},
+        }
+
+
+class Metrics:
+    """실행 단위 지표 저장소"""
+    
+    def __init__(self):
+        self.histograms: Dict[LabelKey, Histogram] = {}
+        self.counters: Dict[LabelKey, float] = {}
+        self.gauges: Dict[LabelKey, float] = {}
+        self.const_labels: Dict[str, str] = {}  # 모든 Prometheus 지표에 붙는 라벨 (샤드 번호 등)
+        self.started_at = time.time()
+    
+    def observe(self, name: str, seconds: float, **labels):
+        """지연 시간 기록 (초)"""
+        key = _key(name, labels)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        self.histograms[key].observe(seconds)
+    
+    def incr(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        key = _key(name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+    
+    def counter(self, name: str, **labels) -> float:
+        """카운터 현재 값"""
+        return self.counters.get(_key(name, labels), 0)
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        """게이지 설정 (실행 결과 통계 등)"""
+        self.gauges[_key(name, labels)] = value
+    
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """동기 구간 소요 시간 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    @asynccontextmanager
+    async def atimer(self, name: str, **labels):
+        """비동기 구간 소요 시간 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    # ========== 내보내기 ==========
+    
+    def summary(self) -> Dict:
+        """실행 요약 (JSON 직렬화 가능)"""
+        def label_name(key: LabelKey) -> str:
+            name, labels = key
+            if not labels:
+                return name
+            return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+        
+        return {
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "labels": dict(self.const_labels),
+            "histograms": {label_name(k): h.to_dict() for k, h in sorted(self.histograms.items())},
+            "counters": {label_name(k): round(v, 4) for k, v in sorted(self.counters.items())},
+            "gauges": {label_name(k): v for k, v in sorted(self.gauges.items())},
+        }
+    
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines: List[str] = []
+        
+        def fmt_labels(labels, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(self.const_labels.items()) + list(labels) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+        
+        declared = set()
+        
+        def declare(name: str, metric_type: str):
+            if name not in declared:
+                lines.append(f"# TYPE {name} {metric_type}")
+                declared.add(name)
+        
+        for (name, labels), hist in sorted(self.histograms.items()):
+            metric = f"allday_crawler_{name}"
+            declare(metric, "histogram")
+            for bound, count in zip(LATENCY_BUCKETS, hist.buckets):
+                lines.append(f"{metric}_bucket{fmt_labels(labels, ('le', str(bound)))} {count}")
+            lines.append(f"{metric}_bucket{fmt_labels(labels, ('le', '+Inf'))} {hist.count}")
+            lines.append(f"{metric}_sum{fmt_labels(labels)} {hist.sum:.6f}")
+            lines.append(f"{metric}_count{fmt_labels(labels)} {hist.count}")
+        
+        for (name, labels), value in sorted(self.counters.items()):
+            metric = f"allday_crawler_{name}"
+            declare(metric, "counter")
+            lines.append(f"{metric}{fmt_labels(labels)} {value}")
+        
+        for (name, labels), value in sorted(self.gauges.items()):
+            metric = f"allday_crawler_{name}"
+            declare(metric, "gauge")
+            lines.append(f"{metric}{fmt_labels(labels)} {value}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def export(self, run_id: str, suffix: str = "") -> Tuple[str, str]:
+        """실행 요약 JSON + Prometheus textfile 저장
+        
+        Args:
+            suffix: 파일명 접미사 (샤드 실행은 샤드마다 textfile을 따로 씀)
+        
+        Returns:
+            (JSON 경로, textfile 경로)
+        """
+        os.makedirs(METRICS_PATH, exist_ok=True)
+        json_path = os.path.join(METRICS_PATH, f"run_{run_id}{suffix}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        
+        # textfile collector가 쓰는 중인 파일을 읽지 않도록 임시 파일 후 교체
+        root, ext = os.path.splitext(PROMETHEUS_TEXTFILE)
+        prom_path = f"{root}{suffix}{ext}"
+        tmp_path = prom_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, prom_path)
+        
+        return json_path, prom_path
+
+
+def _in_event_loop() -> bool:
+    """현재 스레드에서 이벤트 루프가 실행 중인지 (저장 스레드에서 호출되면 False)"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class InstrumentedStorage:
+    """저장소 래퍼: 모든 호출 지연 시간과 쓰기 행 수를 기록
+    
+    Supabase 클라이언트는 동기식이라 이벤트 루프 스레드에서 호출하면 그 시간만큼 루프가 멈추므로
+    그 합계를 event_loop_blocked_seconds로 따로 집계합니다 (스레드로 넘긴 호출은 제외).
+    """
+    
+    WRITE_METHODS = {
+        "upsert_products_bulk", "add_price_history_bulk", "touch_products_seen", "upsert_coupons_bulk",
+        "update_price_summary", "update_price_analytics", "trigger_price_alerts"
+    }
+    
+    def __init__(self, inner, run_metrics: Optional[Metrics] = None, blocking: bool = True):
+        self.inner = inner
+        self.metrics = run_metrics or metrics
+        self.blocking = blocking
+        self.rows_written = 0
+        self.write_seconds = 0.0
+    
+    def __getattr__(self, name: str):
+        method = getattr(self.inner, name)
+        if not callable(method):
+            return method
+        
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.metrics.observe("db_call_seconds", elapsed, method=name)
+                if self.blocking and _in_event_loop():
+                    self.metrics.incr("event_loop_blocked_seconds", elapsed, source="db")
+                if name in self.WRITE_METHODS and args:
+                    self.rows_written += len(args[0])
+                    self.write_seconds += elapsed
+                    self.metrics.incr("db_rows_written", len(args[0]), method=name)
+        
+        return timed
+
+
+# 실행 전체에서 공유하는 지표
+metrics = Metrics()
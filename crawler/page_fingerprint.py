@@ -0,0 +1,83 @@
+"""
+올프 크롤러 - 랭킹 페이지 지문
+(카테고리, 페이지)마다 추출한 아이템(상품 링크/브랜드/이름/이미지/가격)의 해시를 실행 간에 유지합니다.
+지문이 이전 실행과 같은 페이지는 상품 파싱과 DB 저장을 건너뛰고, 지난번에 저장한 가격과
+브랜드 샘플 상품만 이번 실행 결과(가격 분석, 쿠폰 수집)에 채워 넣습니다.
+
+지문은 DB 저장까지 끝난 페이지만 기록하고, PAGE_FINGERPRINT_TTL이 지나면 같아도 다시 저장합니다
+(변동 없는 상품의 last_seen_at이 그 이상 밀리지 않도록).
+"""
+import os
+import json
+import time
+import hashlib
+from typing import Dict, List, Optional
+
+from config import PAGE_FINGERPRINT_PATH, PAGE_FINGERPRINT_TTL
+
+# 지문에 포함하는 아이템 필드 (EXTRACT_PRODUCT_ITEMS_JS / parse_ranking_html 결과)
+FINGERPRINT_FIELDS = ("href", "brand", "name", "image_url", "cur_price", "org_price")
+
+
+def page_fingerprint(raw_items: List[Dict]) -> str:
+    """랭킹 페이지 아이템 목록 해시 (순서 포함, 순위가 바뀌면 PRODUCTS_PER_PAGE 경계의 상품도 바뀌므로)"""
+    rows = (json.dumps([item.get(field) for field in FINGERPRINT_FIELDS], ensure_ascii=False) for item in raw_items)
+    return hashlib.sha256("\n".join(rows).encode("utf-8")).hexdigest()
+
+
+class PageFingerprints:
+    """카테고리/페이지 -> {"hash", "item_count", "count", "prices", "brands", "saved_at"}"""
+    
+    def __init__(self, path: str = PAGE_FINGERPRINT_PATH, ttl: int = PAGE_FINGERPRINT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.pages: Dict[str, Dict] = {}
+        self.skipped = 0
+        
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.pages = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 페이지 지문 로드 실패 (새로 시작): {e}")
+    
+    @staticmethod
+    def _key(category_name: str, page_num: int) -> str:
+        return f"{category_name}/{page_num}"
+    
+    def get(self, category_name: str, page_num: int) -> Optional[Dict]:
+        return self.pages.get(self._key(category_name, page_num))
+    
+    def unchanged(self, category_name: str, page_num: int, digest: str,
+                  now: Optional[float] = None) -> Optional[Dict]:
+        """지문이 같고 재저장 간격 안인 페이지의 기록 (아니면 None)"""
+        entry = self.get(category_name, page_num)
+        if not entry or entry["hash"] != digest:
+            return None
+        now = now or time.time()
+        return entry if now - entry["saved_at"] < self.ttl else None
+    
+    def record(self, category_name: str, page_num: int, digest: str, item_count: int, products: List[Dict]):
+        """저장까지 끝난 페이지 기록 (가격은 oliveyoung_id 기준, 브랜드는 첫 상품)"""
+        brands: Dict[str, str] = {}
+        for product in products:
+            brands.setdefault(product["brand"], product["oliveyoung_id"])
+        self.pages[self._key(category_name, page_num)] = {
+            "hash": digest,
+            "item_count": item_count,
+            "count": len(products),
+            "prices": {
+                product["oliveyoung_id"]: [product["price"], product["original_price"], product["is_on_sale"]]
+                for product in products
+            },
+            "brands": brands,
+            "saved_at": time.time(),
+        }
+    
+    def save(self):
+        """지문 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.pages, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
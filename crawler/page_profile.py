@@ -0,0 +1,204 @@
+"""
+올프 크롤러 - 페이지 프로필
+이미지/폰트/분석 도메인 차단, 정적 리소스 디스크 캐시, 콘텐츠 기준 대기,
+실행당 전송량 집계를 담당합니다.
+"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import Optional, Dict, Tuple
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Page, Route, Request, Response, TimeoutError as PlaywrightTimeoutError
+from config import (
+    ASSET_CACHE_PATH,
+    ASSET_CACHE_TTL,
+    BLOCKED_DOMAINS,
+    BLOCKED_RESOURCE_TYPES,
+    CACHEABLE_RESOURCE_TYPES,
+    CONTENT_WAIT_TIMEOUT,
+    LEAN_PAGE_PROFILE,
+    PAGE_LOAD_TIMEOUT
+)
+
+
+class PageProfile:
+    """브라우저 컨텍스트에 적용하는 페이지 로딩 프로필"""
+    
+    def __init__(self, lean: bool = LEAN_PAGE_PROFILE, cache_dir: Optional[str] = ASSET_CACHE_PATH):
+        self.lean = lean
+        self.cache_dir = cache_dir if lean else None
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "bytes": 0,
+            "blocked": 0,
+            "cache_hits": 0,
+            "cache_bytes": 0
+        }
+        self._self_counted = set()  # 라우트 핸들러에서 이미 집계한 요청
+        
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+    
+    async def attach(self, context: BrowserContext):
+        """컨텍스트에 라우팅/전송량 집계 적용"""
+        context.on("requestfinished", self._on_request_finished)
+        context.on("requestfailed", self._on_request_failed)
+        if self.lean:
+            await context.route("**/*", self._handle_route)
+    
+    async def detach(self, context: BrowserContext):
+        """리소스 차단 해제 (수동 로그인 등 전체 화면이 필요할 때)"""
+        if self.lean:
+            await context.unroute("**/*", self._handle_route)
+    
+    async def attach_page(self, page: Page):
+        """페이지 하나에만 라우팅/전송량 집계 적용
+        
+        브라우저 서버의 컨텍스트는 여러 실행(샤드)이 함께 쓰므로, 컨텍스트에 걸면 다른 실행의
+        요청까지 가로채고 연결을 끊은 뒤에도 라우트가 남습니다.
+        """
+        page.on("requestfinished", self._on_request_finished)
+        page.on("requestfailed", self._on_request_failed)
+        if self.lean:
+            await page.route("**/*", self._handle_route)
+    
+    async def detach_page(self, page: Page):
+        """attach_page로 건 라우팅/전송량 집계 해제"""
+        page.remove_listener("requestfinished", self._on_request_finished)
+        page.remove_listener("requestfailed", self._on_request_failed)
+        if self.lean:
+            await page.unroute("**/*", self._handle_route)
+    
+    async def goto(self, page: Page, url: str, wait_for: Optional[str] = None) -> Optional[Response]:
+        """페이지 이동 후 대기 (메인 문서 응답 반환)"""
+        response = await self.navigate(page, url)
+        await self.wait_for_content(page, wait_for)
+        return response
+    
+    async def navigate(self, page: Page, url: str) -> Optional[Response]:
+        """페이지 이동 (lean 모드는 DOM 로드까지, 아니면 networkidle까지)"""
+        wait_until = "domcontentloaded" if self.lean else "networkidle"
+        return await page.goto(url, wait_until=wait_until, timeout=PAGE_LOAD_TIMEOUT)
+    
+    async def wait_for_content(self, page: Page, wait_for: Optional[str] = None):
+        """lean 모드에서 wait_for 요소가 나타날 때까지 대기
+        
+        요소가 끝내 없으면 (빈 페이지, 쿠폰 없는 상품) 그대로 진행합니다.
+        """
+        if not self.lean or not wait_for:
+            return
+        try:
+            await page.wait_for_selector(wait_for, timeout=CONTENT_WAIT_TIMEOUT)
+        except PlaywrightTimeoutError:
+            pass
+    
+    def summary(self) -> str:
+        """전송량 요약 문자열"""
+        mb = self.stats["bytes"] / (1024 * 1024)
+        cache_mb = self.stats["cache_bytes"] / (1024 * 1024)
+        return (
+            f"요청 {self.stats['requests']}건, 전송 {mb:.1f}MB, "
+            f"차단 {self.stats['blocked']}건, 캐시 적중 {self.stats['cache_hits']}건 ({cache_mb:.1f}MB 절약)"
+        )
+    
+    # ========== 라우팅 ==========
+    
+    def _is_blocked(self, request: Request) -> bool:
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            return True
+        host = urlparse(request.url).hostname or ""
+        return any(host == domain or host.endswith("." + domain) for domain in BLOCKED_DOMAINS)
+    
+    async def _handle_route(self, route: Route, request: Request):
+        if self._is_blocked(request):
+            self.stats["blocked"] += 1
+            await route.abort()
+            return
+        
+        if self.cache_dir and request.method == "GET" and request.resource_type in CACHEABLE_RESOURCE_TYPES:
+            await self._fulfill_from_cache(route, request)
+            return
+        
+        await route.continue_()
+    
+    def _cache_paths(self, url: str):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".body", base + ".json"
+    
+    @staticmethod
+    def _read_cache(body_path: str, meta_path: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """유효 기간 안의 캐시 (헤더, 본문), 없거나 읽을 수 없으면 None"""
+        try:
+            if time.time() - os.path.getmtime(body_path) >= ASSET_CACHE_TTL:
+                return None
+            with open(meta_path, "r", encoding="utf-8") as f:
+                headers = json.load(f)
+            with open(body_path, "rb") as f:
+                return headers, f.read()
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _write_cache(body_path: str, meta_path: str, headers: Dict[str, str], body: bytes):
+        try:
+            with open(body_path, "wb") as f:
+                f.write(body)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(headers, f)
+        except OSError as e:
+            print(f"  ⚠️ 리소스 캐시 저장 실패: {e}")
+    
+    async def _fulfill_from_cache(self, route: Route, request: Request):
+        """정적 리소스를 디스크 캐시에서 응답, 없으면 받아서 저장
+        
+        파일 입출력은 스레드에서 실행 (풀의 모든 페이지가 같은 이벤트 루프를 쓰므로)
+        """
+        body_path, meta_path = self._cache_paths(request.url)
+        self._self_counted.add(request)
+        
+        try:
+            cached = await asyncio.to_thread(self._read_cache, body_path, meta_path)
+            if cached:
+                headers, body = cached
+                self.stats["cache_hits"] += 1
+                self.stats["cache_bytes"] += len(body)
+                await route.fulfill(status=200, headers=headers, body=body)
+                return
+            
+            response = await route.fetch()
+            body = await response.body()
+            self.stats["requests"] += 1
+            self.stats["bytes"] += len(body)
+            
+            if response.status == 200:
+                headers = {
+                    k: v for k, v in response.headers.items()
+                    if k.lower() not in ("content-encoding", "content-length", "transfer-encoding", "set-cookie")
+                }
+                await asyncio.to_thread(self._write_cache, body_path, meta_path, headers, body)
+            
+            await route.fulfill(response=response, body=body)
+        except Exception:
+            # 끝나지 못한 요청은 requestfinished가 오지 않으므로 여기서 정리
+            self._self_counted.discard(request)
+            raise
+    
+    # ========== 전송량 집계 ==========
+    
+    def _on_request_failed(self, request: Request):
+        # 라우트 핸들러에서 집계했지만 중단/실패로 끝난 요청
+        self._self_counted.discard(request)
+    
+    async def _on_request_finished(self, request: Request):
+        if request in self._self_counted:
+            self._self_counted.discard(request)
+            return
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.stats["requests"] += 1
+        self.stats["bytes"] += sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
@@ -0,0 +1,120 @@
+"""
+올프 크롤러 - 상품 저장 파이프라인
+스크래퍼가 페이지 단위로 넘긴 상품을 크기가 제한된 큐에 받아, 백그라운드 작업이
+배치로 모아 저장합니다. 큐가 가득 차면 스크래핑 쪽이 기다리므로(backpressure)
+페이지 수집과 DB 쓰기가 겹치면서도 메모리 사용량은 카테고리 크기와 무관하게 일정합니다.
+"""
+import time
+import asyncio
+from typing import Dict, List, Optional, Callable
+
+from config import DB_BATCH_SIZE, WRITE_QUEUE_SIZE
+from metrics import metrics
+
+
+class ProductWriter:
+    """페이지 단위 상품 저장 작업 (저장은 한 작업에서 순서대로 처리)"""
+    
+    def __init__(self, product_scraper, max_pending_pages: int = WRITE_QUEUE_SIZE,
+                 batch_size: int = DB_BATCH_SIZE,
+                 on_page_saved: Optional[Callable[[str, int, List[Dict]], None]] = None):
+        """
+        Args:
+            product_scraper: save_products_to_db를 가진 ProductScraper
+            max_pending_pages: 저장 대기열에 쌓아둘 최대 페이지 수
+            batch_size: 한 번에 모아서 저장할 최대 상품 수
+            on_page_saved: 페이지 저장이 끝날 때마다 (카테고리명, 페이지 번호, 상품 목록)으로 호출
+        """
+        self.scraper = product_scraper
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_pages)
+        self.batch_size = batch_size
+        self.on_page_saved = on_page_saved
+        self.task: Optional[asyncio.Task] = None
+        
+        # 카테고리별 저장 통계
+        self.category_stats: Dict[str, Dict[str, int]] = {}
+    
+    def start(self):
+        """저장 작업 시작"""
+        if not self.task:
+            self.task = asyncio.create_task(self._run())
+    
+    async def put(self, category_name: str, page_num: int, products: List[Dict]) -> asyncio.Future:
+        """페이지 상품을 저장 대기열에 추가 (대기열이 가득 차면 자리가 날 때까지 대기)
+        
+        Returns:
+            해당 페이지 저장이 끝나면 완료되는 Future (저장 실패 시 예외)
+        """
+        future = asyncio.get_running_loop().create_future()
+        started = time.perf_counter()
+        await self.queue.put((category_name, page_num, products, future))
+        metrics.observe("write_queue_wait_seconds", time.perf_counter() - started)
+        return future
+    
+    async def close(self):
+        """대기 중인 페이지를 모두 저장하고 작업 종료"""
+        if self.task:
+            await self.queue.put(None)
+            await self.task
+            self.task = None
+    
+    async def _run(self):
+        """대기열에서 batch_size만큼 모아 저장 (None을 받으면 종료)"""
+        closing = False
+        while not closing:
+            item = await self.queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            rows = len(item[2])
+            while rows < self.batch_size and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+                rows += len(item[2])
+            
+            await self._write(batch)
+    
+    async def _write(self, batch: List):
+        """배치 저장 (카테고리별로 나눠 저장해야 카테고리별 통계/실패 처리가 가능)"""
+        by_category: Dict[str, List] = {}
+        for item in batch:
+            by_category.setdefault(item[0], []).append(item)
+        
+        for category_name, items in by_category.items():
+            products = [product for _, _, page_products, _ in items for product in page_products]
+            
+            try:
+                with metrics.timer("phase_seconds", phase="db_write"):
+                    save_stats = await self.scraper.save_products_to_db(products)
+                if save_stats["failed"]:
+                    raise RuntimeError("DB 저장 실패")
+            except Exception as e:
+                # 저장에 실패한 페이지는 해당 카테고리 쪽에서 오류로 처리
+                for *_, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            stats = self.category_stats.setdefault(
+                category_name, {"new_count": 0, "updated_count": 0, "changed_count": 0}
+            )
+            for key in stats:
+                stats[key] += save_stats[key]
+            
+            for _, page_num, page_products, _ in items:
+                if not self.on_page_saved:
+                    continue
+                try:
+                    self.on_page_saved(category_name, page_num, page_products)
+                except Exception as e:
+                    # 행은 이미 저장됐으므로 페이지는 성공으로 처리 (체크포인트/지문 기록만 빠져 다음 실행이 다시 저장)
+                    print(f"  ⚠️ [{category_name}] 페이지 {page_num} 저장 후 기록 실패: {e}")
+                    metrics.incr("page_saved_callback_errors")
+            
+            for *_, future in items:
+                if not future.done():
+                    future.set_result(None)
@@ -0,0 +1,404 @@
+"""
+올프 크롤러 - 웹 푸시 발송
+notifications 테이블의 발송 대기 알림을 구독(기기)별로 묶어 푸시 1건으로 만들고,
+암호화(aes128gcm) + VAPID 서명 후 연결 풀을 공유하는 비동기 HTTP 클라이언트로 동시에 보냅니다.
+알림은 사용자의 모든 구독으로 보내고, 모든 구독의 발송이 끝난 뒤에 결과를 반영합니다.
+
+- 푸시 서비스(호스트)별로 rate_limiter.RateLimiter를 두고 429/5xx를 받으면 그 호스트만 속도를 줄임
+- 429/5xx/네트워크 오류는 Retry-After(없으면 지수 백오프)만큼 기다렸다가 재시도
+- 404/410(만료/해지된 구독)은 구독을 삭제하고, 알림은 모든 구독이 만료/해지됐을 때만 failed로 처리
+- 끝내 실패한 알림은 PUSH_MAX_ATTEMPTS번까지 다음 실행에서 다시 시도
+
+사용법:
+    python push.py send                       # 대기 중인 알림 발송
+    python push.py bench --count 100000       # 로컬 대체 엔드포인트로 발송 처리량 측정
+"""
+import json
+import time
+import base64
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from config import (
+    STORAGE_BACKEND,
+    VAPID_PRIVATE_KEY,
+    VAPID_SUBJECT,
+    PUSH_CONCURRENCY,
+    PUSH_RATE_PER_HOST,
+    PUSH_TIMEOUT,
+    PUSH_MAX_RETRIES,
+    PUSH_MAX_ATTEMPTS,
+    PUSH_CLAIM_SIZE,
+    PUSH_TTL,
+    RETRY_MAX_DELAY
+)
+from rate_limiter import RateLimiter
+from storage import Storage, create_storage, STORAGE_BACKENDS
+from metrics import metrics
+
+# 만료/해지된 구독 (구독 삭제)
+GONE_STATUS_CODES = {404, 410}
+# 다시 보내면 성공할 수 있는 응답
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 암호화 전 페이로드 최대 크기 (푸시 서비스 한도 4KB에서 암호화 오버헤드를 뺀 값)
+MAX_PAYLOAD_BYTES = 3000
+
+# VAPID 서명 유효 기간 (초, 푸시 서비스 허용 최대 24시간보다 짧게)
+VAPID_TOKEN_TTL = 60 * 60 * 12
+
+# 로컬 대체 엔드포인트 주소 (bench)
+STAND_IN_ORIGIN = "http://push.stand-in.local"
+
+
+def build_payload(notifications: List[Dict]) -> bytes:
+    """같은 구독으로 가는 알림을 푸시 1건으로 묶음 (public/sw.js가 title/body/url을 표시)"""
+    if len(notifications) == 1:
+        notification = notifications[0]
+        data = {"title": notification["title"], "body": notification["body"], "url": notification.get("url") or "/"}
+    else:
+        data = {
+            "title": f"🔔 새 알림 {len(notifications)}건",
+            "body": "\n".join(notification["body"] for notification in notifications),
+            "url": "/mypage",
+        }
+    
+    encoded = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    while len(encoded) > MAX_PAYLOAD_BYTES:
+        # 넘친 만큼 본문을 잘라냄 (한글은 3바이트라 여유 있게)
+        data["body"] = data["body"][:max(0, len(data["body"]) - (len(encoded) - MAX_PAYLOAD_BYTES) // 2 - 8)] + "…"
+        encoded = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return encoded
+
+
+def group_by_subscription(rows: List[Dict]) -> List[Dict]:
+    """claim_push_notifications 결과 -> 구독별 {subscription, notifications}"""
+    groups: Dict[str, Dict] = {}
+    for row in rows:
+        group = groups.setdefault(row["subscription_id"], {
+            "subscription": {
+                "id": row["subscription_id"],
+                "endpoint": row["endpoint"],
+                "p256dh": row["p256dh"],
+                "auth": row["auth"],
+            },
+            "notifications": [],
+        })
+        group["notifications"].append(row)
+    return list(groups.values())
+
+
+def settle_notification(results: List[str]) -> str:
+    """알림 1건의 구독별 발송 결과 -> 알림 처리 결과
+    
+    한 기기라도 받았으면 "sent" (다시 보내면 받은 기기에 중복되므로), 모든 구독이 만료/해지됐으면
+    "dropped", 그 밖(받은 기기 없이 일부 실패)은 "retry".
+    """
+    if "sent" in results:
+        return "sent"
+    if all(result == "gone" for result in results):
+        return "dropped"
+    return "retry"
+
+
+def _retry_after(response) -> Optional[float]:
+    """Retry-After 헤더(초)가 있으면 그 값 (날짜 형식은 무시)"""
+    value = response.headers.get("retry-after")
+    try:
+        return min(float(value), RETRY_MAX_DELAY) if value else None
+    except ValueError:
+        return None
+
+
+class PushSender:
+    """연결 풀을 공유하는 웹 푸시 발송기"""
+    
+    def __init__(self, vapid_private_key: str = VAPID_PRIVATE_KEY, subject: str = VAPID_SUBJECT,
+                 concurrency: int = PUSH_CONCURRENCY, rate_per_host: float = PUSH_RATE_PER_HOST,
+                 timeout: float = PUSH_TIMEOUT, max_retries: int = PUSH_MAX_RETRIES, transport=None):
+        """
+        Args:
+            vapid_private_key: VAPID 개인 키 (web-push와 같은 base64url raw 형식)
+            concurrency: 동시 요청 수 (연결 풀 크기)
+            rate_per_host: 푸시 서비스 호스트별 초당 요청 상한
+            transport: httpx transport (bench/테스트에서 로컬 대체 엔드포인트 사용)
+        """
+        import httpx
+        from py_vapid import Vapid
+        
+        if not vapid_private_key:
+            raise ValueError("VAPID_PRIVATE_KEY 환경변수를 설정해주세요.")
+        
+        self.vapid = Vapid.from_raw(vapid_private_key.encode())
+        self.subject = subject
+        self.rate_per_host = rate_per_host
+        self.max_retries = max_retries
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            transport=transport
+        )
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.hosts: Dict[str, RateLimiter] = {}
+        self.vapid_headers: Dict[str, Tuple[float, Dict[str, str]]] = {}  # origin -> (만료 시각, 헤더)
+        self.stats = {"sent": 0, "gone": 0, "failed": 0, "retries": 0}
+    
+    async def close(self):
+        await self.client.aclose()
+    
+    def _host_limiter(self, origin: str) -> RateLimiter:
+        if origin not in self.hosts:
+            self.hosts[origin] = RateLimiter(
+                max_per_second=self.rate_per_host,
+                min_per_second=1.0,
+                initial_per_second=self.rate_per_host
+            )
+        return self.hosts[origin]
+    
+    def _auth_headers(self, origin: str) -> Dict[str, str]:
+        """푸시 서비스(origin)별 VAPID 헤더 (만료 전까지 재사용)"""
+        now = time.time()
+        cached = self.vapid_headers.get(origin)
+        if cached and cached[0] - 60 > now:
+            return cached[1]
+        
+        expires = int(now) + VAPID_TOKEN_TTL
+        headers = self.vapid.sign({"sub": self.subject, "aud": origin, "exp": expires})
+        self.vapid_headers[origin] = (expires, headers)
+        return headers
+    
+    def _encrypt(self, subscription: Dict, payload: bytes) -> bytes:
+        from pywebpush import WebPusher
+        
+        pusher = WebPusher({
+            "endpoint": subscription["endpoint"],
+            "keys": {"p256dh": subscription["p256dh"], "auth": subscription["auth"]},
+        })
+        return pusher.encode(payload, content_encoding="aes128gcm")["body"]
+    
+    async def send(self, subscription: Dict, payload: bytes) -> str:
+        """푸시 1건 발송
+        
+        Returns:
+            "sent", "gone"(구독 만료/해지), "failed"(재시도 소진 또는 재시도 불가 응답)
+        """
+        import httpx
+        
+        parsed = urlparse(subscription["endpoint"])
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        limiter = self._host_limiter(origin)
+        body = self._encrypt(subscription, payload)
+        headers = {
+            **self._auth_headers(origin),
+            "Content-Encoding": "aes128gcm",
+            "Content-Type": "application/octet-stream",
+            "TTL": str(PUSH_TTL),
+        }
+        
+        for attempt in range(self.max_retries + 1):
+            await limiter.wait()
+            started = time.perf_counter()
+            delay = None
+            try:
+                async with self.semaphore:
+                    response = await self.client.post(subscription["endpoint"], content=body, headers=headers)
+            except httpx.HTTPError as e:
+                limiter.record_error(e, time.perf_counter() - started)
+            else:
+                status = response.status_code
+                limiter.record(time.perf_counter() - started, status)
+                metrics.incr("push_responses", status=status)
+                if status < 300:
+                    return "sent"
+                if status in GONE_STATUS_CODES:
+                    return "gone"
+                if status not in RETRY_STATUS_CODES:
+                    return "failed"
+                delay = _retry_after(response)
+            
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay if delay is not None else limiter.retry_delay(attempt))
+        return "failed"
+
+
+async def send_pending_notifications(db: Storage, sender: PushSender,
+                                     claim_size: int = PUSH_CLAIM_SIZE) -> Dict[str, int]:
+    """대기 알림을 claim_size개씩 가져와 구독별로 묶어 발송하고 결과를 일괄 반영
+    
+    가져오기(claim)와 발송은 겹쳐서 진행하고, 이번 실행에서 이미 시도한 알림은 다시 가져오지 않습니다.
+    """
+    started_at = datetime.utcnow().isoformat()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PUSH_CONCURRENCY * 2)
+    outcomes = {"sent": [], "retry": [], "dropped": [], "gone": []}
+    stats = {"notifications": 0, "pushes": 0}
+    # 알림 ID -> 남은 구독 발송 수 / 끝난 구독별 결과 (모두 끝나면 settle_notification으로 반영)
+    remaining: Dict[str, int] = {}
+    deliveries: Dict[str, List[str]] = {}
+    
+    async def flush():
+        sent, retry, dropped, gone = (outcomes[key] for key in ("sent", "retry", "dropped", "gone"))
+        outcomes.update({"sent": [], "retry": [], "dropped": [], "gone": []})
+        if gone:
+            await asyncio.to_thread(db.delete_push_subscriptions, gone)
+        if sent or retry or dropped:
+            await asyncio.to_thread(db.finish_push_notifications, sent, retry, dropped, PUSH_MAX_ATTEMPTS)
+    
+    async def worker():
+        while True:
+            group = await queue.get()
+            if group is None:
+                return
+            ids = [notification["notification_id"] for notification in group["notifications"]]
+            try:
+                result = await sender.send(group["subscription"], build_payload(group["notifications"]))
+            except Exception as e:
+                print(f"  ⚠️ 푸시 발송 오류: {e}")
+                result = "failed"
+            
+            sender.stats[result] += 1
+            if result == "gone":
+                outcomes["gone"].append(group["subscription"]["id"])
+            for notification_id in ids:
+                deliveries.setdefault(notification_id, []).append(result)
+                remaining[notification_id] -= 1
+                if not remaining[notification_id]:
+                    del remaining[notification_id]
+                    outcomes[settle_notification(deliveries.pop(notification_id))].append(notification_id)
+    
+    workers = [asyncio.create_task(worker()) for _ in range(PUSH_CONCURRENCY)]
+    try:
+        while True:
+            rows = await asyncio.to_thread(db.claim_push_notifications, claim_size, started_at)
+            if not rows:
+                break
+            # 같은 알림의 구독 행은 모두 같은 claim 결과에 들어 있음
+            claimed = set()
+            for row in rows:
+                remaining[row["notification_id"]] = remaining.get(row["notification_id"], 0) + 1
+                claimed.add(row["notification_id"])
+            stats["notifications"] += len(claimed)
+            for group in group_by_subscription(rows):
+                stats["pushes"] += 1
+                await queue.put(group)
+            
+            if sum(len(ids) for ids in outcomes.values()) >= claim_size:
+                await flush()
+    finally:
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+        await flush()
+    
+    return {**stats, **sender.stats}
+
+
+async def deliver_notifications(db: Storage, transport=None) -> Dict[str, int]:
+    """크롤링 직후 호출: 발송기를 만들어 대기 알림을 모두 보내고 닫음"""
+    sender = PushSender(transport=transport)
+    try:
+        async with metrics.atimer("phase_seconds", phase="push"):
+            return await send_pending_notifications(db, sender)
+    finally:
+        await sender.close()
+
+
+# ========== 로컬 대체 엔드포인트 (처리량 측정) ==========
+
+def stand_in_transport(gone_every: int = 0, throttle_every: int = 0, latency: float = 0.02):
+    """푸시 서비스 대신 응답하는 httpx transport
+    
+    Args:
+        gone_every: N번째 구독마다 410 응답 (0이면 없음)
+        throttle_every: N번째 요청마다 429 응답 (0이면 없음)
+        latency: 응답 지연 (초, 실제 푸시 서비스 왕복 시간 흉내)
+    """
+    import httpx
+    
+    counter = {"requests": 0}
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        counter["requests"] += 1
+        await asyncio.sleep(latency)
+        index = int(request.url.path.rsplit("/", 1)[-1])
+        if gone_every and index % gone_every == 0:
+            return httpx.Response(410)
+        if throttle_every and counter["requests"] % throttle_every == 0:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(201)
+    
+    return httpx.MockTransport(handler)
+
+
+def fake_subscription(index: int) -> Dict:
+    """bench용 구독 (실제로 암호화할 수 있는 키)"""
+    import os
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+    
+    public_key = ec.generate_private_key(ec.SECP256R1()).public_key()
+    raw = public_key.public_bytes(Encoding.X962, PublicFormat.UncompressedPoint)
+    return {
+        "id": str(index),
+        "endpoint": f"{STAND_IN_ORIGIN}/push/{index}",
+        "p256dh": base64.urlsafe_b64encode(raw).rstrip(b"=").decode(),
+        "auth": base64.urlsafe_b64encode(os.urandom(16)).rstrip(b"=").decode(),
+    }
+
+
+async def run_bench(count: int, subscriptions: int, gone_every: int, throttle_every: int):
+    """로컬 대체 엔드포인트로 count건 발송 (구독 subscriptions개에 나눠서)"""
+    from py_vapid import Vapid
+    
+    vapid = Vapid()
+    vapid.generate_keys()
+    private_raw = vapid.private_key.private_numbers().private_value.to_bytes(32, "big")
+    sender = PushSender(
+        vapid_private_key=base64.urlsafe_b64encode(private_raw).rstrip(b"=").decode(),
+        transport=stand_in_transport(gone_every, throttle_every)
+    )
+    
+    subs = [fake_subscription(i + 1) for i in range(subscriptions)]
+    payload = build_payload([{"title": "🔔 목표 가격 도달", "body": "벤치마크 상품 9,900원 (목표 10,000원)", "url": "/"}])
+    started = time.perf_counter()
+    
+    async def one(i: int):
+        result = await sender.send(subs[i % len(subs)], payload)
+        sender.stats[result] += 1
+    
+    try:
+        await asyncio.gather(*(one(i) for i in range(count)))
+    finally:
+        await sender.close()
+    
+    elapsed = time.perf_counter() - started
+    print(f"✅ {count}건 발송: {elapsed:.1f}초 ({count / elapsed:.0f}건/초) {sender.stats}")
+
+
+def main():
+    """푸시 발송 진입점"""
+    parser = argparse.ArgumentParser(description="올프 웹 푸시 발송")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    send = subparsers.add_parser("send", help="대기 중인 알림 발송")
+    send.add_argument("--storage", choices=STORAGE_BACKENDS, default=STORAGE_BACKEND)
+    
+    bench = subparsers.add_parser("bench", help="로컬 대체 엔드포인트로 발송 처리량 측정")
+    bench.add_argument("--count", type=int, default=10000)
+    bench.add_argument("--subscriptions", type=int, default=1000, help="생성할 구독 수 (암호화 키 생성 비용)")
+    bench.add_argument("--gone-every", type=int, default=0, help="N번째 구독마다 410 응답")
+    bench.add_argument("--throttle-every", type=int, default=0, help="N번째 요청마다 429 응답")
+    args = parser.parse_args()
+    
+    if args.command == "send":
+        stats = asyncio.run(deliver_notifications(create_storage(args.storage)))
+        print(f"✅ 푸시 발송 완료: {stats}")
+    elif args.command == "bench":
+        asyncio.run(run_bench(args.count, args.subscriptions, args.gone_every, args.throttle_every))
+
+
+if __name__ == "__main__":
+    main()
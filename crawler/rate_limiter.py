@@ -0,0 +1,120 @@
+"""
+올프 크롤러 - 요청 속도 제어
+모든 스크래퍼 작업자가 공유하는 토큰 버킷에 AIMD(가산 증가/승산 감소)를 결합해,
+사이트가 정상일 때는 속도를 올리고 지연/타임아웃/오류가 보이면 즉시 줄입니다.
+"""
+import time
+import random
+import asyncio
+from typing import Optional, Dict
+
+from config import (
+    CRAWL_DELAY_MIN,
+    CRAWL_DELAY_MAX,
+    MAX_REQUESTS_PER_SECOND,
+    RATE_INCREASE_STEP,
+    RATE_DECREASE_FACTOR,
+    RATE_LATENCY_TARGET,
+    RATE_JITTER,
+    RETRY_MAX_DELAY
+)
+
+# 속도를 줄여야 하는 HTTP 상태 코드 (5xx는 별도 판단)
+THROTTLE_STATUS_CODES = {403, 429}
+
+
+def is_timeout_error(error: Exception) -> bool:
+    """Playwright/httpx/asyncio 타임아웃 예외 여부"""
+    return isinstance(error, asyncio.TimeoutError) or "Timeout" in type(error).__name__
+
+
+def error_status_code(error: Exception) -> Optional[int]:
+    """HTTP 오류 예외에서 상태 코드 추출 (httpx.HTTPStatusError 등)"""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+class RateLimiter:
+    """호스트 단위 적응형 요청 속도 제어 (모든 작업자가 공유)"""
+    
+    def __init__(self, max_per_second: float = MAX_REQUESTS_PER_SECOND,
+                 min_per_second: float = 1.0 / CRAWL_DELAY_MAX,
+                 initial_per_second: float = 1.0 / CRAWL_DELAY_MIN,
+                 adaptive: bool = True):
+        """
+        Args:
+            max_per_second: 초당 요청 상한 (0 이하면 제한 없음)
+            min_per_second: 초당 요청 하한 (백오프 시에도 이 아래로 내려가지 않음)
+            initial_per_second: 시작 속도
+            adaptive: False면 시작 속도로 고정
+        """
+        self.unlimited = max_per_second <= 0
+        self.max_rate = max_per_second
+        self.min_rate = min(min_per_second, max_per_second) if not self.unlimited else 0.0
+        self.rate = min(max(initial_per_second, self.min_rate), max_per_second) if not self.unlimited else 0.0
+        self.adaptive = adaptive
+        self.tokens = 1.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "increases": 0, "decreases": 0}
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(1.0, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def wait(self):
+        """다음 요청 토큰을 받을 때까지 대기"""
+        self.stats["requests"] += 1
+        if self.unlimited:
+            return
+        
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1.0:
+                delay = (1.0 - self.tokens) / self.rate
+                await asyncio.sleep(delay * random.uniform(1.0, 1.0 + RATE_JITTER))
+                self._refill()
+            self.tokens = max(self.tokens - 1.0, 0.0)
+    
+    def record(self, latency: float, status: Optional[int] = None, timeout: bool = False):
+        """요청 결과를 반영해 속도 조정
+        
+        Args:
+            latency: 요청 소요 시간 (초)
+            status: HTTP 상태 코드 (알 수 없으면 None)
+            timeout: 타임아웃으로 실패했는지 여부
+        """
+        if self.unlimited or not self.adaptive:
+            return
+        
+        throttled = (
+            timeout
+            or status in THROTTLE_STATUS_CODES
+            or (status is not None and status >= 500)
+            or latency > RATE_LATENCY_TARGET
+        )
+        if throttled:
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE_FACTOR)
+            self.stats["decreases"] += 1
+        elif self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE_STEP)
+            self.stats["increases"] += 1
+    
+    def record_error(self, error: Exception, latency: float):
+        """예외로 끝난 요청 반영"""
+        self.record(latency, status=error_status_code(error), timeout=is_timeout_error(error))
+    
+    def retry_delay(self, attempt: int) -> float:
+        """재시도 전 대기 시간 (현재 속도 기준 지수 백오프 + 지터)"""
+        base = 1.0 / self.rate if self.rate > 0 else 1.0
+        return min(RETRY_MAX_DELAY, base * (2 ** attempt)) * random.uniform(1.0, 1.0 + RATE_JITTER)
+    
+    def summary(self) -> str:
+        """속도 제어 요약 문자열"""
+        if self.unlimited:
+            return f"요청 {self.stats['requests']}건 (제한 없음)"
+        return (
+            f"요청 {self.stats['requests']}건, 현재 {self.rate:.2f}req/s "
+            f"(증가 {self.stats['increases']}회, 감소 {self.stats['decreases']}회)"
+        )
@@ -2,105 +2,320 @@
 올프 크롤러 - 상품 및 쿠폰 스크래핑
 """
 import re
+import time
 import asyncio
-import random
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple, Callable, AsyncIterator
 from playwright.async_api import Page
 from config import (
     CATEGORIES, 
     get_ranking_url, 
     get_product_url,
-    CRAWL_DELAY_MIN, 
-    CRAWL_DELAY_MAX, 
     MAX_RETRIES,
-    PRODUCTS_PER_PAGE
+    PRODUCTS_PER_PAGE,
+    DB_BATCH_SIZE,
+    ONE_SHOT_EXTRACTION,
+    PRICE_CHANGE_ONLY,
+    COUPON_POPUP_TIMEOUT,
+    COUPON_CAPTURE_MODE
 )
-from database import Database
+from storage import Storage
+from rate_limiter import RateLimiter
+from page_profile import PageProfile
+from auth import PagePool
+from coupon_cache import CouponCache
+from page_fingerprint import PageFingerprints, page_fingerprint
+from coupon_api import is_coupon_response, parse_coupon_payload, CouponEndpoint
+from metrics import metrics
+
+# 상품 상세 페이지의 쿠폰받기 버튼
+COUPON_BUTTON_SELECTOR = 'button[data-qa-name="button-product-coupon-download"]'
+
+
+# 랭킹 페이지의 모든 .prd_info 아이템을 한 번의 브라우저 왕복으로 추출
+EXTRACT_PRODUCT_ITEMS_JS = """
+() => Array.from(document.querySelectorAll('.prd_info')).map(item => {
+    const text = sel => { const el = item.querySelector(sel); return el ? el.innerText : null; };
+    const attr = (sel, name) => { const el = item.querySelector(sel); return el ? el.getAttribute(name) : null; };
+    return {
+        href: attr('a', 'href'),
+        brand: text('.tx_brand'),
+        name: text('.tx_name'),
+        image_url: attr('img', 'src'),
+        cur_price: text('.tx_cur .tx_num'),
+        org_price: text('.tx_org .tx_num')
+    };
+})
+"""
+
+
+async def goto_with_rate_limit(rate_limiter: RateLimiter, profile: PageProfile, page: Page,
+                               url: str, wait_for: Optional[str] = None):
+    """속도 제어 토큰을 받아 페이지 이동 후, 이동 결과(지연/상태/타임아웃)를 속도 제어에 반영"""
+    await rate_limiter.wait()
+    started = time.monotonic()
+    try:
+        response = await profile.navigate(page, url)
+    except Exception as e:
+        rate_limiter.record_error(e, time.monotonic() - started)
+        metrics.incr("page_goto_errors")
+        raise
+    elapsed = time.monotonic() - started
+    rate_limiter.record(elapsed, status=response.status if response else None)
+    metrics.observe("phase_seconds", elapsed, phase="page_goto")
+    
+    async with metrics.atimer("phase_seconds", phase="content_wait"):
+        await profile.wait_for_content(page, wait_for)
 
 
 class ProductScraper:
     """올리브영 상품 스크래퍼"""
     
-    def __init__(self, page: Page, db: Database, full_refresh: bool = False):
+    def __init__(self, page: Page, db: Storage, full_refresh: bool = False,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 one_shot_extraction: bool = ONE_SHOT_EXTRACTION,
+                 http_fetcher=None,
+                 profile: Optional[PageProfile] = None,
+                 price_change_only: bool = PRICE_CHANGE_ONLY,
+                 fingerprints: Optional[PageFingerprints] = None):
+        """
+        Args:
+            fingerprints: 랭킹 페이지 지문 (이전 실행과 같은 페이지는 파싱/저장 생략, 전체 갱신 모드에서는 무시)
+        """
         self.page = page
         self.db = db
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.profile = profile or PageProfile()
+        self.one_shot_extraction = one_shot_extraction  # True면 page.evaluate 한 번으로 파싱
+        self.http_fetcher = http_fetcher  # HttpRankingFetcher (HTTP 엔진 사용 시)
         self.collected_brands: Set[str] = set()
+        self.pages_loaded = 0  # 로드한 랭킹 페이지 수 (벤치마크/통계용)
         self.full_refresh = full_refresh  # True면 모든 상품 정보 갱신
         
+        # 페이지 지문 (저장이 끝나면 기록하도록 (카테고리, 페이지) -> (지문, 아이템 수)를 보관)
+        self.fingerprints = None if full_refresh else fingerprints
+        self.pending_fingerprints: Dict[Tuple[str, int], Tuple[str, int]] = {}
+        # 지문이 같아 건너뛴 페이지마다 (카테고리명, 페이지 번호, 지문 기록)으로 호출 (체크포인트/쿠폰 브랜드용)
+        self.on_page_skipped: Optional[Callable[[str, int, Dict], None]] = None
+        
         # 기존 상품 캐싱 (oliveyoung_id -> product_id 맵핑)
         print("📦 기존 상품 목록 로딩 중...")
         self.existing_products: Dict[str, str] = db.get_all_oliveyoung_ids()
         print(f"  ✅ 기존 상품 {len(self.existing_products)}개 로드 완료")
+        
+        # 최신 가격 캐싱 (product_id -> (price, original_price, is_on_sale))
+        self.price_change_only = price_change_only
+        self.last_prices: Dict[str, Tuple[int, int, bool]] = {}
+        if price_change_only:
+            self.last_prices = db.get_latest_prices()
+            print(f"  ✅ 최신 가격 {len(self.last_prices)}개 로드 완료")
+        
+        # 이번 실행에서 기록한 가격 (product_id -> 가격 이력 레코드, 실행 끝에 가격 요약 갱신용)
+        self.summary_updates: Dict[str, Dict] = {}
+        
+        # 이번 실행에서 확인한 모든 상품의 가격 (product_id -> (price, original_price, is_on_sale), 가격 분석용)
+        self.run_prices: Dict[str, Tuple[int, int, bool]] = {}
     
-    async def random_delay(self):
-        """랜덤 딜레이 (봇 감지 방지)"""
-        delay = random.uniform(CRAWL_DELAY_MIN, CRAWL_DELAY_MAX)
-        await asyncio.sleep(delay)
-    
-    async def scrape_ranking_page(self, category_name: str, category_code: str) -> List[Dict]:
-        """카테고리 랭킹 페이지에서 상품 목록 수집"""
-        products = []
-        page_num = 1
+    async def scrape_ranking_page(self, category_name: str, category_code: str,
+                                  page: Optional[Page] = None,
+                                  start_page: int = 1,
+                                  collected_count: int = 0) -> AsyncIterator[Tuple[int, List[Dict]]]:
+        """카테고리 랭킹 페이지에서 상품 목록 수집 (페이지마다 (페이지 번호, 상품 목록)을 yield)
+        
+        카테고리 전체를 메모리에 모으지 않으므로, 받는 쪽에서 페이지 단위로 바로 저장하면 됩니다.
+        
+        Args:
+            page: 사용할 브라우저 페이지 (페이지 풀에서 빌린 페이지, 기본: self.page)
+            start_page: 시작 페이지 번호 (이어하기 시 완료된 다음 페이지)
+            collected_count: 이전 실행에서 이미 수집한 상품 수 (PRODUCTS_PER_PAGE에 포함)
+        """
+        page = page or self.page
+        total_count = collected_count
+        item_count = 0
+        page_num = start_page
         rows_per_page = 24  # 한 페이지당 상품 수
         
-        print(f"\n📂 [{category_name}] 카테고리 크롤링 시작...")
+        print(f"\n📂 [{category_name}] 카테고리 크롤링 시작... (페이지 {start_page}부터)")
         
-        while len(products) < PRODUCTS_PER_PAGE:
+        while total_count < PRODUCTS_PER_PAGE:
             url = get_ranking_url(category_code, page_num, rows_per_page)
+            page_products = []
+            item_count = 0
+            last_error = None
             
             for retry in range(MAX_RETRIES):
                 try:
-                    await self.page.goto(url, wait_until="networkidle", timeout=30000)
-                    await self.random_delay()
-                    
-                    # 상품 목록 파싱
-                    product_items = await self.page.query_selector_all(".prd_info")
+                    # 페이지 로드 + 상품 목록 파싱
+                    item_count, page_products = await self._load_page_products(
+                        page, url, category_name, page_key=(category_name, page_num)
+                    )
                     
-                    if not product_items:
+                    if not item_count:
                         print(f"  ⚠️ 상품을 찾을 수 없습니다. (페이지 {page_num})")
                         break
                     
-                    for item in product_items:
-                        if len(products) >= PRODUCTS_PER_PAGE:
-                            break
-                        
-                        try:
-                            product = await self._parse_product_item(item, category_name)
-                            if product:
-                                products.append(product)
-                                self.collected_brands.add(product["brand"])
-                        except Exception as e:
-                            print(f"  ⚠️ 상품 파싱 중 오류: {e}")
-                            continue
+                    if page_products is None:
+                        # 이전 실행과 같은 페이지: 파싱/저장 없이 지난번 기록으로 대신함
+                        entry = self._restore_skipped_page(category_name, page_num)
+                        page_products = []
+                        total_count += min(entry["count"], PRODUCTS_PER_PAGE - total_count)
+                        print(f"  ⏩ 페이지 {page_num}: 변동 없음, 저장 생략 (총 {total_count}개)")
+                        break
                     
-                    print(f"  📦 페이지 {page_num}: {len(product_items)}개 상품 수집 (총 {len(products)}개)")
+                    page_products = page_products[:PRODUCTS_PER_PAGE - total_count]
+                    total_count += len(page_products)
+                    for product in page_products:
+                        self.collected_brands.add(product["brand"])
+                    
+                    print(f"  📦 페이지 {page_num}: {item_count}개 상품 수집 (총 {total_count}개)")
                     break  # 성공 시 재시도 루프 탈출
                     
                 except Exception as e:
+                    last_error = e
                     print(f"  ❌ 페이지 {page_num} 로드 실패 (시도 {retry + 1}/{MAX_RETRIES}): {e}")
                     if retry < MAX_RETRIES - 1:
-                        await asyncio.sleep(5)
+                        await asyncio.sleep(self.rate_limiter.retry_delay(retry))
                     continue
+            else:
+                # 재시도를 모두 실패한 페이지를 건너뛰면 --resume이 다시 오지 않으므로 카테고리를 여기서 중단
+                # (체크포인트에는 이 페이지 전까지만 남아 다음 실행이 이 페이지부터 이어감)
+                raise RuntimeError(f"페이지 {page_num} 로드 실패 ({MAX_RETRIES}회 시도): {last_error}")
+            
+            if page_products:
+                yield page_num, page_products
             
             # 다음 페이지로
             page_num += 1
             
             # 마지막 페이지 체크
-            if len(product_items) < rows_per_page:
+            if item_count < rows_per_page:
                 break
         
-        print(f"  ✅ [{category_name}] 총 {len(products)}개 상품 수집 완료")
+        print(f"  ✅ [{category_name}] 총 {total_count - collected_count}개 상품 수집 완료")
+    
+    async def _load_page_products(self, page: Page, url: str, category_name: str,
+                                  page_key: Optional[Tuple[str, int]] = None) -> Tuple[int, Optional[List[Dict]]]:
+        """랭킹 페이지 로드 후 상품 목록 추출 (HTTP 엔진 우선, 실패 시 브라우저)
+        
+        Args:
+            page_key: (카테고리명, 페이지 번호), 지문이 이전 실행과 같으면 상품 목록 대신 None 반환
+        """
+        self.pages_loaded += 1
+        if self.http_fetcher:
+            await self.rate_limiter.wait()
+            started = time.monotonic()
+            try:
+                raw_items = await self.http_fetcher.fetch_ranking_items(url)
+                self.rate_limiter.record(time.monotonic() - started)
+                metrics.observe("phase_seconds", time.monotonic() - started, phase="http_fetch")
+                if raw_items is not None:
+                    return len(raw_items), self._build_page_products(raw_items, category_name, page_key)
+                print("  ↪️ HTML에 상품 목록이 없어 브라우저로 다시 시도합니다.")
+            except Exception as e:
+                self.rate_limiter.record_error(e, time.monotonic() - started)
+                metrics.incr("http_fetch_errors")
+                print(f"  ↪️ HTTP 요청 실패, 브라우저로 다시 시도합니다: {e}")
+        
+        await goto_with_rate_limit(self.rate_limiter, self.profile, page, url, wait_for=".prd_info")
+        async with metrics.atimer("phase_seconds", phase="dom_parse"):
+            return await self._extract_page_products(page, category_name, page_key)
+    
+    def _build_page_products(self, raw_items: List[Dict], category_name: str,
+                             page_key: Optional[Tuple[str, int]]) -> Optional[List[Dict]]:
+        """지문이 이전 실행과 같으면 None, 아니면 파싱한 상품 목록 (지문은 저장 후 기록하도록 보관)"""
+        if self.fingerprints and page_key and raw_items:
+            digest = page_fingerprint(raw_items)
+            if self.fingerprints.unchanged(*page_key, digest):
+                return None
+            self.pending_fingerprints[page_key] = (digest, len(raw_items))
+        return self._build_products(raw_items, category_name)
+    
+    def _restore_skipped_page(self, category_name: str, page_num: int) -> Dict:
+        """건너뛴 페이지의 지난 가격을 이번 실행 가격(가격 분석용)에 채우고 지문 기록 반환"""
+        entry = self.fingerprints.get(category_name, page_num)
+        for oliveyoung_id, (price, original_price, is_on_sale) in entry["prices"].items():
+            product_id = self.existing_products.get(oliveyoung_id)
+            if product_id:
+                self.run_prices[product_id] = (price, original_price, is_on_sale)
+        self.collected_brands.update(entry["brands"])
+        self.fingerprints.skipped += 1
+        metrics.incr("ranking_pages_skipped")
+        if self.on_page_skipped:
+            self.on_page_skipped(category_name, page_num, entry)
+        return entry
+    
+    def mark_page_saved(self, category_name: str, page_num: int, products: List[Dict]):
+        """저장이 끝난 페이지의 지문 기록 (ProductWriter on_page_saved에서 호출)"""
+        pending = self.pending_fingerprints.pop((category_name, page_num), None)
+        if self.fingerprints and pending:
+            digest, item_count = pending
+            self.fingerprints.record(category_name, page_num, digest, item_count, products)
+    
+    def _build_products(self, raw_items: List[Dict], category_name: str) -> List[Dict]:
+        """원시 아이템 목록을 상품 목록으로 변환 (파싱 실패 항목 제외)"""
+        products = []
+        for raw in raw_items:
+            product = self._build_product(raw, category_name)
+            if product:
+                products.append(product)
         return products
     
+    async def _extract_page_products(self, page: Page, category_name: str,
+                                     page_key: Optional[Tuple[str, int]] = None) -> Tuple[int, Optional[List[Dict]]]:
+        """현재 페이지의 상품 목록 추출
+        
+        지문은 원시 값을 한 번에 가져오는 방식에서만 계산합니다 (ElementHandle 방식은 항상 파싱).
+        
+        Returns:
+            (.prd_info 아이템 수, 파싱된 상품 목록 또는 지문이 같으면 None)
+        """
+        if self.one_shot_extraction:
+            # page.evaluate 한 번으로 모든 아이템의 원시 값을 가져온 뒤 파이썬에서 파싱
+            raw_items = await page.evaluate(EXTRACT_PRODUCT_ITEMS_JS)
+            return len(raw_items), self._build_page_products(raw_items, category_name, page_key)
+        
+        product_items = await page.query_selector_all(".prd_info")
+        products = []
+        for item in product_items:
+            try:
+                product = await self._parse_product_item(item, category_name)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                print(f"  ⚠️ 상품 파싱 중 오류: {e}")
+        return len(product_items), products
+    
     async def _parse_product_item(self, item, category_name: str) -> Optional[Dict]:
-        """상품 아이템 HTML에서 정보 추출"""
+        """상품 아이템 HTML에서 정보 추출 (ElementHandle 방식)"""
         try:
-            # 상품 링크에서 ID 추출
             link_element = await item.query_selector("a")
-            if not link_element:
-                return None
+            brand_element = await item.query_selector(".tx_brand")
+            name_element = await item.query_selector(".tx_name")
+            img_element = await item.query_selector("img")
+            price_element = await item.query_selector(".tx_cur .tx_num")
+            org_price_element = await item.query_selector(".tx_org .tx_num")
             
-            href = await link_element.get_attribute("href")
+            raw = {
+                "href": await link_element.get_attribute("href") if link_element else None,
+                "brand": await brand_element.inner_text() if brand_element else None,
+                "name": await name_element.inner_text() if name_element else None,
+                "image_url": await img_element.get_attribute("src") if img_element else None,
+                "cur_price": await price_element.inner_text() if price_element else None,
+                "org_price": await org_price_element.inner_text() if org_price_element else None,
+            }
+            return self._build_product(raw, category_name)
+            
+        except Exception as e:
+            print(f"    ⚠️ 상품 파싱 오류: {e}")
+            return None
+    
+    def _build_product(self, raw: Dict, category_name: str) -> Optional[Dict]:
+        """추출한 원시 값(dict)에서 상품 정보 생성
+        
+        Args:
+            raw: href, brand, name, image_url, cur_price, org_price 키를 가진 dict
+        """
+        try:
+            href = raw.get("href")
             if not href:
                 return None
             
@@ -110,29 +325,18 @@ class ProductScraper:
                 return None
             oliveyoung_id = match.group(1)
             
-            # 브랜드명
-            brand_element = await item.query_selector(".tx_brand")
-            brand = await brand_element.inner_text() if brand_element else "Unknown"
-            brand = brand.strip()
-            
-            # 상품명
-            name_element = await item.query_selector(".tx_name")
-            name = await name_element.inner_text() if name_element else ""
-            name = name.strip()
-            
-            # 이미지 URL
-            img_element = await item.query_selector("img")
-            image_url = await img_element.get_attribute("src") if img_element else None
+            brand = (raw.get("brand") or "Unknown").strip()
+            name = (raw.get("name") or "").strip()
             
             # 가격 정보
-            price_info = await self._parse_price_info(item)
+            price_info = self._parse_price_info(raw.get("cur_price"), raw.get("org_price"))
             
             return {
                 "oliveyoung_id": oliveyoung_id,
                 "name": name,
                 "brand": brand,
                 "category": category_name,
-                "image_url": image_url,
+                "image_url": raw.get("image_url"),
                 "product_url": get_product_url(oliveyoung_id),
                 **price_info
             }
@@ -141,8 +345,13 @@ class ProductScraper:
             print(f"    ⚠️ 상품 파싱 오류: {e}")
             return None
     
-    async def _parse_price_info(self, item) -> Dict:
-        """가격 정보 파싱"""
+    def _parse_price_info(self, price_text: Optional[str], org_price_text: Optional[str]) -> Dict:
+        """가격 정보 파싱
+        
+        Args:
+            price_text: 현재 판매가 텍스트 (.tx_cur .tx_num)
+            org_price_text: 정가 텍스트 (.tx_org .tx_num), 할인 없으면 None
+        """
         result = {
             "price": 0,
             "original_price": 0,
@@ -152,15 +361,11 @@ class ProductScraper:
         
         try:
             # 현재 판매가
-            price_element = await item.query_selector(".tx_cur .tx_num")
-            if price_element:
-                price_text = await price_element.inner_text()
+            if price_text is not None:
                 result["price"] = self._parse_price_text(price_text)
             
             # 정가 (할인 전 가격)
-            org_price_element = await item.query_selector(".tx_org .tx_num")
-            if org_price_element:
-                org_price_text = await org_price_element.inner_text()
+            if org_price_text is not None:
                 result["original_price"] = self._parse_price_text(org_price_text)
                 result["is_on_sale"] = True
             else:
@@ -187,145 +392,362 @@ class ProductScraper:
         return int(numbers) if numbers else 0
     
     async def save_products_to_db(self, products: List[Dict]) -> Dict[str, int]:
-        """수집한 상품들을 DB에 저장
+        """수집한 상품들을 DB에 저장 (동기 DB 클라이언트는 스레드에서 실행해 스크래핑을 막지 않음)
+        
+        동시에 여러 번 호출하지 말고 pipeline.ProductWriter처럼 한 곳에서 순서대로 호출해야 합니다.
+        """
+        return await asyncio.to_thread(self._save_products, products)
+    
+    async def update_price_summary(self) -> int:
+        """이번 실행에서 기록한 가격으로 상품별 가격 요약 일괄 갱신 (실행 끝에 1회)"""
+        records = list(self.summary_updates.values())
+        if not records:
+            return 0
+        
+        count = await asyncio.to_thread(self.db.update_price_summary, records)
+        self.summary_updates.clear()
+        return count
+    
+    def _save_products(self, products: List[Dict]) -> Dict[str, int]:
+        """상품/가격 이력 각각 일괄 요청으로 저장
         
         Returns:
-            Dict with 'new_count' and 'updated_count' stats
+            Dict with 'new_count', 'updated_count', 'changed_count' (price_history에 기록한 수)
+            and 'failed' (일괄 저장 실패 여부) stats
         """
-        stats = {"new_count": 0, "updated_count": 0}
+        stats = {"new_count": 0, "updated_count": 0, "changed_count": 0, "failed": False}
+        
+        if not products:
+            return stats
+        
+        # ✨ 신규 상품은 전체 정보 저장, 🔄 기존 상품은 전체 갱신 모드일 때만 정보 업데이트
+        new_products = [p for p in products if p["oliveyoung_id"] not in self.existing_products]
+        to_upsert = products if self.full_refresh else new_products
         
+        try:
+            if to_upsert:
+                id_map = self.db.upsert_products_bulk(to_upsert)
+                # 캐시에 추가 (같은 세션 내 중복 방지)
+                self.existing_products.update(id_map)
+        except Exception as e:
+            print(f"  ❌ 상품 일괄 저장 실패: {e}")
+            stats["failed"] = True
+        
+        new_ids = {p["oliveyoung_id"] for p in new_products}
+        price_records = []
+        unchanged_ids = []
         for product in products:
-            try:
-                oliveyoung_id = product["oliveyoung_id"]
-                
-                if oliveyoung_id in self.existing_products:
-                    # 🔄 기존 상품: 가격만 업데이트 (상품 정보는 건드리지 않음)
-                    product_id = self.existing_products[oliveyoung_id]
-                    
-                    if self.full_refresh:
-                        # 전체 갱신 모드: 상품 정보도 업데이트
-                        self.db.upsert_product(product)
-                    
-                    # 가격 이력만 저장
-                    self.db.add_price_history(
-                        product_id=product_id,
-                        price=product["price"],
-                        original_price=product["original_price"],
-                        discount_rate=product["discount_rate"],
-                        is_on_sale=product["is_on_sale"]
-                    )
-                    stats["updated_count"] += 1
-                else:
-                    # ✨ 신규 상품: 전체 정보 저장
-                    saved_product = self.db.upsert_product(product)
-                    
-                    if saved_product:
-                        # 가격 이력 저장
-                        self.db.add_price_history(
-                            product_id=saved_product["id"],
-                            price=product["price"],
-                            original_price=product["original_price"],
-                            discount_rate=product["discount_rate"],
-                            is_on_sale=product["is_on_sale"]
-                        )
-                        
-                        # 캐시에 추가 (같은 세션 내 중복 방지)
-                        self.existing_products[oliveyoung_id] = saved_product["id"]
-                        stats["new_count"] += 1
-                    
-            except Exception as e:
-                print(f"  ❌ DB 저장 실패: {product.get('name', 'Unknown')[:30]} - {e}")
+            product_id = self.existing_products.get(product["oliveyoung_id"])
+            if not product_id:
+                continue
+            
+            if product["oliveyoung_id"] in new_ids:
+                stats["new_count"] += 1
+            else:
+                stats["updated_count"] += 1
+            
+            # 가격 변동이 없으면 이력은 건너뛰고 last_seen_at만 갱신
+            price_key = (product["price"], product["original_price"], product["is_on_sale"])
+            self.run_prices[product_id] = price_key
+            if self.price_change_only and self.last_prices.get(product_id) == price_key:
+                unchanged_ids.append(product_id)
+                continue
+            
+            price_records.append({
+                "product_id": product_id,
+                "price": product["price"],
+                "original_price": product["original_price"],
+                "discount_rate": product["discount_rate"],
+                "is_on_sale": product["is_on_sale"]
+            })
+        
+        try:
+            self.db.add_price_history_bulk(price_records)
+            for record in price_records:
+                self.last_prices[record["product_id"]] = (
+                    record["price"], record["original_price"], record["is_on_sale"]
+                )
+                self.summary_updates[record["product_id"]] = record
+            stats["changed_count"] = len(price_records)
+        except Exception as e:
+            print(f"  ❌ 가격 이력 일괄 저장 실패: {e}")
+            return {"new_count": 0, "updated_count": 0, "changed_count": 0, "failed": True}
+        
+        try:
+            if unchanged_ids:
+                self.db.touch_products_seen(unchanged_ids)
+        except Exception as e:
+            print(f"  ⚠️ last_seen_at 갱신 실패: {e}")
         
         return stats
 
 
 class CouponScraper:
-    """올리브영 쿠폰 스크래퍼 - 상세페이지에서 쿠폰받기 버튼 클릭 후 파싱"""
+    """올리브영 쿠폰 스크래퍼 - 상세페이지에서 쿠폰받기 버튼 클릭 후 파싱
+    
+    브랜드를 submit()으로 넣으면 페이지 풀 크기만큼의 작업이 동시에 수집합니다.
+    상품 크롤링 중 브랜드의 첫 샘플 상품이 나오는 즉시 넣을 수 있습니다.
+    """
     
-    def __init__(self, page: Page, db: Database):
+    def __init__(self, page: Page, db: Storage, rate_limiter: Optional[RateLimiter] = None,
+                 profile: Optional[PageProfile] = None, page_pool: Optional[PagePool] = None,
+                 cache: Optional[CouponCache] = None, capture_mode: str = COUPON_CAPTURE_MODE):
+        """
+        Args:
+            page_pool: 쿠폰 수집에 쓸 페이지 풀 (기본: page 1개)
+            cache: 브랜드 쿠폰 캐시 (None이면 모든 브랜드 방문)
+            capture_mode: "dom", "network", "api" (config.COUPON_CAPTURE_MODE 참고)
+        """
         self.page = page
         self.db = db
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.profile = profile or PageProfile()
+        self.page_pool = page_pool or PagePool([page])
+        self.cache = cache
+        self.capture_mode = capture_mode
+        self.endpoint: Optional[CouponEndpoint] = None  # 팝업에서 캡처한 쿠폰 요청 (api 모드)
+        self.on_brands_saved: Optional[Callable[[List[str]], None]] = None
+        self.on_coupons: Optional[Callable[[str, List[Dict]], None]] = None
+        
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.submitted: Set[str] = set()
+        self.pending_coupons: List[Dict] = []
+        self.pending_brands: List[Tuple[str, List[Dict]]] = []
+        self.stats = {"coupons": 0, "visited": 0, "cached": 0, "unchanged": 0, "failed": 0}
+        self.changed_brands: Set[str] = set()  # 이전에 확인한 적 있고 이번에 쿠폰이 바뀐 브랜드 (찜 알림용)
     
-    async def random_delay(self):
-        """랜덤 딜레이"""
-        delay = random.uniform(CRAWL_DELAY_MIN, CRAWL_DELAY_MAX)
-        await asyncio.sleep(delay)
+    async def scrape_brand_coupons(self, brands: Set[str], sample_products: Dict[str, str],
+                                   on_brands_saved: Optional[Callable[[List[str]], None]] = None) -> int:
+        """브랜드별 쿠폰 수집 (브랜드별 대표 상품 1개씩 방문)
+        
+        Args:
+            on_brands_saved: 쿠폰 저장까지 끝난 브랜드 목록으로 호출 (체크포인트 기록용)
+        """
+        self.start(on_brands_saved)
+        for brand in brands:
+            if brand in sample_products:
+                self.submit(brand, sample_products[brand])
+        return await self.finish()
     
-    async def scrape_brand_coupons(self, brands: Set[str], sample_products: Dict[str, str]) -> int:
-        """브랜드별 쿠폰 수집 (브랜드별 대표 상품 1개씩 방문)"""
-        total_coupons = 0
+    def start(self, on_brands_saved: Optional[Callable[[List[str]], None]] = None,
+              skip_brands: Optional[Set[str]] = None,
+              on_coupons: Optional[Callable[[str, List[Dict]], None]] = None):
+        """수집 작업 시작
         
-        print(f"\n🎫 {len(brands)}개 브랜드 쿠폰 수집 시작...")
+        Args:
+            skip_brands: 이미 끝난 브랜드 (submit해도 무시)
+            on_coupons: 상세 페이지를 방문한 브랜드마다 (브랜드, 쿠폰 목록)으로 호출 (스냅샷 기록용)
+        """
+        self.on_brands_saved = on_brands_saved
+        self.on_coupons = on_coupons
+        self.submitted.update(skip_brands or ())
+        self.queue = asyncio.Queue()
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.page_pool.size)]
+        print(f"\n🎫 쿠폰 수집 시작... (동시 {self.page_pool.size}개)")
+    
+    def submit(self, brand: str, product_id: str):
+        """브랜드 쿠폰 수집 요청 (브랜드당 한 번만 방문)"""
+        if brand in self.submitted:
+            return
+        self.submitted.add(brand)
+        self.queue.put_nowait((brand, product_id))
+    
+    async def finish(self) -> int:
+        """요청한 브랜드를 모두 수집/저장하고 종료 (수집 쿠폰 수 반환, 캐시로 건너뛴 브랜드 포함)"""
+        for _ in self.workers:
+            self.queue.put_nowait(None)
+        await asyncio.gather(*self.workers)
+        self.workers = []
         
-        for brand in brands:
-            if brand not in sample_products:
+        await self._flush_coupons()
+        
+        # 만료된 쿠폰 비활성화
+        await asyncio.to_thread(self.db.deactivate_expired_coupons)
+        
+        print(f"  ✅ 총 {self.stats['coupons']}개 쿠폰 수집 완료 "
+              f"(방문 {self.stats['visited']}, 캐시 {self.stats['cached']}, 변동 없음 {self.stats['unchanged']})")
+        return self.stats["coupons"]
+    
+    async def _worker(self):
+        """대기열의 브랜드를 하나씩 수집 (None을 받으면 종료)"""
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            brand, product_id = item
+            
+            if self.cache and self.cache.is_fresh(brand):
+                # 최근에 확인한 브랜드는 방문하지 않음 (쿠폰은 DB에 그대로 남아 있음)
+                self.stats["cached"] += 1
+                self.stats["coupons"] += self.cache.cached_count(brand)
+                self.pending_brands.append((brand, None))
                 continue
             
-            product_id = sample_products[brand]
             try:
-                coupons = await self._scrape_product_coupons(product_id, brand)
-                total_coupons += len(coupons)
-                
-                # 쿠폰 DB 저장
-                for coupon in coupons:
-                    self.db.upsert_coupon(coupon)
-                
-                await self.random_delay()
-                
+                async with self.page_pool.acquire() as page:
+                    coupons = await self._scrape_product_coupons(product_id, brand, page)
             except Exception as e:
+                self.stats["failed"] += 1
                 print(f"  ❌ [{brand}] 쿠폰 수집 실패: {e}")
+                continue
+            
+            self.stats["visited"] += 1
+            self.stats["coupons"] += len(coupons)
+            if self.on_coupons:
+                self.on_coupons(brand, coupons)
+            if self.cache and not self.cache.is_changed(brand, coupons):
+                self.stats["unchanged"] += 1
+            else:
+                self.pending_coupons.extend(coupons)
+                if coupons and self.cache and brand in self.cache.brands:
+                    self.changed_brands.add(brand)
+            self.pending_brands.append((brand, coupons))
+            
+            # 쿠폰 DB 저장 (배치 크기만큼 모이면 일괄 저장)
+            if len(self.pending_coupons) >= DB_BATCH_SIZE:
+                await self._flush_coupons()
+    
+    async def _flush_coupons(self):
+        """모아둔 쿠폰을 일괄 저장하고 버퍼 비우기"""
+        pending_coupons, self.pending_coupons = self.pending_coupons, []
+        pending_brands, self.pending_brands = self.pending_brands, []
         
-        # 만료된 쿠폰 비활성화
-        self.db.deactivate_expired_coupons()
-        
-        print(f"  ✅ 총 {total_coupons}개 쿠폰 수집 완료")
-        return total_coupons
+        try:
+            if pending_coupons:
+                saved = await asyncio.to_thread(self.db.upsert_coupons_bulk, pending_coupons)
+                print(f"  💾 쿠폰 {saved}개 일괄 저장")
+            
+            # 저장까지 끝난 브랜드만 캐시/체크포인트에 기록
+            if self.cache:
+                for brand, coupons in pending_brands:
+                    if coupons is not None:
+                        self.cache.record(brand, coupons)
+                self.cache.save()
+            if self.on_brands_saved and pending_brands:
+                self.on_brands_saved([brand for brand, _ in pending_brands])
+        except Exception as e:
+            print(f"  ❌ 쿠폰 일괄 저장 실패: {e}")
     
-    async def _scrape_product_coupons(self, product_id: str, brand: str) -> List[Dict]:
-        """상품 상세 페이지에서 쿠폰 정보 추출 (버튼 클릭 방식)"""
-        coupons = []
+    async def _scrape_product_coupons(self, product_id: str, brand: str,
+                                      page: Optional[Page] = None) -> List[Dict]:
+        """상품 상세 페이지에서 쿠폰 정보 추출
+        
+        capture_mode에 따라 쿠폰 API 직접 호출 → 팝업 응답(JSON) 캡처 → 팝업 요소 파싱 순으로 시도합니다.
+        """
+        page = page or self.page
+        
+        if self.capture_mode == "api" and self.endpoint:
+            try:
+                coupons = await self._fetch_coupons_api(page, product_id, brand)
+                metrics.incr("coupon_source", source="api")
+                return self._log_coupons(brand, coupons)
+            except Exception as e:
+                print(f"  ⚠️ [{brand}] 쿠폰 API 호출 실패, 상세 페이지로 대체: {e}")
+        
         url = get_product_url(product_id)
         
         try:
-            await self.page.goto(url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(1)  # 페이지 안정화 대기
+            await goto_with_rate_limit(self.rate_limiter, self.profile, page, url,
+                                       wait_for=COUPON_BUTTON_SELECTOR)
+            if not self.profile.lean:
+                await asyncio.sleep(1)  # 페이지 안정화 대기
             
             # 쿠폰받기 버튼 찾기
-            coupon_button = await self.page.query_selector(
-                'button[data-qa-name="button-product-coupon-download"]'
-            )
+            coupon_button = await page.query_selector(COUPON_BUTTON_SELECTOR)
             
             if not coupon_button:
                 # 쿠폰 버튼이 없으면 쿠폰 없음
-                return coupons
-            
-            # 쿠폰받기 버튼 클릭
-            await coupon_button.click()
-            await asyncio.sleep(1)  # 팝업 로딩 대기
-            
-            # 쿠폰 목록 파싱 (팝업 내부)
-            coupon_items = await self.page.query_selector_all('.left')
-            
-            for item in coupon_items:
-                try:
-                    coupon = await self._parse_coupon_item(item, brand)
-                    if coupon:
-                        coupons.append(coupon)
-                except Exception as e:
-                    continue
+                return []
             
-            if coupons:
-                print(f"  🎫 [{brand}] {len(coupons)}개 쿠폰 발견")
+            # 쿠폰받기 버튼 클릭 → 팝업 로딩 → 쿠폰 목록 파싱
+            async with metrics.atimer("phase_seconds", phase="coupon_popup"):
+                coupons = None
+                if self.capture_mode in ("network", "api"):
+                    coupons = await self._capture_coupon_response(page, coupon_button, product_id, brand)
+                    if coupons:
+                        metrics.incr("coupon_source", source="network")
+                    else:
+                        coupons = None  # 응답을 못 잡았거나 비어 있으면 팝업 요소로 확인
+                else:
+                    await coupon_button.click()
+                
+                if coupons is None:
+                    coupons = await self._parse_coupon_popup(page, brand)
+                    metrics.incr("coupon_source", source="dom")
             
             # 팝업 닫기 (ESC 키 또는 닫기 버튼)
             try:
-                await self.page.keyboard.press("Escape")
+                await page.keyboard.press("Escape")
             except:
                 pass
             
         except Exception as e:
-            print(f"  ⚠️ [{brand}] 상품 페이지 로드 실패: {e}")
+            # 실패한 브랜드는 저장 완료로 기록되지 않도록 호출자에게 전달
+            raise RuntimeError(f"상품 페이지 로드 실패: {e}") from e
+        
+        return self._log_coupons(brand, coupons)
+    
+    def _log_coupons(self, brand: str, coupons: List[Dict]) -> List[Dict]:
+        if coupons:
+            print(f"  🎫 [{brand}] {len(coupons)}개 쿠폰 발견")
+        return coupons
+    
+    async def _capture_coupon_response(self, page: Page, coupon_button, product_id: str,
+                                       brand: str) -> Optional[List[Dict]]:
+        """쿠폰받기 버튼을 누르고 팝업이 불러오는 쿠폰 응답(JSON)을 파싱 (못 잡으면 None)"""
+        try:
+            async with page.expect_response(
+                lambda response: is_coupon_response(response.url, response.request.resource_type),
+                timeout=COUPON_POPUP_TIMEOUT
+            ) as response_info:
+                await coupon_button.click()
+            response = await response_info.value
+            payload = await response.json()
+        except Exception:
+            return None
+        
+        # 상품 번호가 들어 있는 요청이면 다음 브랜드부터 직접 호출할 수 있도록 기억
+        if not self.endpoint:
+            self.endpoint = CouponEndpoint.from_request(response.request, product_id)
+        return parse_coupon_payload(payload, brand)
+    
+    async def _fetch_coupons_api(self, page: Page, product_id: str, brand: str) -> List[Dict]:
+        """기억해 둔 쿠폰 요청을 상품 번호만 바꿔 세션 쿠키로 직접 호출 (페이지 이동/클릭 없음)"""
+        await self.rate_limiter.wait()
+        started = time.monotonic()
+        try:
+            response = await page.request.fetch(**self.endpoint.build(product_id))
+        except Exception as e:
+            self.rate_limiter.record_error(e, time.monotonic() - started)
+            raise
+        elapsed = time.monotonic() - started
+        self.rate_limiter.record(elapsed, status=response.status)
+        metrics.observe("phase_seconds", elapsed, phase="coupon_api")
+        
+        if not response.ok:
+            raise RuntimeError(f"HTTP {response.status}")
+        return parse_coupon_payload(await response.json(), brand)
+    
+    async def _parse_coupon_popup(self, page: Page, brand: str) -> List[Dict]:
+        """열린 쿠폰 팝업의 요소를 파싱"""
+        coupons = []
+        try:
+            # 고정 대기 대신 팝업 쿠폰 목록이 뜰 때까지만 대기
+            await page.wait_for_selector('.left', timeout=COUPON_POPUP_TIMEOUT)
+        except Exception:
+            pass  # 쿠폰 목록이 없는 팝업
+        
+        # 쿠폰 목록 파싱 (팝업 내부)
+        coupon_items = await page.query_selector_all('.left')
         
+        for item in coupon_items:
+            try:
+                coupon = await self._parse_coupon_item(item, brand)
+                if coupon:
+                    coupons.append(coupon)
+            except Exception as e:
+                continue
         return coupons
     
     async def _parse_coupon_item(self, item, brand: str) -> Optional[Dict]:
@@ -0,0 +1,158 @@
+"""
+올프 크롤러 - 오프라인 세션 확인
+브라우저로 마이페이지를 렌더링하기 전에 browser_state/state.json만으로 세션을 확인합니다.
+
+    1. 쿠키 검사 (네트워크 없음): 로그인 쿠키(OY_AT/OY_RT)가 있고 만료되지 않았는지.
+       OY_AT는 JWT라 exp를 직접 읽고, 만료됐어도 OY_RT가 있으면 서버가 다시 발급하므로 유효로 봅니다.
+    2. HTTP 확인: 같은 쿠키로 마이페이지 HTML만 요청 (리다이렉트는 따라가지 않음).
+       로그인 페이지로 보내면 만료, 마이페이지 요소가 있으면 유효, 그 밖(봇 차단 등)은 판단 보류.
+    3. 판정은 SESSION_CHECK_TTL 동안 캐시합니다. state.json이 다시 저장되면 캐시는 무효입니다.
+
+판정이 유효가 아니면(만료/보류) AuthManager가 기존처럼 브라우저로 확인하고, 그래도 안 되면 수동 로그인합니다.
+"""
+import os
+import re
+import json
+import time
+import base64
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    BROWSER_STATE_PATH,
+    OLIVEYOUNG_MYPAGE_URL,
+    HTTP_USER_AGENT,
+    SESSION_CHECK_TTL,
+    SESSION_PROBE_TIMEOUT
+)
+
+SESSION_CHECK_FILE = os.path.join(BROWSER_STATE_PATH, "session_check.json")
+ACCESS_TOKEN_COOKIE = "OY_AT"
+REFRESH_TOKEN_COOKIE = "OY_RT"
+SESSION_DOMAIN = "oliveyoung.co.kr"
+
+# 마이페이지 HTML에서 로그인 상태를 나타내는 요소 (auth.MYPAGE_SELECTOR와 같은 대상)
+MYPAGE_MARKER = re.compile(r'class="[^"]*\b(?:mypage-wrap|my-page)\b|id="myPage"')
+
+
+def _jwt_exp(token: str) -> Optional[float]:
+    """JWT payload의 exp (JWT가 아니면 None)"""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        return float(payload["exp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def session_cookies(state: Dict, now: Optional[float] = None) -> List[Dict]:
+    """올리브영 도메인의 만료되지 않은 쿠키 (expires가 -1이면 세션 쿠키라 남아 있는 동안 유효)"""
+    now = now or time.time()
+    return [
+        cookie for cookie in state.get("cookies", [])
+        if cookie.get("domain", "").lstrip(".").endswith(SESSION_DOMAIN)
+        and (cookie.get("expires", -1) < 0 or cookie["expires"] > now)
+    ]
+
+
+def inspect_cookies(cookies: List[Dict], now: Optional[float] = None) -> Tuple[bool, str]:
+    """로그인 쿠키만으로 판단 -> (세션이 남아 있을 수 있는지, 사유)"""
+    now = now or time.time()
+    by_name = {cookie["name"]: cookie["value"] for cookie in cookies}
+    
+    if REFRESH_TOKEN_COOKIE in by_name:
+        return True, "리프레시 토큰 있음"
+    if ACCESS_TOKEN_COOKIE not in by_name:
+        return False, "로그인 쿠키 없음"
+    exp = _jwt_exp(by_name[ACCESS_TOKEN_COOKIE])
+    if exp is not None and exp <= now:
+        return False, "액세스 토큰 만료"
+    return True, "액세스 토큰 유효"
+
+
+async def probe_session(cookies: List[Dict]) -> Optional[bool]:
+    """저장된 쿠키로 마이페이지 HTML 요청 (True: 유효, False: 만료, None: 판단 불가)"""
+    try:
+        import httpx
+    except ImportError:
+        return None
+    
+    jar = httpx.Cookies()
+    for cookie in cookies:
+        jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+    
+    try:
+        async with httpx.AsyncClient(
+            cookies=jar,
+            headers={"User-Agent": HTTP_USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"},
+            timeout=SESSION_PROBE_TIMEOUT,
+            follow_redirects=False
+        ) as client:
+            response = await client.get(OLIVEYOUNG_MYPAGE_URL)
+    except httpx.HTTPError as e:
+        print(f"⚠️ 세션 HTTP 확인 실패: {e}")
+        return None
+    
+    if response.is_redirect:
+        location = response.headers.get("location", "").lower()
+        return False if "login" in location else None
+    if response.status_code != 200:
+        return None
+    return True if MYPAGE_MARKER.search(response.text) else None
+
+
+class SessionCheck:
+    """state.json 기준 세션 판정과 TTL 캐시"""
+    
+    def __init__(self, state_file: str, cache_file: str = SESSION_CHECK_FILE, ttl: int = SESSION_CHECK_TTL):
+        self.state_file = state_file
+        self.cache_file = cache_file
+        self.ttl = ttl
+    
+    def _state_mtime(self) -> float:
+        return os.path.getmtime(self.state_file) if os.path.exists(self.state_file) else 0
+    
+    def cached(self) -> Optional[bool]:
+        """TTL 안이고 그 뒤로 state.json이 바뀌지 않은 판정 (없으면 None)"""
+        if not os.path.exists(self.cache_file):
+            return None
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["checked_at"] >= self.ttl or entry["state_mtime"] != self._state_mtime():
+            return None
+        return entry["valid"]
+    
+    def record(self, valid: bool, reason: str):
+        """판정 저장 (브라우저로 확인한 결과도 여기에 기록)"""
+        entry = {"valid": valid, "reason": reason, "checked_at": time.time(), "state_mtime": self._state_mtime()}
+        tmp_path = self.cache_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cache_file)
+    
+    async def check(self) -> Optional[bool]:
+        """세션 판정 (True: 유효, False: 만료, None: 판단 불가 -> 브라우저로 확인)"""
+        verdict = self.cached()
+        if verdict is not None:
+            print(f"💾 캐시된 세션 판정 사용: {'유효' if verdict else '만료'}")
+            return verdict
+        if not os.path.exists(self.state_file):
+            return False
+        
+        with open(self.state_file, "r", encoding="utf-8") as f:
+            cookies = session_cookies(json.load(f))
+        
+        maybe_valid, reason = inspect_cookies(cookies)
+        if not maybe_valid:
+            print(f"🍪 세션 쿠키 확인: {reason}")
+            self.record(False, reason)
+            return False
+        
+        verdict = await probe_session(cookies)
+        if verdict is not None:
+            self.record(verdict, f"{reason}, HTTP 확인 {'통과' if verdict else '실패'}")
+        return verdict
@@ -0,0 +1,257 @@
+"""
+올프 크롤러 - 카테고리/쿠폰 브랜드 샤딩
+크롤링을 여러 프로세스(또는 여러 서버)로 나눠 각자 브라우저 하나씩으로 실행합니다.
+
+    카테고리     CATEGORIES 순서대로 돌아가며 배정 (i번째 카테고리 -> i % N)
+    쿠폰 브랜드   브랜드명 CRC32 % N (어느 샤드에서 발견하든 담당 샤드가 같음)
+
+브랜드는 여러 카테고리에 걸쳐 있어 담당 샤드가 그 브랜드를 한 번도 보지 못할 수 있습니다.
+각 샤드는 실행 결과(통계, 발견한 브랜드, 쿠폰을 맡은 브랜드)를 SHARD_PATH에 남기고,
+코디네이터가 이를 합친 뒤 아무도 쿠폰을 확인하지 않은 브랜드만 담당 샤드로 한 번 더 보냅니다.
+
+사용법:
+    python shard.py run 4 [-- --full-refresh ...]   # 한 서버에서 4개 프로세스로 실행 후 병합
+    python main.py --shard 2/4                     # 여러 서버: 서버마다 자기 몫만 실행
+    python shard.py merge 4                        # 결과 파일을 한 곳에 모은 뒤 병합 + 남은 브랜드 목록
+    python main.py --shard 2/4 --coupon-brands data/shards/<날짜>/orphan_brands.json
+"""
+import os
+import sys
+import json
+import zlib
+import argparse
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import CATEGORIES, SHARD_PATH
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+class Shard:
+    """전체 작업 중 이 프로세스가 맡는 몫 (index는 1부터 count까지)"""
+    
+    def __init__(self, index: int = 1, count: int = 1):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"잘못된 샤드 번호: {index}/{count}")
+        self.index = index
+        self.count = count
+    
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        """'2/4' -> Shard(2, 4)"""
+        try:
+            index, count = (int(part) for part in value.split("/"))
+        except ValueError:
+            raise ValueError(f"샤드는 i/N 형식이어야 합니다: {value}")
+        return cls(index, count)
+    
+    @property
+    def enabled(self) -> bool:
+        return self.count > 1
+    
+    @property
+    def label(self) -> str:
+        return f"{self.index}/{self.count}"
+    
+    @property
+    def suffix(self) -> str:
+        """샤드별 파일명 접미사 (체크포인트, 로그, 지표, 쿠폰 캐시가 서로 덮어쓰지 않도록)"""
+        return f"_shard{self.index}of{self.count}" if self.enabled else ""
+    
+    def split_categories(self, categories: Dict[str, str]) -> Dict[str, str]:
+        """이 샤드가 맡는 카테고리 (순서 유지)"""
+        return {
+            name: code for i, (name, code) in enumerate(categories.items())
+            if i % self.count == self.index - 1
+        }
+    
+    def owns_brand(self, brand: str) -> bool:
+        """이 샤드가 쿠폰을 수집할 브랜드인지 (프로세스/서버가 달라도 항상 같은 결과)"""
+        return zlib.crc32(brand.encode("utf-8")) % self.count == self.index - 1
+    
+    def result_path(self, run_date: str, phase: str = "crawl") -> str:
+        return os.path.join(SHARD_PATH, run_date, f"{phase}{self.suffix}.json")
+    
+    def save_result(self, run_date: str, result: Dict, phase: str = "crawl") -> str:
+        """실행 결과 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = self.result_path(run_date, phase)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"shard": self.label, "phase": phase, **result}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def select_categories(names: Optional[str]) -> Dict[str, str]:
+    """쉼표로 구분한 카테고리명 -> CATEGORIES 부분집합 (None이면 전체)"""
+    if not names:
+        return dict(CATEGORIES)
+    selected = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in CATEGORIES]
+    if unknown:
+        raise ValueError(f"알 수 없는 카테고리: {', '.join(unknown)} (선택 가능: {', '.join(CATEGORIES)})")
+    return {name: code for name, code in CATEGORIES.items() if name in selected}
+
+
+def load_coupon_brands(path: str) -> Dict[str, str]:
+    """브랜드 -> 샘플 상품 ID 파일 (코디네이터가 남긴 orphan_brands.json)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ========== 코디네이터 ==========
+
+def load_results(run_date: str, count: int, phase: str = "crawl") -> List[Dict]:
+    """샤드 결과 파일 로드 (없는 샤드는 건너뛰고 경고)"""
+    results = []
+    for index in range(1, count + 1):
+        path = Shard(index, count).result_path(run_date, phase)
+        if not os.path.exists(path):
+            print(f"⚠️ 샤드 {index}/{count} 결과 없음 ({phase}): {path}")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            results.append(json.load(f))
+    return results
+
+
+def merge_results(results: List[Dict]) -> Dict:
+    """샤드 결과 병합 (통계 합계, 브랜드 합집합, 쿠폰을 아무도 확인하지 않은 브랜드)"""
+    stats: Dict[str, float] = {}
+    errors: List[str] = []
+    sample_products: Dict[str, str] = {}
+    coupon_brands = set()
+    changed_brands = set()
+    
+    for result in results:
+        for name, value in result["stats"].items():
+            stats[name] = stats.get(name, 0) + value
+        errors.extend(f"[{result['shard']}] {error}" for error in result["errors"])
+        for brand, product_id in result["sample_products"].items():
+            sample_products.setdefault(brand, product_id)
+        coupon_brands.update(result["coupon_brands"])
+        changed_brands.update(result["changed_brands"])
+    
+    orphan_brands = {
+        brand: product_id for brand, product_id in sample_products.items()
+        if brand not in coupon_brands
+    }
+    return {
+        "shards": sorted({result["shard"] for result in results}),
+        "duration_seconds": max((result["duration_seconds"] for result in results), default=0),
+        "stats": stats,
+        "errors": errors,
+        "brands": len(sample_products),
+        "coupon_brands": len(coupon_brands),
+        "changed_brands": sorted(changed_brands),
+        "orphan_brands": orphan_brands,
+    }
+
+
+def _spawn(shards: List[Shard], args: List[str]) -> Dict[str, int]:
+    """샤드마다 main.py 프로세스 실행 후 모두 끝날 때까지 대기 (샤드 -> 종료 코드)"""
+    processes = {
+        shard.label: subprocess.Popen([sys.executable, MAIN_SCRIPT, "--shard", shard.label, *args])
+        for shard in shards
+    }
+    return {label: process.wait() for label, process in processes.items()}
+
+
+def run_shards(count: int, args: List[str], run_date: Optional[str] = None) -> Dict:
+    """한 서버에서 count개 샤드를 동시에 실행하고 결과 병합
+    
+    남은 브랜드가 있으면 담당 샤드만 쿠폰 전용으로 한 번 더 실행합니다.
+    """
+    run_date = run_date or datetime.now().strftime("%Y-%m-%d")
+    shards = [Shard(index, count) for index in range(1, count + 1)]
+    
+    print(f"🧩 샤드 {count}개 실행: {', '.join(shard.label for shard in shards)}")
+    for label, code in _spawn(shards, args).items():
+        if code != 0:
+            print(f"⚠️ 샤드 {label} 비정상 종료 (코드 {code})")
+    results = load_results(run_date, count)
+    merged = merge_results(results)
+    
+    orphan_brands = merged["orphan_brands"]
+    if orphan_brands:
+        path = save_orphan_brands(run_date, orphan_brands)
+        
+        owners = [shard for shard in shards if any(shard.owns_brand(brand) for brand in orphan_brands)]
+        print(f"\n🎫 담당 샤드가 발견하지 못한 브랜드 {len(orphan_brands)}개 쿠폰 수집 (샤드 {len(owners)}개)")
+        _spawn(owners, [*args, "--coupon-brands", path])
+        merged = merge_results(results + load_results(run_date, count, phase="coupons"))
+    
+    save_merged(run_date, merged)
+    return merged
+
+
+def _write_json(path: str, data) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def save_merged(run_date: str, merged: Dict) -> str:
+    return _write_json(os.path.join(SHARD_PATH, run_date, "merged.json"), merged)
+
+
+def save_orphan_brands(run_date: str, orphan_brands: Dict[str, str]) -> str:
+    """담당 샤드가 쿠폰을 확인하지 못한 브랜드 목록 (main.py --coupon-brands 입력)"""
+    return _write_json(os.path.join(SHARD_PATH, run_date, "orphan_brands.json"), orphan_brands)
+
+
+def print_report(merged: Dict, count: int):
+    stats = merged["stats"]
+    print("\n" + "=" * 60)
+    print("📊 샤드 병합 리포트")
+    print("=" * 60)
+    print(f"  🧩 완료 샤드: {len(merged['shards'])}/{count}")
+    print(f"  ⏱️ 소요 시간: {merged['duration_seconds']:.0f}초 (가장 느린 샤드)")
+    print(f"  📂 완료 카테고리: {stats.get('categories_done', 0)}")
+    print(f"  📦 신규 상품: {stats.get('new_products', 0)}개")
+    print(f"  🔄 가격 업데이트: {stats.get('updated_products', 0)}개 (가격 변동 기록: {stats.get('price_changes', 0)}건)")
+    print(f"  🎫 수집 쿠폰: {stats.get('total_coupons', 0)}개 (브랜드 {merged['coupon_brands']}/{merged['brands']}개, 변경 {len(merged['changed_brands'])}개)")
+    print(f"  🔔 발동한 가격 알림: {stats.get('alerts_triggered', 0)}건 (웹 푸시 발송 {stats.get('pushes_sent', 0)}건)")
+    if merged["orphan_brands"]:
+        print(f"  ⚠️ 쿠폰 미확인 브랜드: {len(merged['orphan_brands'])}개")
+    if merged["errors"]:
+        print(f"\n⚠️ 오류 {len(merged['errors'])}건:")
+        for error in merged["errors"]:
+            print(f"  - {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="올프 크롤러 샤드 코디네이터")
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    run_parser = sub.add_parser("run", help="한 서버에서 샤드 N개를 동시에 실행하고 결과 병합 (-- 뒤는 main.py 인자)")
+    run_parser.add_argument("count", type=int, help="샤드 수")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER, help="각 샤드에 넘길 main.py 인자")
+    
+    merge_parser = sub.add_parser("merge", help="여러 서버에서 모은 샤드 결과 병합")
+    merge_parser.add_argument("count", type=int, help="샤드 수")
+    merge_parser.add_argument("--date", default=None, help="실행 날짜 (YYYY-MM-DD, 기본: 오늘)")
+    
+    args = parser.parse_args()
+    
+    if args.command == "run":
+        extra = args.args[1:] if args.args[:1] == ["--"] else args.args
+        print_report(run_shards(args.count, extra), args.count)
+    elif args.command == "merge":
+        run_date = args.date or datetime.now().strftime("%Y-%m-%d")
+        results = load_results(run_date, args.count) + load_results(run_date, args.count, phase="coupons")
+        merged = merge_results(results)
+        path = save_merged(run_date, merged)
+        print_report(merged, args.count)
+        if merged["orphan_brands"]:
+            orphan_path = save_orphan_brands(run_date, merged["orphan_brands"])
+            print(f"\n🎫 남은 브랜드 목록: {orphan_path}")
+            print(f"   각 서버에서 python main.py --shard i/{args.count} --coupon-brands {orphan_path}")
+        print(f"\n💾 병합 결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
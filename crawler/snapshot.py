@@ -0,0 +1,204 @@
+"""
+올프 크롤러 - 로컬 컬럼형 스냅샷
+매 실행에서 수집한 상품(가격 포함)과 쿠폰을 날짜/카테고리별 Parquet 파일로 쌓고,
+운영 DB의 기존 가격 이력을 키셋 페이지네이션으로 받아 같은 형식으로 백필합니다.
+파일은 hive 파티션 형식이라 DuckDB/pandas에서 바로 읽을 수 있습니다.
+
+    data/snapshots/products/date=2024-05-01/category=스킨케어/part-<run_id>.parquet
+    data/snapshots/coupons/date=2024-05-01/part-<run_id>.parquet
+    data/snapshots/price_history/date=2024-05-01/part-backfill-<run_id>.parquet
+    data/snapshots/product_catalog/part-backfill-<run_id>.parquet
+
+사용법:
+    python snapshot.py export --since 2024-01-01      # 운영 DB 가격 이력 백필
+    python snapshot.py query "SELECT category, AVG(price) FROM products GROUP BY 1"
+"""
+import os
+import argparse
+from datetime import datetime, date
+from typing import Dict, List, Optional, Tuple
+
+from config import SNAPSHOT_PATH, STORAGE_BACKEND, EXPORT_CHUNK_SIZE
+from storage import Storage, create_storage, STORAGE_BACKENDS
+
+# 스냅샷 테이블별 파티션 컬럼 (date는 모든 테이블 공통)
+PARTITION_COLUMNS = {
+    "products": ("category",),
+    "coupons": (),
+    "price_history": (),
+}
+
+# 실행 중 버퍼에 이 행 수가 쌓이면 파일로 씀
+FLUSH_ROWS = 5000
+
+
+def _pyarrow():
+    """pyarrow는 스냅샷을 쓸 때만 필요 (없으면 None)"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def write_parquet(rows: List[Dict], path: str):
+    """dict 목록을 Parquet 파일 1개로 저장 (임시 파일에 쓴 뒤 교체)"""
+    pa = _pyarrow()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    pa.parquet.write_table(pa.Table.from_pylist(rows), tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+class SnapshotWriter:
+    """실행 1회분 스냅샷 버퍼 (파티션별로 모아서 Parquet 파일로 기록)"""
+    
+    def __init__(self, root: str = SNAPSHOT_PATH, run_id: Optional[str] = None,
+                 snapshot_date: Optional[date] = None):
+        self.root = root
+        self.started_at = datetime.now()
+        self.run_id = run_id or self.started_at.strftime("%Y%m%d_%H%M%S")
+        self.snapshot_date = (snapshot_date or self.started_at.date()).isoformat()
+        self.enabled = _pyarrow() is not None
+        self.buffers: Dict[Tuple[str, Tuple[str, ...]], List[Dict]] = {}
+        self.part_counts: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        self.files: List[str] = []
+        self.rows_written = 0
+        
+        if not self.enabled:
+            print("⚠️ pyarrow가 설치되지 않아 로컬 스냅샷을 건너뜁니다. (pip install pyarrow)")
+    
+    def _partition_dir(self, table: str, values: Tuple[str, ...]) -> str:
+        parts = [f"date={self.snapshot_date}"]
+        parts += [f"{column}={value}" for column, value in zip(PARTITION_COLUMNS[table], values)]
+        return os.path.join(self.root, table, *parts)
+    
+    def add(self, table: str, rows: List[Dict]):
+        """스냅샷 행 추가 (파티션 버퍼가 FLUSH_ROWS를 넘으면 파일로 씀)"""
+        if not self.enabled or not rows:
+            return
+        
+        scraped_at = datetime.now().isoformat(timespec="seconds")
+        for row in rows:
+            values = tuple(str(row.get(column) or "_").replace("/", "_") for column in PARTITION_COLUMNS[table])
+            key = (table, values)
+            self.buffers.setdefault(key, []).append({**row, "run_id": self.run_id, "scraped_at": scraped_at})
+            if len(self.buffers[key]) >= FLUSH_ROWS:
+                self._flush(key)
+    
+    def add_products(self, products: List[Dict]):
+        """수집한 상품 (가격 필드 포함)"""
+        self.add("products", products)
+    
+    def add_coupons(self, brand: str, coupons: List[Dict]):
+        """브랜드 쿠폰 목록"""
+        self.add("coupons", coupons)
+    
+    def _flush(self, key: Tuple[str, Tuple[str, ...]]):
+        rows = self.buffers.pop(key, [])
+        if not rows:
+            return
+        table, values = key
+        part = self.part_counts.get(key, 0)
+        self.part_counts[key] = part + 1
+        path = os.path.join(self._partition_dir(table, values), f"part-{self.run_id}-{part}.parquet")
+        write_parquet(rows, path)
+        self.files.append(path)
+        self.rows_written += len(rows)
+    
+    def close(self) -> int:
+        """남은 버퍼를 모두 파일로 쓰고 기록한 행 수 반환"""
+        for key in list(self.buffers):
+            self._flush(key)
+        return self.rows_written
+
+
+# ========== 백필 ==========
+
+def export_price_history(db: Storage, since: Optional[date] = None, chunk_size: int = EXPORT_CHUNK_SIZE,
+                         root: str = SNAPSHOT_PATH) -> Dict[str, int]:
+    """운영 DB의 상품 목록과 가격 이력을 키셋 페이지네이션으로 받아 스냅샷으로 저장
+    
+    가격 이력은 기록 날짜별 파티션으로 나눠 씁니다 (date=recorded_at 날짜).
+    """
+    if _pyarrow() is None:
+        raise RuntimeError("pyarrow가 필요합니다. (pip install pyarrow)")
+    
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stats = {"products": 0, "price_history": 0, "files": 0}
+    
+    catalog: List[Dict] = []
+    for rows in db.iter_products(chunk_size):
+        catalog.extend(rows)
+        print(f"  📦 상품 {len(catalog)}개 수신")
+    if catalog:
+        write_parquet(catalog, os.path.join(root, "product_catalog", f"part-backfill-{run_id}.parquet"))
+        stats["products"] = len(catalog)
+        stats["files"] += 1
+    
+    # 날짜가 바뀔 때마다 그날 파일을 씀 (recorded_at 순으로 받으므로 메모리는 하루치만 사용)
+    current_day: Optional[str] = None
+    day_rows: List[Dict] = []
+    
+    def flush_day():
+        if day_rows:
+            path = os.path.join(root, "price_history", f"date={current_day}", f"part-backfill-{run_id}.parquet")
+            write_parquet(day_rows, path)
+            stats["files"] += 1
+    
+    for rows in db.iter_price_history(since, chunk_size):
+        for row in rows:
+            day = str(row["recorded_at"])[:10]
+            if day != current_day:
+                flush_day()
+                current_day, day_rows = day, []
+            day_rows.append(row)
+        stats["price_history"] += len(rows)
+        print(f"  📈 가격 이력 {stats['price_history']}행 수신 (~{current_day})")
+    flush_day()
+    
+    return stats
+
+
+def query_snapshots(sql: str, root: str = SNAPSHOT_PATH):
+    """스냅샷 Parquet를 DuckDB 뷰(products, coupons, price_history, product_catalog)로 열어 쿼리"""
+    import duckdb
+    
+    con = duckdb.connect()
+    for table in ("products", "coupons", "price_history", "product_catalog"):
+        pattern = os.path.join(root, table, "**", "*.parquet")
+        if any(name.endswith(".parquet") for _, _, names in os.walk(os.path.join(root, table)) for name in names):
+            con.execute(
+                f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{pattern}', hive_partitioning=true, union_by_name=true)"
+            )
+    return con.execute(sql).fetchall()
+
+
+def main():
+    """스냅샷 진입점"""
+    parser = argparse.ArgumentParser(description="올프 로컬 스냅샷 (Parquet)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    export = subparsers.add_parser("export", help="운영 DB 상품/가격 이력 백필")
+    export.add_argument("--storage", choices=STORAGE_BACKENDS, default=STORAGE_BACKEND)
+    export.add_argument("--since", type=date.fromisoformat, default=None, help="이 날짜 이후 가격 이력만 (YYYY-MM-DD)")
+    export.add_argument("--chunk", type=int, default=EXPORT_CHUNK_SIZE, help="요청당 행 수")
+    export.add_argument("--out", default=SNAPSHOT_PATH)
+    
+    query = subparsers.add_parser("query", help="스냅샷에 DuckDB SQL 실행")
+    query.add_argument("sql")
+    query.add_argument("--root", default=SNAPSHOT_PATH)
+    args = parser.parse_args()
+    
+    if args.command == "export":
+        stats = export_price_history(create_storage(args.storage), since=args.since,
+                                     chunk_size=args.chunk, root=args.out)
+        print(f"✅ 백필 완료: 상품 {stats['products']}개, 가격 이력 {stats['price_history']}행, 파일 {stats['files']}개")
+    elif args.command == "query":
+        for row in query_snapshots(args.sql, args.root):
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
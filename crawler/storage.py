@@ -0,0 +1,579 @@
+"""
+올프 크롤러 - 저장소 인터페이스
+스크래퍼가 의존하는 저장소 API와 로컬 구현(SQLite, JSONL/null 싱크)을 정의합니다.
+Supabase 구현은 database.Database 입니다.
+"""
+import os
+import json
+import uuid
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime, date
+from typing import Optional, List, Dict, Tuple, Iterator
+
+from config import SQLITE_PATH, JSONL_SINK_PATH, DB_BATCH_SIZE, PRICE_PARTITION_MONTHS_AHEAD
+
+
+class Storage(ABC):
+    """스크래퍼가 사용하는 저장소 인터페이스"""
+    
+    # ========== 상품 관련 ==========
+    
+    @abstractmethod
+    def get_all_oliveyoung_ids(self) -> Dict[str, str]:
+        """모든 상품의 oliveyoung_id -> product_id 맵핑 조회"""
+    
+    @abstractmethod
+    def upsert_products_bulk(self, products: List[Dict]) -> Dict[str, str]:
+        """상품 일괄 추가/업데이트, oliveyoung_id -> product_id 맵핑 반환"""
+    
+    @abstractmethod
+    def touch_products_seen(self, product_ids: List[str]) -> int:
+        """이번 실행에서 확인된 상품의 last_seen_at 일괄 갱신"""
+    
+    # ========== 가격 이력 관련 ==========
+    
+    @abstractmethod
+    def get_latest_prices(self) -> Dict[str, Tuple[int, int, bool]]:
+        """product_id -> (price, original_price, is_on_sale)"""
+    
+    @abstractmethod
+    def add_price_history_bulk(self, records: List[Dict]) -> int:
+        """가격 이력 일괄 추가"""
+    
+    @abstractmethod
+    def update_price_summary(self, records: List[Dict]) -> int:
+        """상품별 가격 요약(현재/이전/역대 최저·최고가, 하락폭) 일괄 갱신"""
+    
+    @abstractmethod
+    def update_price_analytics(self, rows: List[Dict]) -> int:
+        """가격 분석 결과(이동평균, 변동성, 가짜 할인 등)를 가격 요약에 일괄 반영 (analytics.py)"""
+    
+    # ========== 쿠폰 관련 ==========
+    
+    @abstractmethod
+    def upsert_coupons_bulk(self, coupons: List[Dict]) -> int:
+        """쿠폰 일괄 추가/업데이트 ((brand, coupon_name) 기준)"""
+    
+    @abstractmethod
+    def deactivate_expired_coupons(self) -> int:
+        """만료된 쿠폰 비활성화"""
+    
+    # ========== 통계 관련 ==========
+    
+    @abstractmethod
+    def get_stats(self) -> Dict:
+        """전체 통계 조회 (total_products, active_coupons)"""
+    
+    # ========== 가격 알림 (지원하지 않는 저장소는 알림이 없는 것으로 처리) ==========
+    
+    def get_active_alerts(self, product_ids: List[str]) -> List[Dict]:
+        """상품들의 활성 가격 알림 (id, product_id, user_email, target_price), product_id별 목표가 내림차순"""
+        return []
+    
+    def trigger_price_alerts(self, triggered: List[Dict]) -> int:
+        """발동한 알림({alert_id, price}) 비활성화 + 발송 대기 알림 추가 (추가한 알림 수)"""
+        return 0
+    
+    # ========== 푸시 알림 발송 (Supabase 전용, 다른 저장소는 보낼 알림이 없음) ==========
+    
+    def queue_price_drop_notifications(self, product_ids: List[str], since: datetime) -> int:
+        """since 이후 가격이 내려간 상품을 찜한 사용자에게 알림 추가"""
+        return 0
+    
+    def queue_coupon_notifications(self, brands: List[str]) -> int:
+        """쿠폰이 바뀐 브랜드의 상품을 찜한 사용자에게 알림 추가"""
+        return 0
+    
+    def claim_push_notifications(self, limit: int, started_at: str) -> List[Dict]:
+        """발송할 알림을 구독 정보와 함께 가져오고 발송 중으로 표시 (started_at 이후 시도한 알림 제외)"""
+        return []
+    
+    def finish_push_notifications(self, sent: List[str], retry: List[str], dropped: List[str],
+                                  max_attempts: int) -> int:
+        """발송 결과 반영 (retry는 max_attempts 미만이면 다시 대기, dropped는 실패 처리)"""
+        return 0
+    
+    def delete_push_subscriptions(self, subscription_ids: List[str]) -> int:
+        """만료/해지된 푸시 구독 삭제"""
+        return 0
+    
+    # ========== 유지보수 (지원하지 않는 저장소는 아무것도 하지 않음) ==========
+    
+    def ensure_price_partitions(self, months_ahead: int = PRICE_PARTITION_MONTHS_AHEAD) -> int:
+        """price_history 월 파티션을 미리 생성 (생성한 파티션 수)"""
+        return 0
+    
+    def rollup_price_history(self, since: Optional[date], until: date) -> int:
+        """[since, until) 기간 가격 이력을 상품별 일간 롤업(최저/최고/종가)으로 집계"""
+        return 0
+    
+    def compact_price_history(self, before: date) -> int:
+        """before 이전 원본 가격 이력을 롤업한 뒤 삭제 (상품별 마지막 행은 남김, 삭제한 행 수)"""
+        return 0
+    
+    # ========== 내보내기 (로컬 스냅샷 백필용) ==========
+    
+    def iter_products(self, chunk_size: int) -> Iterator[List[Dict]]:
+        """상품 전체를 chunk_size 행씩 (id 기준 키셋 페이지네이션)"""
+        return iter(())
+    
+    def iter_price_history(self, since: Optional[date], chunk_size: int) -> Iterator[List[Dict]]:
+        """가격 이력 전체를 chunk_size 행씩 (recorded_at, id 기준 키셋 페이지네이션)"""
+        return iter(())
+
+
+def product_uuid(oliveyoung_id: str) -> str:
+    """로컬 저장소용 상품 ID (oliveyoung_id 기준으로 항상 같은 값)"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"oliveyoung:{oliveyoung_id}"))
+
+
+# 가격 요약의 분석 컬럼 (SQLite 타입)
+ANALYTICS_COLUMNS = {
+    "avg_price_7d": "INTEGER",
+    "avg_price_30d": "INTEGER",
+    "high_price_30d": "INTEGER",
+    "drop_from_high": "INTEGER",
+    "drop_from_high_pct": "REAL",
+    "volatility_30d": "REAL",
+    "is_fake_discount": "INTEGER DEFAULT 0",
+    "is_all_time_low": "INTEGER DEFAULT 0",
+    "analyzed_at": "TEXT",
+}
+
+
+class SQLiteStorage(Storage):
+    """로컬 SQLite 파일 저장소 (빠른 스테이징/오프라인 실행용)"""
+    
+    def __init__(self, path: str = SQLITE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        # 저장은 ProductWriter의 스레드에서 순서대로 실행되므로 스레드 간 공유 허용
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        print(f"✅ SQLite 저장소 연결 완료: {path}")
+    
+    def _create_tables(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS products (
+                id TEXT PRIMARY KEY,
+                oliveyoung_id TEXT UNIQUE NOT NULL,
+                name TEXT NOT NULL,
+                brand TEXT NOT NULL,
+                category TEXT NOT NULL,
+                image_url TEXT,
+                product_url TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                last_seen_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS price_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                product_id TEXT NOT NULL,
+                price INTEGER NOT NULL,
+                original_price INTEGER NOT NULL,
+                discount_rate INTEGER DEFAULT 0,
+                is_on_sale INTEGER DEFAULT 0,
+                recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS idx_price_history_product_id ON price_history(product_id, id);
+            CREATE TABLE IF NOT EXISTS price_history_daily (
+                product_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                min_price INTEGER NOT NULL,
+                max_price INTEGER NOT NULL,
+                close_price INTEGER NOT NULL,
+                close_original_price INTEGER NOT NULL,
+                close_discount_rate INTEGER DEFAULT 0,
+                close_is_on_sale INTEGER DEFAULT 0,
+                samples INTEGER NOT NULL,
+                PRIMARY KEY (product_id, day)
+            );
+            CREATE TABLE IF NOT EXISTS product_price_summary (
+                product_id TEXT PRIMARY KEY,
+                current_price INTEGER NOT NULL,
+                original_price INTEGER NOT NULL,
+                discount_rate INTEGER DEFAULT 0,
+                is_on_sale INTEGER DEFAULT 0,
+                previous_price INTEGER,
+                lowest_price INTEGER NOT NULL,
+                highest_price INTEGER NOT NULL,
+                price_drop INTEGER DEFAULT 0,
+                last_changed_at TEXT,
+                updated_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS price_alerts (
+                id TEXT PRIMARY KEY,
+                product_id TEXT NOT NULL,
+                user_email TEXT NOT NULL,
+                target_price INTEGER NOT NULL,
+                is_active INTEGER DEFAULT 1,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                triggered_at TEXT,
+                triggered_price INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_price_alerts_active_product ON price_alerts(product_id, target_price DESC)
+                WHERE is_active = 1;
+            CREATE TABLE IF NOT EXISTS notifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                user_email TEXT,
+                user_id TEXT,
+                product_id TEXT,
+                alert_id TEXT,
+                title TEXT NOT NULL,
+                body TEXT NOT NULL,
+                url TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                sent_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS coupons (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                brand TEXT NOT NULL,
+                coupon_name TEXT NOT NULL,
+                discount_type TEXT NOT NULL,
+                discount_value INTEGER NOT NULL,
+                min_purchase INTEGER,
+                max_discount INTEGER,
+                expires_at TEXT,
+                recorded_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                is_active INTEGER DEFAULT 1,
+                UNIQUE(brand, coupon_name)
+            );
+        """)
+        
+        # 기존 파일에는 가격 분석 컬럼이 없을 수 있음
+        summary_columns = {row[1] for row in self.conn.execute("PRAGMA table_info(product_price_summary)")}
+        for column, column_type in ANALYTICS_COLUMNS.items():
+            if column not in summary_columns:
+                self.conn.execute(f"ALTER TABLE product_price_summary ADD COLUMN {column} {column_type}")
+        self.conn.commit()
+    
+    def get_all_oliveyoung_ids(self) -> Dict[str, str]:
+        return dict(self.conn.execute("SELECT oliveyoung_id, id FROM products"))
+    
+    def upsert_products_bulk(self, products: List[Dict]) -> Dict[str, str]:
+        now = datetime.utcnow().isoformat()
+        self.conn.executemany("""
+            INSERT INTO products (id, oliveyoung_id, name, brand, category, image_url, product_url, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(oliveyoung_id) DO UPDATE SET
+                name = excluded.name,
+                brand = excluded.brand,
+                category = excluded.category,
+                image_url = excluded.image_url,
+                product_url = excluded.product_url,
+                updated_at = excluded.updated_at
+        """, [(
+            product_uuid(p["oliveyoung_id"]), p["oliveyoung_id"], p["name"], p["brand"],
+            p["category"], p.get("image_url"), p["product_url"], now
+        ) for p in products])
+        self.conn.commit()
+        
+        id_map = {}
+        oliveyoung_ids = list({p["oliveyoung_id"] for p in products})
+        for i in range(0, len(oliveyoung_ids), DB_BATCH_SIZE):
+            chunk = oliveyoung_ids[i:i + DB_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            id_map.update(self.conn.execute(
+                f"SELECT oliveyoung_id, id FROM products WHERE oliveyoung_id IN ({placeholders})", chunk
+            ))
+        return id_map
+    
+    def touch_products_seen(self, product_ids: List[str]) -> int:
+        now = datetime.utcnow().isoformat()
+        self.conn.executemany(
+            "UPDATE products SET last_seen_at = ? WHERE id = ?",
+            [(now, product_id) for product_id in product_ids]
+        )
+        self.conn.commit()
+        return len(product_ids)
+    
+    def get_latest_prices(self) -> Dict[str, Tuple[int, int, bool]]:
+        # SQLite는 MAX()와 함께 조회한 나머지 컬럼을 최댓값 행에서 가져옴
+        rows = self.conn.execute("""
+            SELECT product_id, price, original_price, is_on_sale, MAX(id)
+            FROM price_history
+            GROUP BY product_id
+        """)
+        latest = {row[0]: (row[1], row[2], bool(row[3])) for row in rows}
+        
+        # 원본 이력이 정리(compact)된 상품은 가격 요약으로 채움
+        for product_id, price, original_price, is_on_sale in self.conn.execute(
+            "SELECT product_id, current_price, original_price, is_on_sale FROM product_price_summary"
+        ):
+            latest.setdefault(product_id, (price, original_price, bool(is_on_sale)))
+        return latest
+    
+    def add_price_history_bulk(self, records: List[Dict]) -> int:
+        now = datetime.utcnow().isoformat()
+        self.conn.executemany("""
+            INSERT INTO price_history (product_id, price, original_price, discount_rate, is_on_sale, recorded_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(
+            r["product_id"], r["price"], r["original_price"],
+            r.get("discount_rate", 0), int(r.get("is_on_sale", False)), now
+        ) for r in records])
+        self.conn.commit()
+        return len(records)
+    
+    def update_price_summary(self, records: List[Dict]) -> int:
+        # supabase/schema.sql의 apply_price_summary와 같은 규칙
+        now = datetime.utcnow().isoformat()
+        self.conn.executemany("""
+            INSERT INTO product_price_summary AS s (
+                product_id, current_price, original_price, discount_rate, is_on_sale,
+                previous_price, lowest_price, highest_price, price_drop, last_changed_at, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, NULL, ?, ?, 0, ?, ?)
+            ON CONFLICT(product_id) DO UPDATE SET
+                previous_price = CASE WHEN excluded.current_price <> s.current_price THEN s.current_price ELSE s.previous_price END,
+                price_drop = CASE WHEN excluded.current_price <> s.current_price THEN s.current_price - excluded.current_price ELSE s.price_drop END,
+                last_changed_at = CASE WHEN excluded.current_price <> s.current_price THEN excluded.updated_at ELSE s.last_changed_at END,
+                current_price = excluded.current_price,
+                original_price = excluded.original_price,
+                discount_rate = excluded.discount_rate,
+                is_on_sale = excluded.is_on_sale,
+                lowest_price = MIN(s.lowest_price, excluded.current_price),
+                highest_price = MAX(s.highest_price, excluded.current_price),
+                updated_at = excluded.updated_at
+        """, [(
+            r["product_id"], r["price"], r["original_price"], r.get("discount_rate", 0),
+            int(r.get("is_on_sale", False)), r["price"], r["price"], now, now
+        ) for r in records])
+        self.conn.commit()
+        return len(records)
+    
+    def update_price_analytics(self, rows: List[Dict]) -> int:
+        # supabase/schema.sql의 apply_price_analytics와 같은 규칙 (역대 최저가 여부는 요약 값으로 계산)
+        now = datetime.utcnow().isoformat()
+        columns = [column for column in ANALYTICS_COLUMNS if column not in ("is_all_time_low", "analyzed_at")]
+        cursor = self.conn.executemany(f"""
+            UPDATE product_price_summary SET
+                {", ".join(f"{column} = ?" for column in columns)},
+                is_all_time_low = current_price <= lowest_price,
+                analyzed_at = ?
+            WHERE product_id = ?
+        """, [(*(row[column] for column in columns), now, row["product_id"]) for row in rows])
+        self.conn.commit()
+        return cursor.rowcount
+    
+    def get_active_alerts(self, product_ids: List[str]) -> List[Dict]:
+        alerts = []
+        for i in range(0, len(product_ids), DB_BATCH_SIZE):
+            chunk = product_ids[i:i + DB_BATCH_SIZE]
+            for rows in self._iter_rows(f"""
+                SELECT id, product_id, user_email, target_price FROM price_alerts
+                WHERE is_active = 1 AND product_id IN ({", ".join("?" * len(chunk))})
+                ORDER BY product_id, target_price DESC, id
+            """, tuple(chunk), DB_BATCH_SIZE):
+                alerts.extend(rows)
+        return alerts
+    
+    def trigger_price_alerts(self, triggered: List[Dict]) -> int:
+        # supabase/schema.sql의 trigger_price_alerts와 같은 규칙 (이미 발동한 알림은 건너뜀)
+        now = datetime.utcnow().isoformat()
+        count = 0
+        for row in triggered:
+            cursor = self.conn.execute("""
+                UPDATE price_alerts SET is_active = 0, triggered_at = ?, triggered_price = ?
+                WHERE id = ? AND is_active = 1
+            """, (now, row["price"], row["alert_id"]))
+            if not cursor.rowcount:
+                continue
+            cursor = self.conn.execute("""
+                INSERT INTO notifications (kind, user_email, product_id, alert_id, title, body, url, created_at)
+                SELECT 'price_alert', a.user_email, a.product_id, a.id, '🔔 목표 가격 도달',
+                       p.name || ' ' || printf('%,d', a.triggered_price) || '원 (목표 ' || printf('%,d', a.target_price) || '원)',
+                       '/products/' || a.product_id, ?
+                FROM price_alerts a JOIN products p ON p.id = a.product_id
+                WHERE a.id = ?
+            """, (now, row["alert_id"]))
+            count += cursor.rowcount
+        self.conn.commit()
+        return count
+    
+    def upsert_coupons_bulk(self, coupons: List[Dict]) -> int:
+        now = datetime.utcnow().isoformat()
+        self.conn.executemany("""
+            INSERT INTO coupons (brand, coupon_name, discount_type, discount_value,
+                                 min_purchase, max_discount, expires_at, recorded_at, is_active)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+            ON CONFLICT(brand, coupon_name) DO UPDATE SET
+                discount_type = excluded.discount_type,
+                discount_value = excluded.discount_value,
+                min_purchase = excluded.min_purchase,
+                max_discount = excluded.max_discount,
+                expires_at = excluded.expires_at,
+                recorded_at = excluded.recorded_at,
+                is_active = 1
+        """, [(
+            c["brand"], c["coupon_name"], c["discount_type"], c["discount_value"],
+            c.get("min_purchase"), c.get("max_discount"), c.get("expires_at"), now
+        ) for c in coupons])
+        self.conn.commit()
+        return len(coupons)
+    
+    def deactivate_expired_coupons(self) -> int:
+        now = datetime.utcnow().isoformat()
+        cursor = self.conn.execute(
+            "UPDATE coupons SET is_active = 0 WHERE expires_at < ? AND is_active = 1", (now,)
+        )
+        self.conn.commit()
+        if cursor.rowcount > 0:
+            print(f"  ⏰ {cursor.rowcount}개의 만료된 쿠폰을 비활성화했습니다.")
+        return cursor.rowcount
+    
+    def rollup_price_history(self, since: Optional[date], until: date) -> int:
+        # supabase/schema.sql의 rollup_price_history와 같은 규칙 (종가는 그날 마지막 행)
+        # WITH로 시작하는 문장은 sqlite3 rowcount가 -1이므로 INSERT ... SELECT (서브쿼리)로 작성
+        cursor = self.conn.execute("""
+            INSERT INTO price_history_daily (
+                product_id, day, min_price, max_price,
+                close_price, close_original_price, close_discount_rate, close_is_on_sale, samples
+            )
+            SELECT d.product_id, d.day, d.min_price, d.max_price,
+                   ph.price, ph.original_price, ph.discount_rate, ph.is_on_sale, d.samples
+            FROM (
+                SELECT product_id, date(recorded_at) AS day,
+                       MIN(price) AS min_price, MAX(price) AS max_price,
+                       COUNT(*) AS samples, MAX(id) AS last_id
+                FROM price_history
+                WHERE recorded_at >= ? AND recorded_at < ?
+                GROUP BY product_id, date(recorded_at)
+            ) d JOIN price_history ph ON ph.id = d.last_id
+            WHERE true
+            ON CONFLICT(product_id, day) DO UPDATE SET
+                min_price = excluded.min_price,
+                max_price = excluded.max_price,
+                close_price = excluded.close_price,
+                close_original_price = excluded.close_original_price,
+                close_discount_rate = excluded.close_discount_rate,
+                close_is_on_sale = excluded.close_is_on_sale,
+                samples = excluded.samples
+        """, ((since or date.min).isoformat(), until.isoformat()))
+        self.conn.commit()
+        return cursor.rowcount
+    
+    def compact_price_history(self, before: date) -> int:
+        self.rollup_price_history(None, before)
+        # 상품별 마지막 행은 남김 (가격은 바뀔 때만 기록하므로 현재 가격 기록)
+        cursor = self.conn.execute("""
+            DELETE FROM price_history
+            WHERE recorded_at < ?
+              AND id NOT IN (SELECT MAX(id) FROM price_history GROUP BY product_id)
+        """, (before.isoformat(),))
+        self.conn.commit()
+        return cursor.rowcount
+    
+    def _iter_rows(self, sql: str, params: Tuple, chunk_size: int) -> Iterator[List[Dict]]:
+        cursor = self.conn.execute(sql, params)
+        columns = [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield [dict(zip(columns, row)) for row in rows]
+    
+    def iter_products(self, chunk_size: int) -> Iterator[List[Dict]]:
+        return self._iter_rows("SELECT * FROM products ORDER BY id", (), chunk_size)
+    
+    def iter_price_history(self, since: Optional[date], chunk_size: int) -> Iterator[List[Dict]]:
+        return self._iter_rows(
+            "SELECT * FROM price_history WHERE recorded_at >= ? ORDER BY recorded_at, id",
+            ((since or date.min).isoformat(),), chunk_size
+        )
+    
+    def get_stats(self) -> Dict:
+        total_products = self.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        active_coupons = self.conn.execute("SELECT COUNT(*) FROM coupons WHERE is_active = 1").fetchone()[0]
+        return {"total_products": total_products, "active_coupons": active_coupons}
+
+
+class JsonlStorage(Storage):
+    """JSONL 파일 싱크 (path가 None이면 아무것도 남기지 않는 null 싱크)
+    
+    읽기 API는 이번 실행에서 쓴 데이터만 알고 있으므로, 매 실행이 첫 실행처럼 동작합니다.
+    """
+    
+    def __init__(self, path: Optional[str] = JSONL_SINK_PATH):
+        self.path = path
+        self.file = None
+        self.products: Dict[str, str] = {}
+        self.coupon_keys = set()
+        
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.file = open(path, "a", encoding="utf-8")
+            print(f"✅ JSONL 싱크 연결 완료: {path}")
+        else:
+            print("✅ null 싱크 사용 (저장하지 않음)")
+    
+    def _write(self, table: str, rows: List[Dict]):
+        if not self.file:
+            return
+        now = datetime.utcnow().isoformat()
+        for row in rows:
+            self.file.write(json.dumps({"table": table, "at": now, **row}, ensure_ascii=False) + "\n")
+        self.file.flush()
+    
+    def get_all_oliveyoung_ids(self) -> Dict[str, str]:
+        return dict(self.products)
+    
+    def upsert_products_bulk(self, products: List[Dict]) -> Dict[str, str]:
+        id_map = {p["oliveyoung_id"]: product_uuid(p["oliveyoung_id"]) for p in products}
+        self.products.update(id_map)
+        self._write("products", [{**p, "id": id_map[p["oliveyoung_id"]]} for p in products])
+        return id_map
+    
+    def touch_products_seen(self, product_ids: List[str]) -> int:
+        self._write("products_seen", [{"id": product_id} for product_id in product_ids])
+        return len(product_ids)
+    
+    def get_latest_prices(self) -> Dict[str, Tuple[int, int, bool]]:
+        return {}
+    
+    def add_price_history_bulk(self, records: List[Dict]) -> int:
+        self._write("price_history", records)
+        return len(records)
+    
+    def update_price_summary(self, records: List[Dict]) -> int:
+        self._write("product_price_summary", records)
+        return len(records)
+    
+    def update_price_analytics(self, rows: List[Dict]) -> int:
+        self._write("product_price_analytics", rows)
+        return len(rows)
+    
+    def upsert_coupons_bulk(self, coupons: List[Dict]) -> int:
+        self.coupon_keys.update((c["brand"], c["coupon_name"]) for c in coupons)
+        self._write("coupons", coupons)
+        return len(coupons)
+    
+    def deactivate_expired_coupons(self) -> int:
+        return 0
+    
+    def get_stats(self) -> Dict:
+        return {"total_products": len(self.products), "active_coupons": len(self.coupon_keys)}
+
+
+STORAGE_BACKENDS = ("supabase", "sqlite", "jsonl", "null")
+
+
+def create_storage(backend: str) -> Storage:
+    """저장소 생성 (supabase, sqlite, jsonl, null)"""
+    if backend == "supabase":
+        # Supabase 클라이언트는 필요할 때만 import
+        from database import Database
+        return Database()
+    if backend == "sqlite":
+        return SQLiteStorage()
+    if backend == "jsonl":
+        return JsonlStorage()
+    if backend == "null":
+        return JsonlStorage(path=None)
+    raise ValueError(f"알 수 없는 저장소입니다: {backend} (사용 가능: {', '.join(STORAGE_BACKENDS)})")
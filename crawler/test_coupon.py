@@ -5,6 +5,7 @@
 import os
 import asyncio
 from playwright.async_api import async_playwright
+import browser_server
 
 # 테스트할 상품 URL (여기에 원하는 URL 입력)
 TEST_URL = "https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo=A000000223414&dispCatNo=90000010009&trackingCd=Best_Sellingbest&t_page=%EB%9E%AD%ED%82%B9&t_click=%ED%8C%90%EB%A7%A4%EB%9E%AD%ED%82%B9_%EC%A0%84%EC%B2%B4_%EC%83%81%ED%92%88%EC%83%81%EC%84%B8&t_number=3"
@@ -17,15 +18,21 @@ async def test_coupon_scrape():
     print("🧪 쿠폰 크롤링 테스트 시작...\n")
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)  # 브라우저 보이게
-        
-        # 저장된 로그인 상태 불러오기
-        if os.path.exists(BROWSER_STATE_PATH):
-            print("📂 저장된 로그인 상태를 불러옵니다...")
-            context = await browser.new_context(storage_state=BROWSER_STATE_PATH)
+        # 브라우저 서버(python browser_server.py start)가 떠 있으면 로그인된 컨텍스트에 바로 붙음
+        connected = await browser_server.connect(p)
+        if connected:
+            browser, context, info = connected
+            print(f"🔌 브라우저 서버에 연결했습니다: {info['endpoint']}")
         else:
-            print("⚠️ 로그인 상태가 없습니다. 먼저 main.py를 실행해서 로그인하세요!")
-            context = await browser.new_context()
+            browser = await p.chromium.launch(headless=False)  # 브라우저 보이게
+            
+            # 저장된 로그인 상태 불러오기
+            if os.path.exists(BROWSER_STATE_PATH):
+                print("📂 저장된 로그인 상태를 불러옵니다...")
+                context = await browser.new_context(storage_state=BROWSER_STATE_PATH)
+            else:
+                print("⚠️ 로그인 상태가 없습니다. 먼저 main.py를 실행해서 로그인하세요!")
+                context = await browser.new_context()
         
         page = await context.new_page()
         
@@ -70,18 +77,20 @@ async def test_coupon_scrape():
                     print(f"   할인: {discount}원")
                     print(f"   조건: {condition}")
                     print()
-                    
+                
                 except Exception as e:
                     print(f"   파싱 오류: {e}")
             
             # ESC로 팝업 닫기
             await page.keyboard.press("Escape")
-            
+        
         except Exception as e:
             print(f"❌ 오류 발생: {e}")
         
         finally:
             input("\n테스트 완료! Enter를 눌러 브라우저를 닫으세요...")
+            # 서버에 붙었으면 연 페이지만 닫고 연결 해제 (서버의 브라우저는 유지)
+            await page.close()
             await browser.close()
 
 
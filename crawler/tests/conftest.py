@@ -0,0 +1,45 @@
+"""
+올프 크롤러 - 단위 테스트 공통 설정
+크롤러 모듈은 crawler/ 디렉터리 기준으로 import하므로 경로에 추가합니다.
+브라우저/네트워크 없이 메모리(SQLite/null) 저장소와 가짜 페이지로만 실행합니다.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import JsonlStorage, SQLiteStorage  # noqa: E402
+
+
+@pytest.fixture
+def null_db():
+    """아무것도 남기지 않는 null 저장소"""
+    return JsonlStorage(path=None)
+
+
+@pytest.fixture
+def sqlite_db():
+    """메모리 SQLite 저장소 (실행 간 최신 가격을 기억하는 저장소가 필요한 테스트용)"""
+    db = SQLiteStorage(":memory:")
+    yield db
+    db.conn.close()
+
+
+def make_product(oliveyoung_id: str, price: int, original_price: int = None,
+                 brand: str = "브랜드A", category: str = "스킨케어") -> dict:
+    """ProductScraper._build_product 결과와 같은 형태의 상품"""
+    original_price = original_price or price
+    return {
+        "oliveyoung_id": oliveyoung_id,
+        "name": f"상품 {oliveyoung_id}",
+        "brand": brand,
+        "category": category,
+        "image_url": None,
+        "product_url": f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={oliveyoung_id}",
+        "price": price,
+        "original_price": original_price,
+        "discount_rate": int((1 - price / original_price) * 100),
+        "is_on_sale": price < original_price,
+    }
@@ -0,0 +1,81 @@
+"""
+올프 크롤러 - 브랜드 쿠폰 캐시 테스트 (쿠폰이 그대로면 재확인 간격 두 배, 최대 간격까지)
+"""
+from coupon_cache import CouponCache, coupons_hash
+
+COUPONS = [
+    {"coupon_name": "10% 할인", "discount_type": "percent", "discount_value": 10,
+     "min_purchase": None, "max_discount": 5000, "expires_at": "2026-12-31"},
+    {"coupon_name": "3천원 할인", "discount_type": "amount", "discount_value": 3000,
+     "min_purchase": 20000, "max_discount": None, "expires_at": None},
+]
+
+
+def new_cache(tmp_path, ttl: int = 100, max_ttl: int = 350) -> CouponCache:
+    return CouponCache(path=str(tmp_path / "coupon_cache.json"), ttl=ttl, max_ttl=max_ttl)
+
+
+def is_fresh_after(cache: CouponCache, brand: str, seconds: float) -> bool:
+    return cache.is_fresh(brand, now=cache.brands[brand]["checked_at"] + seconds)
+
+
+def test_hash_ignores_order_and_untracked_fields():
+    reordered = [dict(COUPONS[1], recorded_at="now"), COUPONS[0]]
+    assert coupons_hash(reordered) == coupons_hash(COUPONS)
+    assert coupons_hash([dict(COUPONS[0], discount_value=15)]) != coupons_hash(COUPONS[:1])
+
+
+def test_unknown_brand_is_not_fresh_and_changed(tmp_path):
+    cache = new_cache(tmp_path)
+    assert not cache.is_fresh("브랜드A")
+    assert cache.is_changed("브랜드A", COUPONS)
+
+
+def test_unchanged_checks_double_ttl_up_to_max(tmp_path):
+    cache = new_cache(tmp_path, ttl=100, max_ttl=350)
+    
+    cache.record("브랜드A", COUPONS)
+    assert cache.brands["브랜드A"]["unchanged"] == 0
+    assert is_fresh_after(cache, "브랜드A", 99)
+    assert not is_fresh_after(cache, "브랜드A", 100)
+    
+    cache.record("브랜드A", list(reversed(COUPONS)))
+    assert cache.brands["브랜드A"]["unchanged"] == 1
+    assert is_fresh_after(cache, "브랜드A", 199)
+    assert not is_fresh_after(cache, "브랜드A", 200)
+    
+    # 두 배씩 늘다가 max_ttl에서 멈춤 (100 -> 200 -> 350)
+    cache.record("브랜드A", COUPONS)
+    cache.record("브랜드A", COUPONS)
+    assert cache.brands["브랜드A"]["unchanged"] == 3
+    assert is_fresh_after(cache, "브랜드A", 349)
+    assert not is_fresh_after(cache, "브랜드A", 350)
+
+
+def test_changed_coupons_reset_ttl(tmp_path):
+    cache = new_cache(tmp_path)
+    cache.record("브랜드A", COUPONS)
+    cache.record("브랜드A", COUPONS)
+    
+    assert cache.is_changed("브랜드A", COUPONS[:1])
+    cache.record("브랜드A", COUPONS[:1])
+    assert cache.brands["브랜드A"]["unchanged"] == 0
+    assert cache.cached_count("브랜드A") == 1
+    assert not is_fresh_after(cache, "브랜드A", 100)
+
+
+def test_save_and_reload(tmp_path):
+    cache = new_cache(tmp_path)
+    cache.record("브랜드A", COUPONS)
+    cache.record("브랜드A", COUPONS)
+    cache.save()
+    
+    reloaded = new_cache(tmp_path)
+    assert reloaded.brands == cache.brands
+    assert not reloaded.is_changed("브랜드A", COUPONS)
+    assert is_fresh_after(reloaded, "브랜드A", 199)
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    (tmp_path / "coupon_cache.json").write_text("{not json", encoding="utf-8")
+    assert new_cache(tmp_path).brands == {}
@@ -0,0 +1,138 @@
+"""
+올프 크롤러 - 랭킹 페이지 지문 테스트 (같은 페이지는 파싱/저장 생략, TTL이 지나면 다시 저장)
+"""
+import asyncio
+
+from page_fingerprint import PageFingerprints, page_fingerprint
+from rate_limiter import RateLimiter
+from scraper import ProductScraper
+
+
+def raw_item(goods_no: str, price: str = "10,000", brand: str = "브랜드A") -> dict:
+    """EXTRACT_PRODUCT_ITEMS_JS가 돌려주는 아이템"""
+    return {
+        "href": f"https://www.oliveyoung.co.kr/store/goods/getGoodsDetail.do?goodsNo={goods_no}",
+        "brand": brand,
+        "name": f"상품 {goods_no}",
+        "image_url": None,
+        "cur_price": price,
+        "org_price": None,
+    }
+
+
+class FakeResponse:
+    status = 200
+
+
+class FakePage:
+    """랭킹 페이지 1장(아이템 24개 미만이라 마지막 페이지)을 돌려주는 가짜 페이지"""
+    
+    def __init__(self, raw_items):
+        self.raw_items = raw_items
+        self.visits = 0
+    
+    async def goto(self, url, **kwargs):
+        self.visits += 1
+        return FakeResponse()
+    
+    async def wait_for_selector(self, selector, **kwargs):
+        return None
+    
+    async def evaluate(self, script):
+        return self.raw_items
+
+
+def new_fingerprints(tmp_path, ttl: int = 1000) -> PageFingerprints:
+    return PageFingerprints(path=str(tmp_path / "page_fingerprints.json"), ttl=ttl)
+
+
+def new_scraper(page, db, fingerprints) -> ProductScraper:
+    return ProductScraper(page, db, rate_limiter=RateLimiter(max_per_second=0),
+                          one_shot_extraction=True, fingerprints=fingerprints)
+
+
+def crawl(scraper: ProductScraper):
+    """카테고리 1개 수집 후 ProductWriter처럼 저장하고 지문 기록"""
+    async def run():
+        pages = []
+        async for page_num, products in scraper.scrape_ranking_page("스킨케어", "100"):
+            await scraper.save_products_to_db(products)
+            scraper.mark_page_saved("스킨케어", page_num, products)
+            pages.append(page_num)
+        return pages
+    return asyncio.run(run())
+
+
+def test_fingerprint_depends_on_order_and_tracked_fields():
+    items = [raw_item("A1"), raw_item("A2")]
+    assert page_fingerprint(items) == page_fingerprint([dict(item, extra="x") for item in items])
+    assert page_fingerprint(items) != page_fingerprint(list(reversed(items)))
+    assert page_fingerprint(items) != page_fingerprint([raw_item("A1", price="9,000"), raw_item("A2")])
+
+
+def test_unchanged_respects_ttl(tmp_path):
+    fingerprints = new_fingerprints(tmp_path, ttl=1000)
+    assert fingerprints.unchanged("스킨케어", 1, "hash") is None
+    
+    fingerprints.record("스킨케어", 1, "hash", 1, [{"brand": "브랜드A", "oliveyoung_id": "A1",
+                                                 "price": 10000, "original_price": 10000, "is_on_sale": False}])
+    saved_at = fingerprints.get("스킨케어", 1)["saved_at"]
+    assert fingerprints.unchanged("스킨케어", 1, "hash", now=saved_at + 999)["count"] == 1
+    assert fingerprints.unchanged("스킨케어", 1, "hash", now=saved_at + 1000) is None
+    assert fingerprints.unchanged("스킨케어", 1, "other", now=saved_at + 1) is None
+    
+    fingerprints.save()
+    assert new_fingerprints(tmp_path).pages == fingerprints.pages
+
+
+def test_unchanged_page_is_skipped_and_restored(tmp_path, sqlite_db):
+    fingerprints = new_fingerprints(tmp_path)
+    page = FakePage([raw_item("A1"), raw_item("A2", brand="브랜드B")])
+    assert crawl(new_scraper(page, sqlite_db, fingerprints)) == [1]
+    assert fingerprints.get("스킨케어", 1)["brands"] == {"브랜드A": "A1", "브랜드B": "A2"}
+    
+    skipped = []
+    scraper = new_scraper(page, sqlite_db, fingerprints)
+    scraper.on_page_skipped = lambda category, page_num, entry: skipped.append((category, page_num))
+    
+    assert crawl(scraper) == []
+    assert skipped == [("스킨케어", 1)]
+    assert fingerprints.skipped == 1
+    assert page.visits == 2
+    # 건너뛴 페이지의 지난 가격은 가격 분석용으로, 브랜드는 쿠폰 수집용으로 채워짐
+    assert sorted(scraper.run_prices.values()) == [(10000, 10000, False)] * 2
+    assert scraper.collected_brands == {"브랜드A", "브랜드B"}
+    assert not scraper.summary_updates
+
+
+def test_changed_or_expired_page_is_saved_again(tmp_path, sqlite_db):
+    fingerprints = new_fingerprints(tmp_path)
+    page = FakePage([raw_item("A1")])
+    crawl(new_scraper(page, sqlite_db, fingerprints))
+    
+    page.raw_items = [raw_item("A1", price="9,000")]
+    assert crawl(new_scraper(page, sqlite_db, fingerprints)) == [1]
+    
+    # 지문이 같아도 TTL이 지나면 다시 저장 (last_seen_at 갱신)
+    fingerprints.pages["스킨케어/1"]["saved_at"] -= 1000
+    assert crawl(new_scraper(page, sqlite_db, fingerprints)) == [1]
+    assert fingerprints.skipped == 0
+
+
+def test_page_not_recorded_until_saved(tmp_path, null_db):
+    fingerprints = new_fingerprints(tmp_path)
+    scraper = new_scraper(None, null_db, fingerprints)
+    items = [raw_item("A1")]
+    
+    products = scraper._build_page_products(items, "스킨케어", ("스킨케어", 1))
+    assert [p["oliveyoung_id"] for p in products] == ["A1"]
+    # 저장 전에는 지문이 없으므로 같은 페이지를 다시 만나도 파싱
+    assert scraper._build_page_products(items, "스킨케어", ("스킨케어", 1)) is not None
+    
+    scraper.mark_page_saved("스킨케어", 1, products)
+    assert scraper._build_page_products(items, "스킨케어", ("스킨케어", 1)) is None
+
+
+def test_full_refresh_ignores_fingerprints(tmp_path, null_db):
+    scraper = ProductScraper(None, null_db, full_refresh=True, fingerprints=new_fingerprints(tmp_path))
+    assert scraper.fingerprints is None
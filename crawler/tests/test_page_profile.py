@@ -0,0 +1,83 @@
+"""
+올프 크롤러 - 페이지 프로필 리소스 캐시 테스트 (디스크 캐시 적중/저장, 실패한 요청 정리)
+"""
+import asyncio
+
+import pytest
+
+from config import CACHEABLE_RESOURCE_TYPES
+from page_profile import PageProfile
+
+RESOURCE_TYPE = sorted(CACHEABLE_RESOURCE_TYPES)[0]
+
+
+class FakeRequest:
+    def __init__(self, url: str = "https://static.oliveyoung.co.kr/app.js"):
+        self.url = url
+        self.method = "GET"
+        self.resource_type = RESOURCE_TYPE
+
+
+class FakeResponse:
+    status = 200
+    headers = {"content-type": "application/javascript", "content-length": "3", "set-cookie": "x=1"}
+    
+    async def body(self):
+        return b"abc"
+
+
+class FakeRoute:
+    """route.fetch 호출 수와 fulfill 인자를 기록 (fail=True면 fetch에서 실패)"""
+    
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.fetches = 0
+        self.fulfilled = None
+    
+    async def fetch(self):
+        self.fetches += 1
+        if self.fail:
+            raise ConnectionError("net::ERR_FAILED")
+        return FakeResponse()
+    
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+    
+    async def continue_(self):
+        pass
+    
+    async def abort(self):
+        pass
+
+
+def test_asset_is_cached_then_served_from_disk(tmp_path):
+    profile = PageProfile(lean=True, cache_dir=str(tmp_path))
+    request = FakeRequest()
+    
+    miss = FakeRoute()
+    asyncio.run(profile._handle_route(miss, request))
+    assert miss.fetches == 1
+    assert profile.stats["bytes"] == 3
+    
+    hit = FakeRoute()
+    asyncio.run(profile._handle_route(hit, request))
+    assert hit.fetches == 0
+    assert hit.fulfilled["body"] == b"abc"
+    # 압축/길이/쿠키 헤더는 캐시에 남기지 않음
+    assert hit.fulfilled["headers"] == {"content-type": "application/javascript"}
+    assert profile.stats["cache_hits"] == 1
+
+
+def test_failed_request_is_not_left_in_self_counted(tmp_path):
+    profile = PageProfile(lean=True, cache_dir=str(tmp_path))
+    request = FakeRequest()
+    
+    with pytest.raises(ConnectionError):
+        asyncio.run(profile._handle_route(FakeRoute(fail=True), request))
+    assert request not in profile._self_counted
+    
+    # 핸들러는 끝났지만 브라우저 쪽에서 중단된 요청도 requestfailed에서 정리
+    asyncio.run(profile._handle_route(FakeRoute(), request))
+    assert request in profile._self_counted
+    profile._on_request_failed(request)
+    assert request not in profile._self_counted
@@ -0,0 +1,119 @@
+"""
+올프 크롤러 - 상품 저장 파이프라인 테스트 (배치 묶기, 페이지별 Future 완료/실패)
+"""
+import asyncio
+
+import pytest
+
+from conftest import make_product
+from pipeline import ProductWriter
+
+
+class FakeScraper:
+    """save_products_to_db 호출을 기록하는 가짜 스크래퍼 (fail_categories 상품이 섞이면 실패)"""
+    
+    def __init__(self, fail_categories=()):
+        self.calls = []
+        self.fail_categories = set(fail_categories)
+    
+    async def save_products_to_db(self, products):
+        self.calls.append([p["oliveyoung_id"] for p in products])
+        failed = any(p["category"] in self.fail_categories for p in products)
+        return {"new_count": len(products), "updated_count": 0, "changed_count": len(products), "failed": failed}
+
+
+def page(category: str, prefix: str, count: int = 2):
+    return [make_product(f"{prefix}{i}", 1000, category=category) for i in range(count)]
+
+
+def test_pages_are_batched_up_to_batch_size():
+    async def run():
+        scraper = FakeScraper()
+        writer = ProductWriter(scraper, max_pending_pages=10, batch_size=4)
+        # 시작 전에 쌓인 페이지는 batch_size까지 한 번에 저장
+        futures = [await writer.put("스킨케어", n, page("스킨케어", f"P{n}-")) for n in (1, 2, 3)]
+        writer.start()
+        await writer.close()
+        return scraper, writer, futures
+    
+    scraper, writer, futures = asyncio.run(run())
+    assert scraper.calls == [["P1-0", "P1-1", "P2-0", "P2-1"], ["P3-0", "P3-1"]]
+    assert all(future.done() and future.result() is None for future in futures)
+    assert writer.category_stats["스킨케어"] == {"new_count": 6, "updated_count": 0, "changed_count": 6}
+
+
+def test_batch_is_split_by_category_and_pages_reported_in_order():
+    saved = []
+    
+    async def run():
+        scraper = FakeScraper()
+        writer = ProductWriter(scraper, batch_size=100, on_page_saved=lambda c, n, p: saved.append((c, n, len(p))))
+        await writer.put("스킨케어", 1, page("스킨케어", "S"))
+        await writer.put("메이크업", 1, page("메이크업", "M", 3))
+        await writer.put("스킨케어", 2, page("스킨케어", "T"))
+        writer.start()
+        await writer.close()
+        return scraper
+    
+    scraper = asyncio.run(run())
+    assert scraper.calls == [["S0", "S1", "T0", "T1"], ["M0", "M1", "M2"]]
+    assert saved == [("스킨케어", 1, 2), ("스킨케어", 2, 2), ("메이크업", 1, 3)]
+
+
+def test_failed_category_rejects_only_its_pages():
+    saved = []
+    
+    async def run():
+        writer = ProductWriter(FakeScraper(fail_categories={"메이크업"}), batch_size=100,
+                               on_page_saved=lambda c, n, p: saved.append((c, n)))
+        ok = await writer.put("스킨케어", 1, page("스킨케어", "S"))
+        bad = await writer.put("메이크업", 1, page("메이크업", "M"))
+        writer.start()
+        await writer.close()
+        return writer, ok, bad
+    
+    writer, ok, bad = asyncio.run(run())
+    assert ok.result() is None
+    with pytest.raises(RuntimeError):
+        bad.result()
+    # 실패한 페이지는 체크포인트/지문에 기록하지 않고 통계에도 넣지 않음
+    assert saved == [("스킨케어", 1)]
+    assert "메이크업" not in writer.category_stats
+
+
+def test_put_waits_when_queue_is_full():
+    async def run():
+        writer = ProductWriter(FakeScraper(), max_pending_pages=1, batch_size=100)
+        await writer.put("스킨케어", 1, page("스킨케어", "S"))
+        blocked = asyncio.create_task(writer.put("스킨케어", 2, page("스킨케어", "T")))
+        await asyncio.sleep(0)
+        was_blocked = not blocked.done()
+        
+        writer.start()
+        second = await asyncio.wait_for(blocked, timeout=1)
+        await writer.close()
+        return was_blocked, second
+    
+    was_blocked, second = asyncio.run(run())
+    assert was_blocked
+    assert second.result() is None
+
+
+def test_callback_error_does_not_fail_saved_page():
+    def on_page_saved(category_name, page_num, products):
+        if page_num == 1:
+            raise OSError("체크포인트 쓰기 실패")
+    
+    async def run():
+        writer = ProductWriter(FakeScraper(), batch_size=100, on_page_saved=on_page_saved)
+        first = await writer.put("스킨케어", 1, page("스킨케어", "S"))
+        second = await writer.put("스킨케어", 2, page("스킨케어", "T"))
+        writer.start()
+        await writer.close()
+        return writer, first, second
+    
+    writer, first, second = asyncio.run(run())
+    # 행은 저장됐으므로 페이지는 성공, 통계에도 포함
+    assert first.result() is None
+    assert second.result() is None
+    assert writer.category_stats["스킨케어"]["new_count"] == 4
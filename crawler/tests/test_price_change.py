@@ -0,0 +1,68 @@
+"""
+올프 크롤러 - 가격 변동분만 기록하는 저장 테스트 (ProductScraper._save_products)
+"""
+from conftest import make_product
+from scraper import ProductScraper
+
+
+def new_scraper(db, **kwargs) -> ProductScraper:
+    """실행마다 새로 만드는 스크래퍼 (기존 상품/최신 가격을 저장소에서 다시 로드)"""
+    return ProductScraper(None, db, **kwargs)
+
+
+def price_history_count(db) -> int:
+    return db.conn.execute("SELECT COUNT(*) FROM price_history").fetchone()[0]
+
+
+def test_first_run_records_every_price(sqlite_db):
+    scraper = new_scraper(sqlite_db, price_change_only=True)
+    stats = scraper._save_products([make_product("A1", 10000), make_product("A2", 20000)])
+    
+    assert stats == {"new_count": 2, "updated_count": 0, "changed_count": 2, "failed": False}
+    assert price_history_count(sqlite_db) == 2
+    assert len(scraper.summary_updates) == 2
+
+
+def test_unchanged_prices_only_touch_last_seen(sqlite_db):
+    new_scraper(sqlite_db, price_change_only=True)._save_products(
+        [make_product("A1", 10000), make_product("A2", 20000)]
+    )
+    
+    scraper = new_scraper(sqlite_db, price_change_only=True)
+    stats = scraper._save_products([make_product("A1", 10000), make_product("A2", 18000, 20000)])
+    
+    assert stats["updated_count"] == 2
+    assert stats["changed_count"] == 1
+    assert price_history_count(sqlite_db) == 3
+    # 변동 없는 상품도 이번 실행 가격(가격 분석용)에는 남음
+    assert len(scraper.run_prices) == 2
+    changed_id = scraper.existing_products["A2"]
+    assert list(scraper.summary_updates) == [changed_id]
+    assert scraper.last_prices[changed_id] == (18000, 20000, True)
+
+
+def test_sale_flag_change_is_recorded(sqlite_db):
+    new_scraper(sqlite_db, price_change_only=True)._save_products([make_product("A1", 10000)])
+    
+    # 가격이 같아도 할인 여부가 바뀌면 이력에 기록
+    product = {**make_product("A1", 10000), "is_on_sale": True}
+    stats = new_scraper(sqlite_db, price_change_only=True)._save_products([product])
+    
+    assert stats["changed_count"] == 1
+
+
+def test_same_price_twice_in_one_run_is_recorded_once(sqlite_db):
+    scraper = new_scraper(sqlite_db, price_change_only=True)
+    scraper._save_products([make_product("A1", 10000)])
+    stats = scraper._save_products([make_product("A1", 10000, category="메이크업")])
+    
+    assert stats["changed_count"] == 0
+    assert price_history_count(sqlite_db) == 1
+
+
+def test_disabled_records_every_price(sqlite_db):
+    new_scraper(sqlite_db, price_change_only=False)._save_products([make_product("A1", 10000)])
+    stats = new_scraper(sqlite_db, price_change_only=False)._save_products([make_product("A1", 10000)])
+    
+    assert stats["changed_count"] == 1
+    assert price_history_count(sqlite_db) == 2
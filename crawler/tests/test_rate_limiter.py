@@ -0,0 +1,95 @@
+"""
+올프 크롤러 - 적응형 요청 속도(AIMD) 테스트
+"""
+import asyncio
+
+import pytest
+
+from config import RATE_INCREASE_STEP, RATE_DECREASE_FACTOR, RATE_LATENCY_TARGET
+from rate_limiter import RateLimiter, is_timeout_error, error_status_code
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+class FakeStatusError(Exception):
+    """httpx.HTTPStatusError처럼 response를 가진 예외"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code)
+
+
+def test_success_increases_additively_up_to_max():
+    limiter = RateLimiter(max_per_second=1.0, min_per_second=0.1, initial_per_second=0.5)
+    limiter.record(0.2, status=200)
+    assert limiter.rate == pytest.approx(0.5 + RATE_INCREASE_STEP)
+    
+    for _ in range(100):
+        limiter.record(0.2, status=200)
+    assert limiter.rate == 1.0
+    
+    # 상한에 도달한 뒤에는 증가 횟수도 늘지 않음
+    increases = limiter.stats["increases"]
+    limiter.record(0.2, status=200)
+    assert limiter.stats["increases"] == increases
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"status": 429},
+    {"status": 403},
+    {"status": 503},
+    {"timeout": True},
+    {"latency": RATE_LATENCY_TARGET + 1},
+])
+def test_throttle_signals_decrease_multiplicatively(kwargs):
+    limiter = RateLimiter(max_per_second=1.0, min_per_second=0.1, initial_per_second=0.8)
+    latency = kwargs.pop("latency", 0.2)
+    limiter.record(latency, **kwargs)
+    
+    assert limiter.rate == pytest.approx(0.8 * RATE_DECREASE_FACTOR)
+    assert limiter.stats["decreases"] == 1
+
+
+def test_decrease_stops_at_min_rate():
+    limiter = RateLimiter(max_per_second=1.0, min_per_second=0.25, initial_per_second=1.0)
+    for _ in range(10):
+        limiter.record(0.2, status=429)
+    assert limiter.rate == 0.25
+
+
+def test_record_error_classifies_timeout_and_status():
+    assert is_timeout_error(asyncio.TimeoutError())
+    assert error_status_code(FakeStatusError(429)) == 429
+    assert error_status_code(ValueError("boom")) is None
+    
+    limiter = RateLimiter(max_per_second=1.0, min_per_second=0.1, initial_per_second=0.8)
+    limiter.record_error(FakeStatusError(429), 0.2)
+    assert limiter.rate == pytest.approx(0.8 * RATE_DECREASE_FACTOR)
+    
+    # 상태 코드도 타임아웃도 아닌 빠른 실패는 속도를 줄이지 않음
+    rate = limiter.rate
+    limiter.record_error(ValueError("boom"), 0.2)
+    assert limiter.rate > rate
+
+
+def test_non_adaptive_and_unlimited_keep_rate():
+    fixed = RateLimiter(max_per_second=1.0, min_per_second=0.1, initial_per_second=0.5, adaptive=False)
+    fixed.record(0.2, status=429)
+    assert fixed.rate == 0.5
+    
+    unlimited = RateLimiter(max_per_second=0)
+    unlimited.record(0.2, status=429)
+    asyncio.run(unlimited.wait())
+    assert unlimited.rate == 0.0
+    assert unlimited.stats["requests"] == 1
+
+
+def test_retry_delay_backs_off_from_current_rate():
+    limiter = RateLimiter(max_per_second=1.0, min_per_second=0.1, initial_per_second=1.0)
+    first = limiter.retry_delay(0)
+    second = limiter.retry_delay(1)
+    assert 1.0 <= first <= 1.5
+    assert 2.0 <= second <= 3.0
@@ -0,0 +1,79 @@
+"""
+올프 크롤러 - 샤딩 테스트 (CRC32 브랜드 담당 샤드, 카테고리 배정, 결과 병합)
+"""
+import zlib
+
+import pytest
+
+from shard import Shard, merge_results
+
+BRANDS = ["라운드랩", "토리든", "아누아", "닥터지", "마녀공장", "롬앤", "클리오", "Unknown"]
+
+
+def test_parse_and_validate():
+    shard = Shard.parse("2/4")
+    assert (shard.index, shard.count, shard.label) == (2, 4, "2/4")
+    assert shard.suffix == "_shard2of4"
+    assert Shard().suffix == "" and not Shard().enabled
+    for value in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+
+
+def test_each_brand_has_exactly_one_owner():
+    shards = [Shard(index, 3) for index in range(1, 4)]
+    for brand in BRANDS:
+        owners = [shard.index for shard in shards if shard.owns_brand(brand)]
+        assert owners == [zlib.crc32(brand.encode("utf-8")) % 3 + 1]
+
+
+def test_single_shard_owns_everything():
+    assert all(Shard().owns_brand(brand) for brand in BRANDS)
+
+
+def test_split_categories_round_robin_keeps_order():
+    categories = {f"카테고리{i}": str(i) for i in range(7)}
+    splits = [Shard(index, 3).split_categories(categories) for index in range(1, 4)]
+    
+    assert list(splits[0]) == ["카테고리0", "카테고리3", "카테고리6"]
+    assert list(splits[1]) == ["카테고리1", "카테고리4"]
+    assert sorted(name for split in splits for name in split) == sorted(categories)
+
+
+def shard_result(label, stats, sample_products, coupon_brands, changed=(), errors=(), duration=10.0):
+    return {
+        "shard": label,
+        "duration_seconds": duration,
+        "stats": stats,
+        "errors": list(errors),
+        "sample_products": sample_products,
+        "coupon_brands": list(coupon_brands),
+        "changed_brands": list(changed),
+    }
+
+
+def test_merge_sums_stats_and_finds_orphan_brands():
+    results = [
+        shard_result("1/2", {"new_products": 3, "total_coupons": 5},
+                     {"라운드랩": "A1", "토리든": "A2"}, ["라운드랩"],
+                     changed=["라운드랩"], errors=["페이지 오류"], duration=30.0),
+        shard_result("2/2", {"new_products": 4, "total_coupons": 2},
+                     {"토리든": "B9", "아누아": "B1", "롬앤": "B2"}, ["아누아"], duration=20.0),
+    ]
+    merged = merge_results(results)
+    
+    assert merged["shards"] == ["1/2", "2/2"]
+    assert merged["duration_seconds"] == 30.0
+    assert merged["stats"] == {"new_products": 7, "total_coupons": 7}
+    assert merged["errors"] == ["[1/2] 페이지 오류"]
+    assert merged["brands"] == 4
+    assert merged["coupon_brands"] == 2
+    assert merged["changed_brands"] == ["라운드랩"]
+    # 발견은 됐지만 담당 샤드가 한 번도 보지 못한 브랜드 (먼저 발견한 샘플 상품 유지)
+    assert merged["orphan_brands"] == {"토리든": "A2", "롬앤": "B2"}
+
+
+def test_merge_empty():
+    merged = merge_results([])
+    assert merged["duration_seconds"] == 0
+    assert merged["orphan_brands"] == {}
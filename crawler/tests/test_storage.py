@@ -0,0 +1,44 @@
+"""
+올프 크롤러 - SQLite 저장소 가격 이력 정리 테스트 (롤업 후 삭제, 상품별 마지막 행 유지)
+"""
+from datetime import date
+
+
+def add_rows(db, rows):
+    db.conn.executemany(
+        "INSERT INTO price_history (product_id, price, original_price, recorded_at) VALUES (?, ?, ?, ?)",
+        [(product_id, price, price, recorded_at) for product_id, price, recorded_at in rows]
+    )
+    db.conn.commit()
+
+
+def remaining(db):
+    return db.conn.execute(
+        "SELECT product_id, price, recorded_at FROM price_history ORDER BY product_id, id"
+    ).fetchall()
+
+
+def test_compact_keeps_latest_row_per_product(sqlite_db):
+    add_rows(sqlite_db, [
+        # 오래전에 바뀐 뒤 그대로인 상품: 마지막 행은 보존 기간이 지나도 남음
+        ("stable", 12000, "2026-01-01 09:00:00"),
+        ("stable", 10000, "2026-02-01 09:00:00"),
+        # 최근에도 바뀐 상품: 보존 기간 이전 행은 모두 정리
+        ("active", 5000, "2026-01-05 09:00:00"),
+        ("active", 4500, "2026-06-01 09:00:00"),
+    ])
+    
+    deleted = sqlite_db.compact_price_history(date(2026, 5, 1))
+    
+    assert deleted == 2
+    assert remaining(sqlite_db) == [
+        ("active", 4500, "2026-06-01 09:00:00"),
+        ("stable", 10000, "2026-02-01 09:00:00"),
+    ]
+    # 지운 기간은 일간 롤업으로 남음
+    days = sqlite_db.conn.execute("SELECT product_id, day, close_price FROM price_history_daily ORDER BY product_id, day").fetchall()
+    assert days == [
+        ("active", "2026-01-05", 5000),
+        ("stable", "2026-01-01", 12000),
+        ("stable", "2026-02-01", 10000),
+    ]
@@ -3,7 +3,7 @@
  * 상품, 가격, 쿠폰 데이터를 가져오는 함수들
  */
 import { supabase } from './supabase';
-import type { ProductWithPrice } from './types';
+import type { ProductWithPrice, PriceHistory, PriceSummary } from './types';
 import { CATEGORIES } from './types';
 
 // 카테고리 순서 맵 (전체 제외, 인덱스 0부터 시작)
@@ -30,15 +30,20 @@ const CATEGORY_ORDER: Record<string, number> = {
     '취미/팬시': 19,
 };
 
+// 상품 상세에서 보여주는 가격 이력 기간 (일)
+export const PRICE_HISTORY_DAYS = 30;
+
+// 가격 요약에서 읽는 컬럼 (현재가/최저가 + 크롤러가 미리 계산한 가격 분석 결과)
+// 가격 이력은 가격이 바뀔 때만 기록되고 오래된 행은 정리되므로, 목록의 가격은 모두 요약에서 읽음
+const PRICE_SUMMARY_COLUMNS = 'product_id, current_price, original_price, discount_rate, is_on_sale, lowest_price, is_all_time_low, is_fake_discount, avg_price_30d, analyzed_at';
+
 // Helper: DB 상품 데이터를 ProductWithPrice로 변환
-function transformProductData(products: any[], coupons: any[], lowestPrices: any[]): ProductWithPrice[] {
-    // 상품별 최저가 Map
-    const lowestPriceMap: Record<string, number> = {};
-    if (lowestPrices) {
-        for (const record of lowestPrices) {
-            if (!lowestPriceMap[record.product_id] || record.price < lowestPriceMap[record.product_id]) {
-                lowestPriceMap[record.product_id] = record.price;
-            }
+function transformProductData(products: any[], coupons: any[], priceSummaries: any[]): ProductWithPrice[] {
+    // 상품별 가격 요약 Map
+    const summaryMap: Record<string, any> = {};
+    if (priceSummaries) {
+        for (const record of priceSummaries) {
+            summaryMap[record.product_id] = record;
         }
     }
 
@@ -53,11 +58,12 @@ function transformProductData(products: any[], coupons: any[], lowestPrices: any
     }
 
     return products.map((product) => {
-        const priceHistory = product.price_history as any[];
-        const latestPrice = priceHistory?.[0];
-        const currentPrice = latestPrice?.price || 0;
-        const originalPrice = latestPrice?.original_price || currentPrice;
-        const lowestPrice = lowestPriceMap[product.id] || currentPrice;
+        const priceHistory = product.price_history as any[] | undefined;
+        const summary = summaryMap[product.id];
+        const currentPrice = summary?.current_price || 0;
+        const originalPrice = summary?.original_price || currentPrice;
+        const lowestPrice = summary?.lowest_price || currentPrice;
+        const analytics = summary?.analyzed_at ? summary : undefined;
         const coupon = couponMap[product.brand];
 
         let couponPrice: number | undefined;
@@ -90,10 +96,13 @@ function transformProductData(products: any[], coupons: any[], lowestPrices: any
             updated_at: product.updated_at,
             current_price: currentPrice,
             original_price: originalPrice,
-            discount_rate: latestPrice?.discount_rate || 0,
-            is_on_sale: latestPrice?.is_on_sale || false,
+            discount_rate: summary?.discount_rate || 0,
+            is_on_sale: summary?.is_on_sale || false,
             lowest_price: lowestPrice,
-            is_lowest: currentPrice <= lowestPrice,
+            // 크롤러가 분석을 마친 상품은 미리 계산한 값을 그대로 사용
+            is_lowest: analytics ? analytics.is_all_time_low : currentPrice <= lowestPrice,
+            is_fake_discount: analytics?.is_fake_discount || false,
+            avg_price_30d: analytics?.avg_price_30d,
             price_change: originalPrice - currentPrice,
             has_coupon: !!coupon && !!couponPrice,
             coupon_price: couponPrice,
@@ -142,16 +151,7 @@ export async function getProductsPaginated(
     // 특정 카테고리: 직접 쿼리
     const { data: products, error, count } = await supabase
         .from('products')
-        .select(`
-            *,
-            price_history (
-                price,
-                original_price,
-                discount_rate,
-                is_on_sale,
-                recorded_at
-            )
-        `, { count: 'exact' })
+        .select('*', { count: 'exact' })
         .eq('category', category)
         .order('updated_at', { ascending: false })
         .range(offset, offset + limit - 1);
@@ -163,16 +163,16 @@ export async function getProductsPaginated(
 
     const total = count || 0;
 
-    // 쿠폰 & 최저가 정보 가져오기
+    // 쿠폰 & 가격 요약 가져오기
     const brands = [...new Set(products.map((p: any) => p.brand))];
     const productIds = products.map((p: any) => p.id);
 
-    const [couponsResult, lowestPricesResult] = await Promise.all([
+    const [couponsResult, priceSummariesResult] = await Promise.all([
         supabase.from('coupons').select('*').in('brand', brands).eq('is_active', true),
-        supabase.from('price_history').select('product_id, price').in('product_id', productIds)
+        supabase.from('product_price_summary').select(PRICE_SUMMARY_COLUMNS).in('product_id', productIds)
     ]);
 
-    const result = transformProductData(products, couponsResult.data || [], lowestPricesResult.data || []);
+    const result = transformProductData(products, couponsResult.data || [], priceSummariesResult.data || []);
 
     return {
         products: result,
@@ -240,16 +240,7 @@ async function getAllCategoriesProducts(offset: number, limit: number): Promise<
 
         const { data: products } = await supabase
             .from('products')
-            .select(`
-                *,
-                price_history (
-                    price,
-                    original_price,
-                    discount_rate,
-                    is_on_sale,
-                    recorded_at
-                )
-            `)
+            .select('*')
             .eq('category', catName)
             .order('updated_at', { ascending: false })
             .range(catOffset, catOffset + remaining - 1);
@@ -267,12 +258,12 @@ async function getAllCategoriesProducts(offset: number, limit: number): Promise<
     const brands = [...new Set(collected.map((p: any) => p.brand))];
     const productIds = collected.map((p: any) => p.id);
 
-    const [couponsResult, lowestPricesResult] = await Promise.all([
+    const [couponsResult, priceSummariesResult] = await Promise.all([
         supabase.from('coupons').select('*').in('brand', brands).eq('is_active', true),
-        supabase.from('price_history').select('product_id, price').in('product_id', productIds)
+        supabase.from('product_price_summary').select(PRICE_SUMMARY_COLUMNS).in('product_id', productIds)
     ]);
 
-    const result = transformProductData(collected, couponsResult.data || [], lowestPricesResult.data || []);
+    const result = transformProductData(collected, couponsResult.data || [], priceSummariesResult.data || []);
 
     return {
         products: result,
@@ -293,7 +284,7 @@ export async function getOrderedProductIds(category: string): Promise<string[]>
 export async function getProductsByIds(ids: string[]): Promise<ProductWithPrice[]> {
     if (ids.length === 0) return [];
 
-    // 1. 상품 정보 + 최신 가격
+    // 1. 상품 정보 + 가격 이력 (찜 목록 가격 그래프용, 가격은 요약에서 읽음)
     const { data: products, error } = await supabase
         .from('products')
         .select(`
@@ -321,14 +312,14 @@ export async function getProductsByIds(ids: string[]): Promise<ProductWithPrice[
         .in('brand', brands)
         .eq('is_active', true);
 
-    // 3. 최저가 정보
-    const { data: lowestPrices } = await supabase
-        .from('price_history')
-        .select('product_id, price')
+    // 3. 현재가/최저가 (가격 요약)
+    const { data: priceSummaries } = await supabase
+        .from('product_price_summary')
+        .select(PRICE_SUMMARY_COLUMNS)
         .in('product_id', ids);
 
     // 4. 변환
-    const result = transformProductData(products, coupons || [], lowestPrices || []);
+    const result = transformProductData(products, coupons || [], priceSummaries || []);
 
     // 5. ID 순서대로 정렬 (SQL IN 쿼리는 순서 보장 안 함)
     const resultMap = new Map(result.map(p => [p.id, p]));
@@ -345,16 +336,7 @@ export async function getProducts(category?: string, limit: number = 20): Promis
 
     let query = supabase
         .from('products')
-        .select(`
-      *,
-      price_history (
-        price,
-        original_price,
-        discount_rate,
-        is_on_sale,
-        recorded_at
-      )
-    `)
+        .select('*')
         .order('updated_at', { ascending: false })
         .limit(limit);
 
@@ -372,9 +354,9 @@ export async function getProducts(category?: string, limit: number = 20): Promis
     const { data: coupons } = await supabase.from('coupons').select('*').in('brand', brands).eq('is_active', true);
 
     const productIds = products.map((p: any) => p.id);
-    const { data: lowestPrices } = await supabase.from('price_history').select('product_id, price').in('product_id', productIds);
+    const { data: priceSummaries } = await supabase.from('product_price_summary').select(PRICE_SUMMARY_COLUMNS).in('product_id', productIds);
 
-    const result = transformProductData(products, coupons || [], lowestPrices || []);
+    const result = transformProductData(products, coupons || [], priceSummaries || []);
 
     // 카테고리 정렬 (전체일 때)
     if (!category || category === '전체') {
@@ -404,28 +386,31 @@ export async function getProductById(id: string) {
         return null;
     }
 
-    // 가격 히스토리 (최근 30일)
-    const thirtyDaysAgo = new Date();
-    thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
-
-    const { data: priceHistory } = await supabase
-        .from('price_history')
-        .select('*')
-        .eq('product_id', id)
-        .gte('recorded_at', thirtyDaysAgo.toISOString())
-        .order('recorded_at', { ascending: true });
+    // 가격 히스토리 (최근 30일) + 현재 가격 요약 + 브랜드 쿠폰
+    // 가격은 바뀔 때만 기록하므로 get_price_history가 기간 이전 마지막 가격을 첫 행(기간 시작 시각)으로 함께 돌려줌
+    const [historyResult, summaryResult, couponsResult] = await Promise.all([
+        supabase.rpc('get_price_history', { p_product_id: id, p_days: PRICE_HISTORY_DAYS } as any),
+        supabase
+            .from('product_price_summary')
+            .select('current_price, original_price, discount_rate, is_on_sale, lowest_price')
+            .eq('product_id', id)
+            .maybeSingle(),
+        supabase
+            .from('coupons')
+            .select('*')
+            .eq('brand', (product as any).brand)
+            .eq('is_active', true)
+    ]);
 
-    // 브랜드 쿠폰
-    const { data: coupons } = await supabase
-        .from('coupons')
-        .select('*')
-        .eq('brand', (product as any).brand)
-        .eq('is_active', true);
+    if (historyResult.error) {
+        console.error('가격 이력 조회 오류:', historyResult.error);
+    }
 
     return {
         product,
-        priceHistory: priceHistory || [],
-        coupons: coupons || [],
+        priceHistory: (historyResult.data || []) as PriceHistory[],
+        priceSummary: summaryResult.data as PriceSummary | null,
+        coupons: couponsResult.data || [],
     };
 }
 
@@ -440,16 +425,7 @@ export async function searchProducts(query: string, limit: number = 20): Promise
 
     let dbQuery = supabase
         .from('products')
-        .select(`
-      *,
-      price_history (
-        price,
-        original_price,
-        discount_rate,
-        is_on_sale,
-        recorded_at
-      )
-    `)
+        .select('*')
         .order('updated_at', { ascending: false })
         .limit(limit);
 
@@ -475,29 +451,14 @@ export async function searchProducts(query: string, limit: number = 20): Promise
         return [];
     }
 
-    // getProducts와 동일한 변환 로직 적용
-    return products.map((product: any) => {
-        const priceHistory = product.price_history as any[];
-        const latestPrice = priceHistory?.[0];
+    // getProducts와 동일한 변환 로직 적용 (가격은 요약에서, 검색 결과에는 쿠폰을 붙이지 않음)
+    const productIds = products.map((p: any) => p.id);
+    const { data: priceSummaries } = await supabase
+        .from('product_price_summary')
+        .select(PRICE_SUMMARY_COLUMNS)
+        .in('product_id', productIds);
 
-        return {
-            id: product.id,
-            oliveyoung_id: product.oliveyoung_id,
-            name: product.name,
-            brand: product.brand,
-            category: product.category,
-            image_url: product.image_url,
-            product_url: product.product_url,
-            created_at: product.created_at,
-            updated_at: product.updated_at,
-            current_price: latestPrice?.price || 0,
-            original_price: latestPrice?.original_price || 0,
-            discount_rate: latestPrice?.discount_rate || 0,
-            is_on_sale: latestPrice?.is_on_sale || false,
-            lowest_price: latestPrice?.price || 0,
-            is_lowest: false,
-        } as ProductWithPrice;
-    });
+    return transformProductData(products, [], priceSummaries || []);
 }
 
 /**
@@ -50,6 +50,15 @@ export interface PriceHistory {
     recorded_at: string;
 }
 
+// 상품별 가격 요약 (크롤러가 매 실행 끝에 갱신, 상품당 1행)
+export interface PriceSummary {
+    current_price: number;
+    original_price: number;
+    discount_rate: number;
+    is_on_sale: boolean;
+    lowest_price: number;
+}
+
 // 브랜드 쿠폰 정보
 export interface Coupon {
     id: string;
@@ -83,6 +92,8 @@ export interface ProductWithPrice extends Product {
     lowest_price: number;
     is_lowest: boolean;
     price_change?: number;
+    is_fake_discount?: boolean; // 정가 인상 후 세일 등 실제로는 싸지 않은 할인 (크롤러 분석)
+    avg_price_30d?: number; // 30일 평균가 (크롤러 분석)
     // 쿠폰 관련 정보
     coupon_price?: number; // 쿠폰 적용가
     coupon_discount?: number; // 쿠폰 할인금액
@@ -1,4 +1,6 @@
-import type { Coupon } from './types';
+import type { Coupon, PriceHistory } from './types';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
 
 /**
  * 쿠폰 적용가 계산
@@ -41,6 +43,32 @@ export function formatPrice(price: number): string {
     return price.toLocaleString('ko-KR');
 }
 
+/**
+ * 가격 이력을 최근 N일의 일별 종가로 채우기
+ * 가격은 바뀔 때만 기록되므로 기록이 없는 날은 직전 가격을 이어 씀 (평균/최저가가 기록 횟수가 아닌 기간 기준이 되도록)
+ * history는 recorded_at 오름차순, 첫 기록 이전 날짜는 결과에서 빠짐
+ */
+export function fillDailyPrices(history: PriceHistory[], days: number, now: Date = new Date()): number[] {
+    const start = new Date(now);
+    start.setHours(0, 0, 0, 0);
+    start.setDate(start.getDate() - (days - 1));
+
+    const prices: number[] = [];
+    let index = 0;
+    let price: number | undefined;
+    for (let day = 0; day < days; day++) {
+        const dayEnd = start.getTime() + (day + 1) * DAY_MS;
+        while (index < history.length && new Date(history[index].recorded_at).getTime() < dayEnd) {
+            price = history[index].price;
+            index++;
+        }
+        if (price !== undefined) {
+            prices.push(price);
+        }
+    }
+    return prices;
+}
+
 /**
  * 만료일까지 남은 일수 계산
  */
@@ -13,20 +13,124 @@ CREATE TABLE IF NOT EXISTS products (
   image_url TEXT,
   product_url TEXT NOT NULL,
   created_at TIMESTAMPTZ DEFAULT NOW(),
-  updated_at TIMESTAMPTZ DEFAULT NOW()
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
+  last_seen_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- 2. price_history 테이블 (가격 이력)
+-- 기존 DB 마이그레이션: 크롤러가 마지막으로 확인한 시각
+ALTER TABLE products ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMPTZ DEFAULT NOW();
+
+-- 2. price_history 테이블 (가격 이력, recorded_at 기준 월별 파티션)
+-- 기존 DB 마이그레이션: 파티션 없는 테이블은 이름을 바꿔 두었다가 새 테이블로 옮겨 담음
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'price_history' AND relkind = 'r') THEN
+    ALTER TABLE price_history RENAME TO price_history_unpartitioned;
+    ALTER INDEX IF EXISTS price_history_pkey RENAME TO price_history_unpartitioned_pkey;
+    DROP INDEX IF EXISTS idx_price_history_product_id;
+    DROP INDEX IF EXISTS idx_price_history_recorded_at;
+    DROP INDEX IF EXISTS idx_price_history_product_recorded;
+  END IF;
+END $$;
+
 CREATE TABLE IF NOT EXISTS price_history (
-  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  id UUID NOT NULL DEFAULT gen_random_uuid(),
   product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
   price INTEGER NOT NULL,
   original_price INTEGER NOT NULL,
   discount_rate INTEGER DEFAULT 0,
   is_on_sale BOOLEAN DEFAULT FALSE,
-  recorded_at TIMESTAMPTZ DEFAULT NOW()
+  recorded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (id, recorded_at)
+) PARTITION BY RANGE (recorded_at);
+
+-- 월 파티션이 없는 시점의 행을 받는 기본 파티션 (정상 운영 시에는 비어 있음)
+CREATE TABLE IF NOT EXISTS price_history_default PARTITION OF price_history DEFAULT;
+
+-- 월 파티션 생성: p_from이 속한 달부터 이번 달 + p_months_ahead까지 (크롤러가 매 실행 시작 시 호출)
+-- 기본 파티션에 해당 기간 행이 쌓인 뒤에는 파티션을 만들 수 없으므로 미리 만들어 둠
+CREATE OR REPLACE FUNCTION ensure_price_history_partitions(p_from DATE DEFAULT CURRENT_DATE, p_months_ahead INTEGER DEFAULT 2)
+RETURNS INTEGER AS $$
+DECLARE
+  v_month DATE := date_trunc('month', p_from)::DATE;
+  v_last DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead))::DATE;
+  v_name TEXT;
+  v_created INTEGER := 0;
+BEGIN
+  WHILE v_month <= v_last LOOP
+    v_name := 'price_history_p' || to_char(v_month, 'YYYYMM');
+    IF to_regclass(v_name) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF price_history FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_month, (v_month + INTERVAL '1 month')::DATE
+      );
+      v_created := v_created + 1;
+    END IF;
+    v_month := (v_month + INTERVAL '1 month')::DATE;
+  END LOOP;
+  RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 DB 마이그레이션: 필요한 월 파티션을 만들고 이전 테이블의 행을 옮긴 뒤 삭제
+DO $$
+DECLARE
+  v_from DATE := CURRENT_DATE;
+BEGIN
+  IF to_regclass('price_history_unpartitioned') IS NOT NULL THEN
+    SELECT COALESCE(MIN(recorded_at)::DATE, CURRENT_DATE) INTO v_from FROM price_history_unpartitioned;
+    PERFORM ensure_price_history_partitions(v_from);
+    INSERT INTO price_history (id, product_id, price, original_price, discount_rate, is_on_sale, recorded_at)
+    SELECT id, product_id, price, original_price, discount_rate, is_on_sale, COALESCE(recorded_at, NOW())
+    FROM price_history_unpartitioned;
+    DROP TABLE price_history_unpartitioned;
+  ELSE
+    PERFORM ensure_price_history_partitions();
+  END IF;
+END $$;
+
+-- 2-1. price_history_daily 테이블 (상품별 일간 롤업: 최저/최고/종가)
+-- 보존 기간이 지난 원본 행은 롤업만 남기고 삭제 (compact_price_history)
+CREATE TABLE IF NOT EXISTS price_history_daily (
+  product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+  day DATE NOT NULL,
+  min_price INTEGER NOT NULL,
+  max_price INTEGER NOT NULL,
+  close_price INTEGER NOT NULL,          -- 그날 마지막 기록 가격
+  close_original_price INTEGER NOT NULL,
+  close_discount_rate INTEGER DEFAULT 0,
+  close_is_on_sale BOOLEAN DEFAULT FALSE,
+  samples INTEGER NOT NULL,              -- 롤업한 원본 행 수
+  PRIMARY KEY (product_id, day)
 );
 
+-- 2-2. product_price_summary 테이블 (상품별 가격 요약, 크롤러가 매 실행 끝에 일괄 갱신)
+-- 홈 화면 쿼리가 price_history 전체를 훑지 않도록 상품당 1행으로 유지
+CREATE TABLE IF NOT EXISTS product_price_summary (
+  product_id UUID PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+  current_price INTEGER NOT NULL,
+  original_price INTEGER NOT NULL,
+  discount_rate INTEGER DEFAULT 0,
+  is_on_sale BOOLEAN DEFAULT FALSE,
+  previous_price INTEGER,               -- 마지막 가격 변동 직전 가격
+  lowest_price INTEGER NOT NULL,        -- 역대 최저가
+  highest_price INTEGER NOT NULL,       -- 역대 최고가
+  price_drop INTEGER DEFAULT 0,         -- previous_price - current_price (하락이면 양수)
+  last_changed_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 가격 분석 결과 (크롤러 analytics.py가 매 실행 끝에 계산해 일괄 반영, 프론트엔드는 읽기만 함)
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS avg_price_7d INTEGER;        -- 7일 이동평균 (일별 종가)
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS avg_price_30d INTEGER;       -- 30일 이동평균
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS high_price_30d INTEGER;      -- 30일 최고가
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS drop_from_high INTEGER;      -- 30일 최고가 - 현재가
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS drop_from_high_pct NUMERIC(5, 2);
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS volatility_30d NUMERIC(8, 4); -- 30일 종가 표준편차 / 평균
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS is_all_time_low BOOLEAN DEFAULT FALSE;
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS is_fake_discount BOOLEAN DEFAULT FALSE; -- 정가 인상 후 세일 / 평소 가격과 같은 세일가
+ALTER TABLE product_price_summary ADD COLUMN IF NOT EXISTS analyzed_at TIMESTAMPTZ;
+
 -- 3. coupons 테이블 (브랜드별 쿠폰 정보) - 신규 추가
 CREATE TABLE IF NOT EXISTS coupons (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -51,6 +155,10 @@ CREATE TABLE IF NOT EXISTS price_alerts (
   created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- 기존 DB 마이그레이션: 알림 발동 기록 (크롤러 alerts.py가 발동 시 is_active를 끄고 채움)
+ALTER TABLE price_alerts ADD COLUMN IF NOT EXISTS triggered_at TIMESTAMPTZ;
+ALTER TABLE price_alerts ADD COLUMN IF NOT EXISTS triggered_price INTEGER;
+
 -- 5. wishlist 테이블 (찜 목록 - 로그인 사용자용)
 CREATE TABLE IF NOT EXISTS wishlist (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -70,6 +178,24 @@ CREATE TABLE IF NOT EXISTS push_subscriptions (
   created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- 6-1. notifications 테이블 (발송 대기 알림, 크롤러가 쌓고 발송 작업이 처리)
+CREATE TABLE IF NOT EXISTS notifications (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  kind TEXT NOT NULL CHECK (kind IN ('price_alert', 'price_drop', 'coupon')),
+  user_email TEXT,
+  user_id UUID,
+  product_id UUID REFERENCES products(id) ON DELETE CASCADE,
+  alert_id UUID REFERENCES price_alerts(id) ON DELETE SET NULL,
+  title TEXT NOT NULL,
+  body TEXT NOT NULL,
+  url TEXT,
+  status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+  attempts INTEGER DEFAULT 0,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  claimed_at TIMESTAMPTZ,               -- 발송 작업이 마지막으로 가져간 시각
+  sent_at TIMESTAMPTZ
+);
+
 -- 7. search_logs 테이블 (검색 기록)
 CREATE TABLE IF NOT EXISTS search_logs (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -98,15 +224,36 @@ CREATE INDEX IF NOT EXISTS idx_products_category ON products(category);
 CREATE INDEX IF NOT EXISTS idx_products_brand ON products(brand);
 
 CREATE INDEX IF NOT EXISTS idx_price_history_product_id ON price_history(product_id);
-CREATE INDEX IF NOT EXISTS idx_price_history_recorded_at ON price_history(recorded_at);
+-- recorded_at은 입력 순서대로 증가하므로 B-tree 대신 작은 BRIN 인덱스로 기간 조회
+DROP INDEX IF EXISTS idx_price_history_recorded_at;
+CREATE INDEX IF NOT EXISTS idx_price_history_recorded_brin ON price_history USING BRIN (recorded_at);
 CREATE INDEX IF NOT EXISTS idx_price_history_product_recorded ON price_history(product_id, recorded_at DESC);
+CREATE INDEX IF NOT EXISTS idx_price_history_daily_day ON price_history_daily USING BRIN (day);
+
+-- 오늘 역대 최저가 / 최근 가격 하락 목록용 부분 인덱스
+CREATE INDEX IF NOT EXISTS idx_price_summary_at_lowest ON product_price_summary(discount_rate DESC)
+  WHERE current_price <= lowest_price;
+CREATE INDEX IF NOT EXISTS idx_price_summary_dropped ON product_price_summary(price_drop DESC, last_changed_at)
+  WHERE price_drop > 0;
 
 CREATE INDEX IF NOT EXISTS idx_coupons_brand ON coupons(brand);
 CREATE INDEX IF NOT EXISTS idx_coupons_is_active ON coupons(is_active);
 CREATE INDEX IF NOT EXISTS idx_coupons_expires_at ON coupons(expires_at);
+-- 크롤러 일괄 upsert의 충돌 대상 (brand, coupon_name)
+-- 기존 DB 마이그레이션: 같은 (brand, coupon_name) 중 가장 최근 기록만 남겨야 유니크 인덱스를 만들 수 있음
+DELETE FROM coupons old
+  USING coupons newer
+  WHERE old.brand = newer.brand
+    AND old.coupon_name = newer.coupon_name
+    AND (COALESCE(old.recorded_at, '-infinity'), old.id) < (COALESCE(newer.recorded_at, '-infinity'), newer.id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_coupons_brand_coupon_name ON coupons(brand, coupon_name);
 
 CREATE INDEX IF NOT EXISTS idx_price_alerts_product_id ON price_alerts(product_id);
 CREATE INDEX IF NOT EXISTS idx_price_alerts_email ON price_alerts(user_email);
+-- 크롤러가 가격이 바뀐 상품의 활성 알림만 목표가 내림차순으로 읽음
+CREATE INDEX IF NOT EXISTS idx_price_alerts_active_product ON price_alerts(product_id, target_price DESC)
+  WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_notifications_pending ON notifications(created_at) WHERE status = 'pending';
 
 CREATE INDEX IF NOT EXISTS idx_wishlist_user_id ON wishlist(user_id);
 CREATE INDEX IF NOT EXISTS idx_wishlist_product_id ON wishlist(product_id);
@@ -136,9 +283,9 @@ CREATE OR REPLACE FUNCTION get_lowest_price(p_product_id UUID)
 RETURNS INTEGER AS $$
 BEGIN
   RETURN (
-    SELECT MIN(price)
-    FROM price_history
-    WHERE product_id = p_product_id
+    SELECT s.lowest_price
+    FROM product_price_summary s
+    WHERE s.product_id = p_product_id
   );
 END;
 $$ LANGUAGE plpgsql;
@@ -147,7 +294,13 @@ $$ LANGUAGE plpgsql;
 -- 함수: 특정 상품의 최근 N일 가격 이력 조회
 -- ========================================
 
-CREATE OR REPLACE FUNCTION get_price_history(p_product_id UUID, p_days INTEGER DEFAULT 30)
+-- 기존 2개 인자 버전과 호출이 모호해지지 않도록 먼저 삭제
+DROP FUNCTION IF EXISTS get_price_history(UUID, INTEGER);
+
+-- p_days가 p_raw_days(원본 보존 기간) 이하면 원본 행, 그보다 길면 일간 롤업(종가) + 롤업 이후 원본 행
+-- 가격은 바뀔 때만 기록하므로 첫 행은 기간 이전 마지막 가격(원본/롤업 중 최신)을 기간 시작 시각으로 돌려줌
+-- (기간 안에 변동이 없던 상품도 현재 가격을 알 수 있고, 받는 쪽에서 일 단위로 이어 채울 수 있도록)
+CREATE OR REPLACE FUNCTION get_price_history(p_product_id UUID, p_days INTEGER DEFAULT 30, p_raw_days INTEGER DEFAULT 90)
 RETURNS TABLE (
   price INTEGER,
   original_price INTEGER,
@@ -155,16 +308,277 @@ RETURNS TABLE (
   is_on_sale BOOLEAN,
   recorded_at TIMESTAMPTZ
 ) AS $$
+DECLARE
+  v_since TIMESTAMPTZ := NOW() - (p_days || ' days')::INTERVAL;
+  v_rolled_until DATE;
 BEGIN
   RETURN QUERY
-  SELECT ph.price, ph.original_price, ph.discount_rate, ph.is_on_sale, ph.recorded_at
-  FROM price_history ph
-  WHERE ph.product_id = p_product_id
-    AND ph.recorded_at >= NOW() - (p_days || ' days')::INTERVAL
-  ORDER BY ph.recorded_at ASC;
+  SELECT x.price, x.original_price, x.discount_rate, x.is_on_sale, v_since
+  FROM (
+    (SELECT ph.price, ph.original_price, ph.discount_rate, ph.is_on_sale, ph.recorded_at
+     FROM price_history ph
+     WHERE ph.product_id = p_product_id
+       AND ph.recorded_at < v_since
+     ORDER BY ph.recorded_at DESC
+     LIMIT 1)
+    UNION ALL
+    (SELECT d.close_price, d.close_original_price, d.close_discount_rate, d.close_is_on_sale, d.day::TIMESTAMPTZ
+     FROM price_history_daily d
+     WHERE d.product_id = p_product_id
+       AND d.day < v_since::DATE
+     ORDER BY d.day DESC
+     LIMIT 1)
+  ) x
+  ORDER BY x.recorded_at DESC
+  LIMIT 1;
+  
+  IF p_days <= p_raw_days THEN
+    RETURN QUERY
+    SELECT ph.price, ph.original_price, ph.discount_rate, ph.is_on_sale, ph.recorded_at
+    FROM price_history ph
+    WHERE ph.product_id = p_product_id
+      AND ph.recorded_at >= v_since
+    ORDER BY ph.recorded_at ASC;
+    RETURN;
+  END IF;
+  
+  SELECT MAX(d.day) INTO v_rolled_until
+  FROM price_history_daily d
+  WHERE d.product_id = p_product_id;
+  
+  RETURN QUERY
+  SELECT x.price, x.original_price, x.discount_rate, x.is_on_sale, x.recorded_at
+  FROM (
+    SELECT d.close_price AS price, d.close_original_price AS original_price,
+           d.close_discount_rate AS discount_rate, d.close_is_on_sale AS is_on_sale,
+           d.day::TIMESTAMPTZ AS recorded_at
+    FROM price_history_daily d
+    WHERE d.product_id = p_product_id
+      AND d.day >= v_since::DATE
+    UNION ALL
+    SELECT ph.price, ph.original_price, ph.discount_rate, ph.is_on_sale, ph.recorded_at
+    FROM price_history ph
+    WHERE ph.product_id = p_product_id
+      AND ph.recorded_at >= GREATEST(v_since, COALESCE((v_rolled_until + 1)::TIMESTAMPTZ, v_since))
+  ) x
+  ORDER BY x.recorded_at ASC;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- 함수: 가격 이력 일간 롤업 (p_from ~ p_to 전날, p_from이 NULL이면 처음부터)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION rollup_price_history(p_from DATE DEFAULT NULL, p_to DATE DEFAULT CURRENT_DATE)
+RETURNS INTEGER AS $$
+DECLARE
+  v_count INTEGER;
+BEGIN
+  INSERT INTO price_history_daily AS d (
+    product_id, day, min_price, max_price,
+    close_price, close_original_price, close_discount_rate, close_is_on_sale, samples
+  )
+  SELECT
+    b.product_id, b.day, b.min_price, b.max_price,
+    c.price, c.original_price, c.discount_rate, c.is_on_sale, b.samples
+  FROM (
+    SELECT ph.product_id, ph.recorded_at::DATE AS day,
+           MIN(ph.price) AS min_price, MAX(ph.price) AS max_price, COUNT(*)::INTEGER AS samples
+    FROM price_history ph
+    WHERE (p_from IS NULL OR ph.recorded_at >= p_from)
+      AND ph.recorded_at < p_to
+    GROUP BY ph.product_id, ph.recorded_at::DATE
+  ) b
+  JOIN LATERAL (
+    SELECT ph.price, ph.original_price, ph.discount_rate, ph.is_on_sale
+    FROM price_history ph
+    WHERE ph.product_id = b.product_id
+      AND ph.recorded_at >= b.day
+      AND ph.recorded_at < b.day + 1
+    ORDER BY ph.recorded_at DESC
+    LIMIT 1
+  ) c ON TRUE
+  ON CONFLICT (product_id, day) DO UPDATE SET
+    min_price = EXCLUDED.min_price,
+    max_price = EXCLUDED.max_price,
+    close_price = EXCLUDED.close_price,
+    close_original_price = EXCLUDED.close_original_price,
+    close_discount_rate = EXCLUDED.close_discount_rate,
+    close_is_on_sale = EXCLUDED.close_is_on_sale,
+    samples = EXCLUDED.samples;
+  
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- 함수: 보존 기간이 지난 원본 가격 이력 정리 (p_before 이전은 롤업만 남김)
+-- 가격은 바뀔 때만 기록하므로 상품별 마지막 원본 행은 오래됐어도 남김 (지우면 현재 가격 기록이 사라짐)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION compact_price_history(p_before DATE)
+RETURNS BIGINT AS $$
+DECLARE
+  v_part RECORD;
+  v_count BIGINT;
+  v_has_latest BOOLEAN;
+  v_deleted BIGINT := 0;
+BEGIN
+  -- 지우기 전에 해당 기간 롤업 보장
+  PERFORM rollup_price_history(NULL, p_before);
+  
+  -- 기간 전체가 지난 월 파티션은 DELETE 대신 통째로 삭제 (상품별 마지막 행이 있는 파티션은 아래 DELETE로 정리)
+  FOR v_part IN
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'price_history'::REGCLASS
+      AND c.relname ~ '^price_history_p[0-9]{6}$'
+  LOOP
+    IF (to_date(substring(v_part.relname FROM 16), 'YYYYMM') + INTERVAL '1 month')::DATE <= p_before THEN
+      EXECUTE format(
+        'SELECT EXISTS (SELECT 1 FROM %I p WHERE NOT EXISTS ('
+        '  SELECT 1 FROM price_history newer'
+        '  WHERE newer.product_id = p.product_id AND newer.recorded_at > p.recorded_at))',
+        v_part.relname
+      ) INTO v_has_latest;
+      CONTINUE WHEN v_has_latest;
+      EXECUTE format('SELECT COUNT(*) FROM %I', v_part.relname) INTO v_count;
+      EXECUTE format('DROP TABLE %I', v_part.relname);
+      v_deleted := v_deleted + v_count;
+    END IF;
+  END LOOP;
+  
+  -- 경계에 걸친 파티션(과 기본 파티션, 남긴 파티션)의 나머지 행 (더 최근 행이 있는 행만)
+  DELETE FROM price_history ph
+  WHERE ph.recorded_at < p_before
+    AND EXISTS (
+      SELECT 1 FROM price_history newer
+      WHERE newer.product_id = ph.product_id
+        AND newer.recorded_at > ph.recorded_at
+    );
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_deleted + v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- 함수: 상품별 최신 가격 조회 (크롤러 변경 감지용, product_id 기준 키셋 페이지네이션)
+-- 원본 이력은 정리(compact)될 수 있으므로 가격 요약에서 읽음
+-- ========================================
+
+CREATE OR REPLACE FUNCTION get_latest_prices(p_after UUID DEFAULT NULL, p_limit INTEGER DEFAULT 1000)
+RETURNS TABLE (
+  product_id UUID,
+  price INTEGER,
+  original_price INTEGER,
+  is_on_sale BOOLEAN
+) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT s.product_id, s.current_price, s.original_price, s.is_on_sale
+  FROM product_price_summary s
+  WHERE p_after IS NULL OR s.product_id > p_after
+  ORDER BY s.product_id
+  LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
 
+-- ========================================
+-- 함수: 가격 요약 일괄 갱신 (크롤러가 실행 끝에 이번에 기록한 가격으로 호출)
+-- p_rows: [{"product_id", "price", "original_price", "discount_rate", "is_on_sale"}, ...]
+-- ========================================
+
+CREATE OR REPLACE FUNCTION apply_price_summary(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+  v_count INTEGER;
+BEGIN
+  INSERT INTO product_price_summary AS s (
+    product_id, current_price, original_price, discount_rate, is_on_sale,
+    previous_price, lowest_price, highest_price, price_drop, last_changed_at, updated_at
+  )
+  SELECT
+    r.product_id, r.price, r.original_price, COALESCE(r.discount_rate, 0), COALESCE(r.is_on_sale, FALSE),
+    NULL, r.price, r.price, 0, NOW(), NOW()
+  FROM jsonb_to_recordset(p_rows) AS r(
+    product_id UUID, price INTEGER, original_price INTEGER, discount_rate INTEGER, is_on_sale BOOLEAN
+  )
+  ON CONFLICT (product_id) DO UPDATE SET
+    previous_price = CASE WHEN EXCLUDED.current_price <> s.current_price THEN s.current_price ELSE s.previous_price END,
+    price_drop = CASE WHEN EXCLUDED.current_price <> s.current_price THEN s.current_price - EXCLUDED.current_price ELSE s.price_drop END,
+    last_changed_at = CASE WHEN EXCLUDED.current_price <> s.current_price THEN NOW() ELSE s.last_changed_at END,
+    current_price = EXCLUDED.current_price,
+    original_price = EXCLUDED.original_price,
+    discount_rate = EXCLUDED.discount_rate,
+    is_on_sale = EXCLUDED.is_on_sale,
+    lowest_price = LEAST(s.lowest_price, EXCLUDED.current_price),
+    highest_price = GREATEST(s.highest_price, EXCLUDED.current_price),
+    updated_at = NOW();
+  
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 크롤러가 계산한 가격 분석 결과 일괄 반영 (역대 최저가 여부는 요약 값으로 계산)
+CREATE OR REPLACE FUNCTION apply_price_analytics(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+  v_count INTEGER;
+BEGIN
+  UPDATE product_price_summary s SET
+    avg_price_7d = r.avg_price_7d,
+    avg_price_30d = r.avg_price_30d,
+    high_price_30d = r.high_price_30d,
+    drop_from_high = r.drop_from_high,
+    drop_from_high_pct = r.drop_from_high_pct,
+    volatility_30d = r.volatility_30d,
+    is_fake_discount = COALESCE(r.is_fake_discount, FALSE),
+    is_all_time_low = s.current_price <= s.lowest_price,
+    analyzed_at = NOW()
+  FROM jsonb_to_recordset(p_rows) AS r(
+    product_id UUID, avg_price_7d INTEGER, avg_price_30d INTEGER, high_price_30d INTEGER,
+    drop_from_high INTEGER, drop_from_high_pct NUMERIC, volatility_30d NUMERIC, is_fake_discount BOOLEAN
+  )
+  WHERE s.product_id = r.product_id;
+  
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 DB 마이그레이션: price_history로 가격 요약 채우기 (요약이 없는 상품만)
+INSERT INTO product_price_summary (
+  product_id, current_price, original_price, discount_rate, is_on_sale,
+  previous_price, lowest_price, highest_price, price_drop, last_changed_at
+)
+SELECT
+  latest.product_id, latest.price, latest.original_price, latest.discount_rate, latest.is_on_sale,
+  prev.price, bounds.lowest_price, bounds.highest_price,
+  COALESCE(prev.price - latest.price, 0), latest.recorded_at
+FROM (
+  SELECT DISTINCT ON (ph.product_id) ph.*
+  FROM price_history ph
+  ORDER BY ph.product_id, ph.recorded_at DESC
+) latest
+JOIN (
+  SELECT ph.product_id, MIN(ph.price) AS lowest_price, MAX(ph.price) AS highest_price
+  FROM price_history ph
+  GROUP BY ph.product_id
+) bounds ON bounds.product_id = latest.product_id
+LEFT JOIN LATERAL (
+  SELECT ph.price
+  FROM price_history ph
+  WHERE ph.product_id = latest.product_id
+    AND ph.recorded_at < latest.recorded_at
+    AND ph.price <> latest.price
+  ORDER BY ph.recorded_at DESC
+  LIMIT 1
+) prev ON TRUE
+ON CONFLICT (product_id) DO NOTHING;
+
 -- ========================================
 -- 함수: 오늘 역대 최저가인 상품 목록 조회
 -- ========================================
@@ -185,21 +599,6 @@ RETURNS TABLE (
 ) AS $$
 BEGIN
   RETURN QUERY
-  WITH latest_prices AS (
-    SELECT DISTINCT ON (ph.product_id)
-      ph.product_id,
-      ph.price AS current_price,
-      ph.original_price,
-      ph.discount_rate,
-      ph.is_on_sale
-    FROM price_history ph
-    ORDER BY ph.product_id, ph.recorded_at DESC
-  ),
-  lowest_prices AS (
-    SELECT ph.product_id, MIN(ph.price) AS lowest_price
-    FROM price_history ph
-    GROUP BY ph.product_id
-  )
   SELECT 
     p.id,
     p.name,
@@ -207,16 +606,15 @@ BEGIN
     p.category,
     p.image_url,
     p.product_url,
-    lp.current_price,
-    lp.original_price,
-    lp.discount_rate,
-    low.lowest_price,
-    lp.is_on_sale
-  FROM products p
-  JOIN latest_prices lp ON p.id = lp.product_id
-  JOIN lowest_prices low ON p.id = low.product_id
-  WHERE lp.current_price <= low.lowest_price
-  ORDER BY lp.discount_rate DESC
+    s.current_price,
+    s.original_price,
+    s.discount_rate,
+    s.lowest_price,
+    s.is_on_sale
+  FROM product_price_summary s
+  JOIN products p ON p.id = s.product_id
+  WHERE s.current_price <= s.lowest_price
+  ORDER BY s.discount_rate DESC
   LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -240,16 +638,6 @@ RETURNS TABLE (
 ) AS $$
 BEGIN
   RETURN QUERY
-  WITH ranked_prices AS (
-    SELECT 
-      ph.product_id,
-      ph.price,
-      ph.discount_rate,
-      ph.recorded_at,
-      ROW_NUMBER() OVER (PARTITION BY ph.product_id ORDER BY ph.recorded_at DESC) AS rn
-    FROM price_history ph
-    WHERE ph.recorded_at >= NOW() - INTERVAL '7 days'
-  )
   SELECT 
     p.id,
     p.name,
@@ -257,15 +645,15 @@ BEGIN
     p.category,
     p.image_url,
     p.product_url,
-    curr.price AS current_price,
-    prev.price AS previous_price,
-    (prev.price - curr.price) AS price_drop,
-    curr.discount_rate
-  FROM products p
-  JOIN ranked_prices curr ON p.id = curr.product_id AND curr.rn = 1
-  JOIN ranked_prices prev ON p.id = prev.product_id AND prev.rn = 2
-  WHERE prev.price > curr.price
-  ORDER BY (prev.price - curr.price) DESC
+    s.current_price,
+    s.previous_price,
+    s.price_drop,
+    s.discount_rate
+  FROM product_price_summary s
+  JOIN products p ON p.id = s.product_id
+  WHERE s.price_drop > 0
+    AND s.last_changed_at >= NOW() - INTERVAL '7 days'
+  ORDER BY s.price_drop DESC
   LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -323,12 +711,10 @@ BEGIN
   -- 상품의 브랜드와 현재 가격 조회
   SELECT p.brand INTO v_brand FROM products p WHERE p.id = p_product_id;
   
-  SELECT ph.price, ph.original_price, ph.discount_rate 
+  SELECT s.current_price, s.original_price, s.discount_rate 
   INTO v_price, v_original, v_discount_rate
-  FROM price_history ph 
-  WHERE ph.product_id = p_product_id 
-  ORDER BY ph.recorded_at DESC 
-  LIMIT 1;
+  FROM product_price_summary s 
+  WHERE s.product_id = p_product_id;
   
   -- 가장 좋은 쿠폰 찾기
   SELECT c.* INTO v_coupon
@@ -380,6 +766,170 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- ========================================
+-- 함수: 발동한 가격 알림 일괄 처리 (비활성화 + notifications에 발송 대기 추가)
+-- p_rows: [{"alert_id": ..., "price": 발동 시점 가격}, ...]
+-- ========================================
+
+CREATE OR REPLACE FUNCTION trigger_price_alerts(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+  v_count INTEGER;
+BEGIN
+  WITH triggered AS (
+    UPDATE price_alerts a SET
+      is_active = FALSE,
+      triggered_at = NOW(),
+      triggered_price = r.price
+    FROM jsonb_to_recordset(p_rows) AS r(alert_id UUID, price INTEGER)
+    WHERE a.id = r.alert_id AND a.is_active
+    RETURNING a.id, a.product_id, a.user_email, a.target_price, r.price
+  )
+  INSERT INTO notifications (kind, user_email, product_id, alert_id, title, body, url)
+  SELECT
+    'price_alert', t.user_email, t.product_id, t.id,
+    '🔔 목표 가격 도달',
+    p.name || ' ' || TO_CHAR(t.price, 'FM999,999,999') || '원 (목표 ' || TO_CHAR(t.target_price, 'FM999,999,999') || '원)',
+    '/products/' || t.product_id
+  FROM triggered t
+  JOIN products p ON p.id = t.product_id;
+  
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- 함수: 찜한 상품 가격 하락 알림 추가 (p_since 이후 가격이 내려간 상품)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION queue_price_drop_notifications(p_product_ids UUID[], p_since TIMESTAMPTZ)
+RETURNS INTEGER AS $$
+DECLARE
+  v_count INTEGER;
+BEGIN
+  INSERT INTO notifications (kind, user_id, product_id, title, body, url)
+  SELECT
+    'price_drop', w.user_id, s.product_id,
+    '📉 찜한 상품 가격 하락',
+    p.name || ' ' || TO_CHAR(s.previous_price, 'FM999,999,999') || '원 → ' || TO_CHAR(s.current_price, 'FM999,999,999') || '원',
+    '/products/' || s.product_id
+  FROM product_price_summary s
+  JOIN wishlist w ON w.product_id = s.product_id AND w.user_id IS NOT NULL
+  JOIN products p ON p.id = s.product_id
+  WHERE s.product_id = ANY(p_product_ids)
+    AND s.price_drop > 0
+    AND s.last_changed_at >= p_since;
+  
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- 함수: 찜한 브랜드 쿠폰 변경 알림 추가 (사용자 x 브랜드당 할인이 가장 큰 쿠폰 1건)
+-- ========================================
+
+CREATE OR REPLACE FUNCTION queue_coupon_notifications(p_brands TEXT[])
+RETURNS INTEGER AS $$
+DECLARE
+  v_count INTEGER;
+BEGIN
+  INSERT INTO notifications (kind, user_id, product_id, title, body, url)
+  SELECT DISTINCT ON (w.user_id, p.brand)
+    'coupon', w.user_id, p.id,
+    '🎫 찜한 브랜드 쿠폰',
+    p.brand || ' ' || c.coupon_name,
+    '/products/' || p.id
+  FROM wishlist w
+  JOIN products p ON p.id = w.product_id
+  JOIN coupons c ON c.brand = p.brand AND c.is_active
+  WHERE p.brand = ANY(p_brands) AND w.user_id IS NOT NULL
+  ORDER BY w.user_id, p.brand, c.discount_value DESC;
+  
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ========================================
+-- 함수: 발송할 알림 가져오기 (구독 정보 포함, 발송 중으로 표시)
+-- 이번 발송 작업(p_started_at 이후)에서 이미 시도한 알림은 제외하고,
+-- 발송 중 상태로 15분 넘게 남은 알림(중단된 작업)은 다시 가져감
+-- p_limit은 알림 수 기준이며, 알림마다 사용자의 모든 구독(기기) 행을 돌려줌
+-- ========================================
+
+CREATE OR REPLACE FUNCTION claim_push_notifications(p_limit INTEGER, p_started_at TIMESTAMPTZ)
+RETURNS TABLE (
+  notification_id UUID,
+  subscription_id UUID,
+  endpoint TEXT,
+  p256dh TEXT,
+  auth TEXT,
+  title TEXT,
+  body TEXT,
+  url TEXT
+) AS $$
+#variable_conflict use_column
+BEGIN
+  RETURN QUERY
+  WITH claimable AS (
+    -- 구독이 하나라도 있는 사용자의 알림만 가져감 (구독과 조인하면 알림이 기기 수만큼 늘어나므로 여기서는 조인하지 않음)
+    SELECT n.id, t.user_id
+    FROM notifications n
+    CROSS JOIN LATERAL (
+      SELECT COALESCE(
+        n.user_id,
+        (SELECT u.id FROM auth.users u WHERE u.email = n.user_email LIMIT 1)
+      ) AS user_id
+    ) t
+    WHERE ((n.status = 'pending' AND (n.claimed_at IS NULL OR n.claimed_at < p_started_at))
+       OR (n.status = 'sending' AND n.claimed_at < NOW() - INTERVAL '15 minutes'))
+      AND EXISTS (SELECT 1 FROM push_subscriptions s WHERE s.user_id = t.user_id)
+    ORDER BY n.created_at
+    LIMIT p_limit
+    FOR UPDATE OF n SKIP LOCKED
+  ), claimed AS (
+    UPDATE notifications n SET
+      status = 'sending',
+      attempts = n.attempts + 1,
+      claimed_at = NOW()
+    FROM claimable c
+    WHERE n.id = c.id
+    RETURNING n.id, c.user_id, n.title, n.body, n.url
+  )
+  -- 알림 x 사용자의 모든 구독 (push.py는 알림의 모든 구독 발송이 끝나야 결과를 반영)
+  SELECT c.id, s.id, s.endpoint, s.p256dh, s.auth, c.title, c.body, c.url
+  FROM claimed c
+  JOIN push_subscriptions s ON s.user_id = c.user_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- ========================================
+-- 함수: 발송 결과 반영
+-- ========================================
+
+CREATE OR REPLACE FUNCTION finish_push_notifications(
+  p_sent UUID[], p_retry UUID[], p_dropped UUID[], p_max_attempts INTEGER
+)
+RETURNS INTEGER AS $$
+DECLARE
+  v_count INTEGER;
+BEGIN
+  UPDATE notifications SET
+    status = CASE
+      WHEN id = ANY(p_sent) THEN 'sent'
+      WHEN id = ANY(p_dropped) OR attempts >= p_max_attempts THEN 'failed'
+      ELSE 'pending'
+    END,
+    sent_at = CASE WHEN id = ANY(p_sent) THEN NOW() ELSE sent_at END
+  WHERE id = ANY(p_sent) OR id = ANY(p_retry) OR id = ANY(p_dropped);
+  
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ========================================
 -- RLS 정책 (Row Level Security)
 -- ========================================
@@ -394,6 +944,16 @@ ALTER TABLE price_history ENABLE ROW LEVEL SECURITY;
 DROP POLICY IF EXISTS "Anyone can read price_history" ON price_history;
 CREATE POLICY "Anyone can read price_history" ON price_history FOR SELECT USING (true);
 
+-- product_price_summary: 모든 사용자가 읽기 가능
+ALTER TABLE product_price_summary ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Anyone can read product_price_summary" ON product_price_summary;
+CREATE POLICY "Anyone can read product_price_summary" ON product_price_summary FOR SELECT USING (true);
+
+-- price_history_daily: 모든 사용자가 읽기 가능
+ALTER TABLE price_history_daily ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Anyone can read price_history_daily" ON price_history_daily;
+CREATE POLICY "Anyone can read price_history_daily" ON price_history_daily FOR SELECT USING (true);
+
 -- coupons: 모든 사용자가 읽기 가능
 ALTER TABLE coupons ENABLE ROW LEVEL SECURITY;
 DROP POLICY IF EXISTS "Anyone can read coupons" ON coupons;
@@ -408,6 +968,9 @@ CREATE POLICY "Anyone can read their own alerts" ON price_alerts FOR SELECT USIN
 CREATE POLICY "Anyone can create alerts" ON price_alerts FOR INSERT WITH CHECK (true);
 CREATE POLICY "Anyone can update their own alerts" ON price_alerts FOR UPDATE USING (true);
 
+-- notifications: 정책 없음 (크롤러/발송 작업의 service role만 접근)
+ALTER TABLE notifications ENABLE ROW LEVEL SECURITY;
+
 -- wishlist: 모든 사용자가 읽기/쓰기 가능 (user_id가 없으면 익명)
 ALTER TABLE wishlist ENABLE ROW LEVEL SECURITY;
 DROP POLICY IF EXISTS "Anyone can manage wishlist" ON wishlist;